@@ -0,0 +1,463 @@
+"""
+Microbenchmarks por estágio do pipeline de request.
+
+Cada estágio do TaskRunner é medido isoladamente, com os mesmos objetos que
+o runner usaria:
+
+  decode      IEncoder.decode_request
+  route       RouterAPI.get_handler_pack
+  middleware  Middleware.proc (request + response, um middleware em cada)
+  to_model    TypeCast.to_model
+  resolve     DependencyInjector.resolve do handler (um Depends)
+  handler     chamada do handler
+  encode      TypeCast.from_model + IEncoder.encode_response
+
+e o caminho completo em TaskRunner._run_task / TaskRunner2._run_task contra
+um server em memória (run_task / run_task2), sem socket e sem launcher.
+
+Payloads: str simples, str com hash e JSON/pydantic (pulado se pydantic não
+estiver instalado), em vários tamanhos. O resultado (ns/op, melhor de
+--repeat) pode ser gravado como baseline e comparado nas próximas execuções:
+
+    python -m benchmarks.bench_stages --save-baseline
+    python -m benchmarks.bench_stages --threshold 0.2 --fail-on-regression
+
+Baselines dependem da máquina: grave uma na mesma máquina antes de comparar.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from serveAPI.addr import Addr
+from serveAPI.datatypes.str_input import (
+    HashedStrEncoder,
+    MiddlewareStr,
+    SimpleStrEncoder,
+    StrCast,
+    make_str_hashed_header,
+    make_str_simple_header,
+)
+from serveAPI.di import DependencyInjector
+from serveAPI.exceptionhandler import ExceptionRegistry
+from serveAPI.exceptions import UnhandledError, internal_exception_handler
+from serveAPI.interfaces import Depends, IAddr, IEncoder, Params, TypeCast
+from serveAPI.middleware import Middleware, Middleware2
+from serveAPI.router import RouterAPI
+from serveAPI.taskrunner import TaskRunner, TaskRunner2
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baselines", "stages.json")
+
+SIZES = (64, 1024, 16384)
+
+ROUTE = "items/{id}"
+REQUEST_ROUTE = "items/42"
+
+STAGES = (
+    "decode",
+    "route",
+    "middleware",
+    "to_model",
+    "resolve",
+    "handler",
+    "encode",
+    "run_task",
+    "run_task2",
+)
+
+
+# ---------- server em memória ----------
+
+
+@dataclass
+class MemoryServer:
+    """ISockerServer sem transporte: só conta o que seria escrito."""
+
+    writes: int = 0
+    bytes: int = 0
+
+    async def write(self, data: bytes, addr: IAddr) -> None:
+        self.writes += 1
+        self.bytes += len(data)
+
+    async def write_stream(self, data: bytes, addr: IAddr) -> bool:
+        await self.write(data, addr)
+        return True
+
+    async def release(self, addr: IAddr) -> None:
+        pass
+
+
+def no_launch(coro: Awaitable[Any]) -> None:
+    raise RuntimeError("bench_stages chama _run_task direto, sem launcher")
+
+
+# ---------- payloads ----------
+
+
+class Session:
+    pass
+
+
+def get_session() -> Session:
+    return Session()
+
+
+def passthrough(data: Any) -> Any:
+    return data
+
+
+async def passthrough2(input: Any, call_next: Callable[[Any], Awaitable[Any]]):
+    return await call_next(input)
+
+
+async def str_handler(
+    input: str, params: Params, session: Session = Depends(get_session)
+) -> str:
+    return input
+
+
+@dataclass
+class PayloadKind:
+    """Encoder, cast e handler de um formato de payload."""
+
+    name: str
+    encoder: IEncoder[Any]
+    cast: TypeCast[Any]
+    handler: Callable[..., Awaitable[Any]]
+    make_request: Callable[[int], bytes]
+
+
+def str_kind() -> PayloadKind:
+    return PayloadKind(
+        name="str",
+        encoder=SimpleStrEncoder(),
+        cast=StrCast(),
+        handler=str_handler,
+        make_request=lambda size: make_str_simple_header(
+            "x" * size, REQUEST_ROUTE, req_id="1"
+        ).encode(),
+    )
+
+
+def hashed_kind() -> PayloadKind:
+    return PayloadKind(
+        name="hashed",
+        encoder=HashedStrEncoder(),
+        cast=StrCast(),
+        handler=str_handler,
+        make_request=lambda size: make_str_hashed_header(
+            "x" * size, REQUEST_ROUTE, req_id="1"
+        ).encode(),
+    )
+
+
+def json_kind() -> PayloadKind | None:
+    try:
+        import orjson
+        from pydantic import BaseModel
+
+        from serveAPI.datatypes.pydantic_input import (
+            NonIntrusiveMappingEncoder,
+            PydanticCast,
+        )
+    except ImportError:
+        return None
+
+    class Item(BaseModel):
+        name: str
+        values: list[int]
+
+    async def json_handler(
+        input: Item, params: Params, session: Session = Depends(get_session)
+    ) -> Item:
+        return input
+
+    def make_request(size: int) -> bytes:
+        # ~'size' bytes de JSON: cada valor "1234," ocupa 5 bytes
+        body = orjson.dumps({"name": "item", "values": [1234] * max(1, size // 5)})
+        return f"serveAPI:{REQUEST_ROUTE}#1:".encode() + body
+
+    return PayloadKind(
+        name="json",
+        encoder=NonIntrusiveMappingEncoder(),
+        cast=PydanticCast(),
+        handler=json_handler,
+        make_request=make_request,
+    )
+
+
+def payload_kinds(names: list[str]) -> list[PayloadKind]:
+    factories: dict[str, Callable[[], PayloadKind | None]] = {
+        "str": str_kind,
+        "hashed": hashed_kind,
+        "json": json_kind,
+    }
+    kinds: list[PayloadKind] = []
+    for name in names:
+        kind = factories[name]()
+        if kind is None:
+            print(f"[INFO] payload '{name}' pulado: pydantic/orjson não instalados")
+            continue
+        kinds.append(kind)
+    return kinds
+
+
+# ---------- pipeline ----------
+
+
+def exception_registry() -> ExceptionRegistry:
+    er = ExceptionRegistry()
+    er.set_handler(UnhandledError, internal_exception_handler)
+    return er
+
+
+@dataclass
+class Pipeline:
+    """Os objetos de um TaskRunner montados à mão para um PayloadKind."""
+
+    kind: PayloadKind
+    router: RouterAPI = field(default_factory=RouterAPI)
+    injector: DependencyInjector = field(default_factory=DependencyInjector)
+    middleware: Middleware[Any] = field(default_factory=MiddlewareStr)
+    middleware2: Middleware2[Any] = field(default_factory=Middleware2[Any])
+    server: MemoryServer = field(default_factory=MemoryServer)
+
+    def __post_init__(self):
+        self.router.register_route(ROUTE, self.kind.handler)
+        self.middleware.add_middleware_func(passthrough, "request")
+        self.middleware.add_middleware_func(passthrough, "response")
+        self.middleware2.add(passthrough2)
+
+        common: dict[str, Any] = dict(
+            encoder=self.kind.encoder,
+            cast=self.kind.cast,
+            injector=self.injector,
+            router=self.router,
+            launcher=no_launch,
+            exception_handlers=exception_registry(),
+        )
+        self.runner = TaskRunner[Any](middleware=self.middleware, **common)
+        self.runner2 = TaskRunner2[Any](middleware=self.middleware2, **common)
+        self.runner.inject_server(self.server)  # type: ignore
+        self.runner2.inject_server(self.server)  # type: ignore
+
+    def stages(self, msg: bytes) -> dict[str, Callable[[], Any]]:
+        """Uma função por estágio; as async devolvem coroutine."""
+        kind = self.kind
+        encoder, cast = kind.encoder, kind.cast
+        addr = Addr("127.0.0.1", 0)
+
+        # entradas de cada estágio = saída do anterior
+        route, req_id, data = encoder.decode_request(msg)
+        pack, params = self.router.get_handler_pack(route)
+        obj = cast.to_model(data, pack.input_type)
+        handler = pack.handler
+        kwargs = {"params": params, "session": Session()}
+        response = asyncio.run(handler(obj, **kwargs))
+        middleware = self.middleware
+
+        async def middleware_stage() -> Any:
+            await middleware.proc(data, "request")
+            return await middleware.proc(response, "response")
+
+        return {
+            "decode": lambda: encoder.decode_request(msg),
+            "route": lambda: self.router.get_handler_pack(route),
+            "middleware": middleware_stage,
+            "to_model": lambda: cast.to_model(data, pack.input_type),
+            "resolve": lambda: self.injector.resolve(handler),
+            "handler": lambda: handler(obj, **kwargs),
+            "encode": lambda: encoder.encode_response(
+                cast.from_model(response), req_id
+            ),
+            "run_task": lambda: self.runner._run_task(msg, addr),
+            "run_task2": lambda: self.runner2._run_task(msg, addr),
+        }
+
+
+# ---------- medição ----------
+
+
+def _time_sync(func: Callable[[], Any], number: int) -> int:
+    start = time.perf_counter_ns()
+    for _ in range(number):
+        func()
+    return time.perf_counter_ns() - start
+
+
+async def _time_async(func: Callable[[], Awaitable[Any]], number: int) -> int:
+    start = time.perf_counter_ns()
+    for _ in range(number):
+        await func()
+    return time.perf_counter_ns() - start
+
+
+def _is_async(func: Callable[[], Any]) -> bool:
+    probe = func()
+    if asyncio.iscoroutine(probe):
+        probe.close()
+        return True
+    return False
+
+
+def measure(func: Callable[[], Any], repeat: int, min_time: float) -> dict[str, float]:
+    """
+    ns por chamada: calibra 'number' até uma rodada durar ao menos
+    'min_time' segundos, depois roda 'repeat' rodadas (min e mediana).
+    """
+    is_async = _is_async(func)
+    loop = asyncio.new_event_loop()
+    try:
+
+        def run(number: int) -> int:
+            if is_async:
+                return loop.run_until_complete(_time_async(func, number))
+            return _time_sync(func, number)
+
+        number = 1
+        while True:
+            elapsed = run(number)
+            if elapsed >= min_time * 1e9 or number >= 1 << 24:
+                break
+            number *= 2 if elapsed == 0 else max(2, int(min_time * 1e9 / elapsed))
+
+        samples = [run(number) / number for _ in range(repeat)]
+    finally:
+        loop.close()
+    return {
+        "ns": round(min(samples), 1),
+        "median_ns": round(statistics.median(samples), 1),
+        "number": number,
+    }
+
+
+def run_suite(
+    kinds: list[PayloadKind],
+    sizes: list[int],
+    stages: list[str],
+    repeat: int,
+    min_time: float,
+) -> dict[str, dict[str, float]]:
+    results: dict[str, dict[str, float]] = {}
+    for kind in kinds:
+        pipeline = Pipeline(kind)
+        for size in sizes:
+            funcs = pipeline.stages(kind.make_request(size))
+            for stage in stages:
+                key = f"{kind.name}/{size}/{stage}"
+                results[key] = measure(funcs[stage], repeat, min_time)
+    return results
+
+
+# ---------- baseline ----------
+
+
+def load_baseline(path: str) -> dict[str, dict[str, float]]:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as fp:
+        return json.load(fp)["results"]
+
+
+def save_baseline(path: str, results: dict[str, dict[str, float]]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    meta = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+    }
+    with open(path, "w") as fp:
+        json.dump({"meta": meta, "results": results}, fp, indent=2, sort_keys=True)
+        fp.write("\n")
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    threshold: float,
+) -> list[str]:
+    """Imprime a tabela e devolve as chaves acima de (1 + threshold) x baseline."""
+    regressions: list[str] = []
+    print(
+        f"{'payload/size/stage':<28}{'ns/op':>12}{'median':>12}{'base':>12}{'ratio':>8}"
+    )
+    for key, res in results.items():
+        line = f"{key:<28}{res['ns']:>12.0f}{res['median_ns']:>12.0f}"
+        base = baseline.get(key)
+        if base is None:
+            print(line)
+            continue
+        ratio = res["ns"] / base["ns"] if base["ns"] else 0.0
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(key)
+            flag = "  REGRESSION"
+        elif ratio < 1 - threshold:
+            flag = "  faster"
+        print(f"{line}{base['ns']:>12.0f}{ratio:>8.2f}{flag}")
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--payloads", default="str,hashed,json")
+    parser.add_argument("--sizes", default=",".join(map(str, SIZES)))
+    parser.add_argument("--stages", default=",".join(STAGES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--min-time", type=float, default=0.05, help="segundos por rodada"
+    )
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--save-baseline", action="store_true")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="regressão: ns > (1+t) x base"
+    )
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    args = parser.parse_args(argv)
+
+    stages = args.stages.split(",")
+    unknown = set(stages) - set(STAGES)
+    if unknown:
+        parser.error(f"estágios desconhecidos: {sorted(unknown)}")
+
+    results = run_suite(
+        payload_kinds(args.payloads.split(",")),
+        [int(size) for size in args.sizes.split(",")],
+        stages,
+        args.repeat,
+        args.min_time,
+    )
+
+    baseline = {} if args.save_baseline else load_baseline(args.baseline)
+    regressions = compare(results, baseline, args.threshold)
+
+    if args.json:
+        with open(args.json, "w") as fp:
+            json.dump({"params": vars(args), "results": results}, fp, indent=2)
+
+    if args.save_baseline:
+        # mantém as entradas que não foram medidas nesta execução (ex.: json)
+        merged = {**load_baseline(args.baseline), **results}
+        save_baseline(args.baseline, merged)
+        print(f"baseline gravada em {args.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} regressões acima de {args.threshold:.0%}")
+        if args.fail_on_regression:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
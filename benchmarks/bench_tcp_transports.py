@@ -0,0 +1,191 @@
+"""
+TCPServer (StreamReader/StreamWriter) vs BufferedTCPServer (BufferedProtocol).
+
+Cada server roda num processo próprio com uma rota "echo"; o cliente abre
+N conexões, mantém 'window' requests em voo por conexão (request id no header)
+e mede msgs/s e latência (p50/p99) de cada resposta.
+
+    python -m benchmarks.bench_tcp_transports --messages 50000 --size 64
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import socket
+import sys
+import time
+from typing import Any, Callable
+
+from serveAPI.container import get_simple_str_ioc
+from serveAPI.datatypes.str_input import make_str_simple_header
+from serveAPI.encoder import parse_response_header
+from serveAPI.router import RouterAPI
+from serveAPI.servers.buffered_tcpserver import BufferedTCPServer
+from serveAPI.servers.framing import LengthPrefixFramer, make_frame
+from serveAPI.servers.tcpserver import TCPServer
+from serveAPI.taskrunner import TaskRunner
+
+
+async def echo(input: str) -> str:
+    return input
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def make_tcpserver(runner: Any, port: int) -> TCPServer:
+    return TCPServer(
+        host="127.0.0.1",
+        port=port,
+        runner=runner,
+        fire_and_forget=False,
+        makeid=lambda: "id",
+        framed=True,
+    )
+
+
+def make_buffered(runner: Any, port: int) -> BufferedTCPServer:
+    return BufferedTCPServer(
+        host="127.0.0.1",
+        port=port,
+        runner=runner,
+        fire_and_forget=False,
+        makeid=lambda: "id",
+    )
+
+
+TRANSPORTS: dict[str, Callable[[Any, int], Any]] = {
+    "TCPServer": make_tcpserver,
+    "BufferedTCPServer": make_buffered,
+}
+
+
+def serve(transport: str, port: int) -> None:
+    ioc = get_simple_str_ioc()
+    ioc.resolve(RouterAPI).register_route("echo", echo)
+    runner = ioc.resolve(TaskRunner)
+    server = TRANSPORTS[transport](runner, port)
+    runner.inject_server(server)
+    try:
+        asyncio.run(server.start())
+    except KeyboardInterrupt:
+        pass
+
+
+async def connect(port: int) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+    for _ in range(200):
+        try:
+            return await asyncio.open_connection("127.0.0.1", port)
+        except ConnectionRefusedError:
+            await asyncio.sleep(0.02)
+    raise RuntimeError(f"server on port {port} did not start")
+
+
+async def run_connection(
+    port: int, count: int, window: int, payload: str, latencies: list[float]
+) -> None:
+    reader, writer = await connect(port)
+    sent_at: dict[str, float] = {}
+    slots = asyncio.Semaphore(window)
+    framer = LengthPrefixFramer()
+
+    async def receive() -> None:
+        done = 0
+        while done < count:
+            data = await reader.read(64 * 1024)
+            if not data:
+                raise RuntimeError("connection closed by server")
+            now = time.perf_counter()
+            for frame in framer.feed(data):
+                req_id, _ = parse_response_header(frame)
+                latencies.append(now - sent_at.pop(req_id))  # type: ignore
+                slots.release()
+                done += 1
+
+    receiver = asyncio.create_task(receive())
+    for i in range(count):
+        await slots.acquire()
+        req_id = str(i)
+        msg = make_str_simple_header(payload, "echo", req_id=req_id).encode()
+        sent_at[req_id] = time.perf_counter()
+        writer.write(make_frame(msg))
+        if i % window == window - 1:
+            await writer.drain()
+    await writer.drain()
+    await receiver
+    writer.close()
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    idx = min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))
+    return sorted_values[idx]
+
+
+async def drive(
+    port: int, messages: int, connections: int, window: int, size: int
+) -> dict[str, float]:
+    latencies: list[float] = []
+    per_conn = messages // connections
+    payload = "x" * size
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            run_connection(port, per_conn, window, payload, latencies)
+            for _ in range(connections)
+        )
+    )
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "messages": len(latencies),
+        "seconds": elapsed,
+        "msgs_per_sec": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+def bench(transport: str, args: argparse.Namespace) -> dict[str, float]:
+    port = free_port()
+    proc = multiprocessing.get_context("fork").Process(
+        target=serve, args=(transport, port), daemon=True
+    )
+    proc.start()
+    try:
+        return asyncio.run(
+            drive(port, args.messages, args.connections, args.window, args.size)
+        )
+    finally:
+        proc.terminate()
+        proc.join()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--window", type=int, default=64)
+    parser.add_argument("--size", type=int, default=64, help="payload bytes")
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    args = parser.parse_args(argv)
+
+    results = {name: bench(name, args) for name in TRANSPORTS}
+
+    print(f"{'transport':<20}{'msgs/s':>12}{'p50 ms':>10}{'p99 ms':>10}")
+    for name, res in results.items():
+        print(
+            f"{name:<20}{res['msgs_per_sec']:>12.0f}"
+            f"{res['p50_ms']:>10.3f}{res['p99_ms']:>10.3f}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as fp:
+            json.dump({"params": vars(args), "results": results}, fp, indent=2)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,208 @@
+"""
+Loopback TCP vs unix domain socket para mensagens pequenas.
+
+Compara TCPServer(framed) em 127.0.0.1 com UnixStreamServer(framed), e
+UDPServer com UnixDatagramServer (request/response, uma mensagem em voo por
+cliente). Mesmo pipeline (TaskRunner + encoder simple str + rota "echo").
+
+    python -m benchmarks.bench_uds --messages 50000 --size 32
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+import socket
+import sys
+import tempfile
+import time
+from typing import Any, Awaitable, Callable
+
+from benchmarks.bench_tcp_transports import echo, free_port, percentile
+from serveAPI.container import get_simple_str_ioc
+from serveAPI.datatypes.str_input import make_str_simple_header
+from serveAPI.encoder import parse_response_header
+from serveAPI.router import RouterAPI
+from serveAPI.servers.framing import LengthPrefixFramer, make_frame
+from serveAPI.servers.tcpserver import TCPServer
+from serveAPI.servers.udpserver import UDPServer
+from serveAPI.servers.unixserver import UnixDatagramServer, UnixStreamServer
+from serveAPI.taskrunner import TaskRunner
+
+Target = str | tuple[str, int]
+
+_ids = itertools.count()
+# clientes unix não têm endereço: o id da conexão vem de makeid()
+COMMON: dict[str, Any] = dict(fire_and_forget=True, makeid=lambda: str(next(_ids)))
+
+
+def make_server(transport: str, runner: Any, target: Any) -> Any:
+    if transport == "tcp":
+        return TCPServer(
+            host=target[0], port=target[1], runner=runner, framed=True, **COMMON
+        )
+    if transport == "uds-stream":
+        return UnixStreamServer(path=target, runner=runner, framed=True, **COMMON)
+    if transport == "udp":
+        return UDPServer(host=target[0], port=target[1], runner=runner, **COMMON)
+    return UnixDatagramServer(path=target, runner=runner, **COMMON)
+
+
+def serve(transport: str, target: Any) -> None:
+    ioc = get_simple_str_ioc()
+    ioc.resolve(RouterAPI).register_route("echo", echo)
+    runner = ioc.resolve(TaskRunner)
+    server = make_server(transport, runner, target)
+    runner.inject_server(server)
+
+    async def main() -> None:
+        await server.start()
+        await asyncio.Event().wait()  # UDP: start() retorna logo
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+
+async def open_stream(target: Target) -> tuple[Any, Any]:
+    for _ in range(200):
+        try:
+            if isinstance(target, str):
+                return await asyncio.open_unix_connection(target)
+            return await asyncio.open_connection(*target)
+        except (ConnectionRefusedError, FileNotFoundError):
+            await asyncio.sleep(0.02)
+    raise RuntimeError(f"server on {target} did not start")
+
+
+async def stream_client(
+    target: Target, count: int, payload: str, latencies: list[float]
+) -> None:
+    reader, writer = await open_stream(target)
+    framer = LengthPrefixFramer()
+    for i in range(count):
+        msg = make_str_simple_header(payload, "echo", req_id=str(i)).encode()
+        start = time.perf_counter()
+        writer.write(make_frame(msg))
+        frames: list[memoryview] = []
+        while not frames:
+            frames = framer.feed(await reader.read(64 * 1024))
+        latencies.append(time.perf_counter() - start)
+        parse_response_header(frames[0])
+    writer.close()
+
+
+async def datagram_client(
+    target: Target, count: int, payload: str, latencies: list[float]
+) -> None:
+    loop = asyncio.get_running_loop()
+    if isinstance(target, str):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.bind(f"{target}.{os.getpid()}.{id(latencies)}.{time.time_ns()}")
+    else:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setblocking(False)
+    try:
+        await warm_up(sock, target)
+        for i in range(count):
+            msg = make_str_simple_header(payload, "echo", req_id=str(i)).encode()
+            start = time.perf_counter()
+            sock.send(msg)
+            data = await asyncio.wait_for(loop.sock_recv(sock, 65536), 5)
+            latencies.append(time.perf_counter() - start)
+            parse_response_header(data)
+    finally:
+        sock.close()
+
+
+async def warm_up(sock: socket.socket, target: Target) -> None:
+    """Espera o server responder (datagrama enviado antes do bind se perde)."""
+    loop = asyncio.get_running_loop()
+    msg = make_str_simple_header("ping", "echo").encode()
+    for _ in range(200):
+        try:
+            sock.connect(target)
+            sock.send(msg)
+            await asyncio.wait_for(loop.sock_recv(sock, 65536), 0.05)
+            return
+        except (ConnectionRefusedError, FileNotFoundError, asyncio.TimeoutError):
+            await asyncio.sleep(0.02)
+    raise RuntimeError(f"server on {target} did not start")
+
+
+CLIENTS: dict[str, Callable[..., Awaitable[None]]] = {
+    "tcp": stream_client,
+    "uds-stream": stream_client,
+    "udp": datagram_client,
+    "uds-dgram": datagram_client,
+}
+
+
+async def drive(target: Target, transport: str, args: argparse.Namespace) -> dict:
+    latencies: list[float] = []
+    per_client = args.messages // args.clients
+    payload = "x" * args.size
+    client = CLIENTS[transport]
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(client(target, per_client, payload, latencies) for _ in range(args.clients))
+    )
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "messages": len(latencies),
+        "seconds": elapsed,
+        "msgs_per_sec": len(latencies) / elapsed,
+        "p50_us": percentile(latencies, 50) * 1e6,
+        "p99_us": percentile(latencies, 99) * 1e6,
+    }
+
+
+def bench(transport: str, args: argparse.Namespace, tmpdir: str) -> dict:
+    target: Target
+    if transport.startswith("uds"):
+        target = os.path.join(tmpdir, f"{transport}.sock")
+    else:
+        target = ("127.0.0.1", free_port())
+    proc = multiprocessing.get_context("fork").Process(
+        target=serve, args=(transport, target), daemon=True
+    )
+    proc.start()
+    try:
+        if isinstance(target, str):
+            while not os.path.exists(target):
+                time.sleep(0.01)
+        return asyncio.run(drive(target, transport, args))
+    finally:
+        proc.terminate()
+        proc.join()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--clients", type=int, default=4)
+    parser.add_argument("--size", type=int, default=32, help="payload bytes")
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        results = {name: bench(name, args, tmpdir) for name in CLIENTS}
+
+    print(f"{'transport':<14}{'msgs/s':>12}{'p50 us':>10}{'p99 us':>10}")
+    for name, res in results.items():
+        print(
+            f"{name:<14}{res['msgs_per_sec']:>12.0f}"
+            f"{res['p50_us']:>10.1f}{res['p99_us']:>10.1f}"
+        )
+
+    if args.json:
+        with open(args.json, "w") as fp:
+            json.dump({"params": vars(args), "results": results}, fp, indent=2)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
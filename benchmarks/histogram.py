@@ -0,0 +1,87 @@
+"""
+Histograma de latência log-linear (no estilo HdrHistogram).
+
+Valores em microssegundos inteiros; abaixo de 64us cada valor tem o seu
+bucket, acima disso cada potência de 2 é dividida em 32 buckets (erro
+relativo máximo ~3%). Memória proporcional ao número de buckets usados,
+não ao número de amostras.
+"""
+
+from dataclasses import dataclass, field
+
+SUB_BITS = 5
+_LINEAR = 1 << (SUB_BITS + 1)
+
+
+def bucket_index(value: int) -> int:
+    if value < _LINEAR:
+        return value
+    shift = value.bit_length() - SUB_BITS - 1
+    return (shift << SUB_BITS) + (value >> shift)
+
+
+def bucket_upper(index: int) -> int:
+    """Maior valor que cai no bucket 'index'."""
+    if index < _LINEAR:
+        return index
+    shift = (index >> SUB_BITS) - 1
+    mantissa = index - (shift << SUB_BITS)
+    return ((mantissa + 1) << shift) - 1
+
+
+@dataclass
+class LatencyHistogram:
+    counts: dict[int, int] = field(default_factory=dict[int, int])
+    count: int = 0
+    total_us: int = 0
+    min_us: int = 0
+    max_us: int = 0
+
+    def record(self, seconds: float) -> None:
+        value = max(0, int(seconds * 1_000_000))
+        index = bucket_index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        if not self.count or value < self.min_us:
+            self.min_us = value
+        if value > self.max_us:
+            self.max_us = value
+        self.count += 1
+        self.total_us += value
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        if other.count:
+            if not self.count or other.min_us < self.min_us:
+                self.min_us = other.min_us
+            self.max_us = max(self.max_us, other.max_us)
+        self.count += other.count
+        self.total_us += other.total_us
+
+    def percentile(self, pct: float) -> int:
+        """Limite superior do bucket que contém o percentil (em us)."""
+        if not self.count:
+            return 0
+        target = max(1, round(self.count * pct / 100))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(bucket_upper(index), self.max_us)
+        return self.max_us
+
+    def summary(self) -> dict[str, float]:
+        return {
+            "count": self.count,
+            "min_us": self.min_us,
+            "mean_us": self.total_us / self.count if self.count else 0.0,
+            "p50_us": self.percentile(50),
+            "p90_us": self.percentile(90),
+            "p99_us": self.percentile(99),
+            "p999_us": self.percentile(99.9),
+            "max_us": self.max_us,
+        }
+
+    def buckets(self) -> list[tuple[int, int]]:
+        """(limite superior em us, contagem) por bucket usado, em ordem."""
+        return [(bucket_upper(i), self.counts[i]) for i in sorted(self.counts)]
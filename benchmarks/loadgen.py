@@ -0,0 +1,492 @@
+"""
+Gerador de carga e benchmark de latência para um app serveAPI.
+
+Sobe o app num processo separado (rotas, encoder, transporte e launcher
+configuráveis) e gera carga local:
+
+  closed loop: 'concurrency' clientes, cada um manda o próximo request só
+               depois da resposta do anterior (mede a vazão máxima).
+  open loop:   requests em taxa fixa (--rate msgs/s), sem esperar respostas;
+               a latência é medida a partir do instante em que o request
+               deveria ter saído (sem coordinated omission).
+
+Latências vão para um histograma log-linear (p50/p90/p99/p999); com --json
+o resultado completo (metadados, parâmetros, resumo e buckets) é gravado
+para comparar versões.
+
+    python -m benchmarks.loadgen --transport tcp,udp --mode closed --duration 5
+    python -m benchmarks.loadgen --mode open --rate 20000 --json run.json
+"""
+
+import argparse
+import asyncio
+import hashlib
+import itertools
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import asdict, dataclass, field
+from importlib import metadata
+from typing import Any, Awaitable, Callable
+
+from benchmarks.bench_tcp_transports import free_port
+from benchmarks.histogram import LatencyHistogram
+from serveAPI.client import Client, ClientCodec, hashed_str_codec, simple_str_codec
+from serveAPI.container import (
+    Middleware_,
+    get_hashed_str_ioc,
+    get_simple_str_ioc,
+)
+from serveAPI.di import DependencyInjector
+from serveAPI.encoder import parse_response_header
+from serveAPI.exceptionhandler import ExceptionRegistry
+from serveAPI.interfaces import Depends, LaunchTask
+from serveAPI.launchers.bounded_launcher import BoundedLauncher
+from serveAPI.router import RouterAPI
+from serveAPI.serverAPI import App
+from serveAPI.servers.buffered_tcpserver import BufferedTCPServer
+from serveAPI.servers.framing import LengthPrefixFramer
+from serveAPI.servers.tcpserver import TCPServer
+from serveAPI.servers.udpserver import UDPServer
+from serveAPI.servers.unixserver import UnixStreamServer
+from serveAPI.taskrunner import TaskRunner
+
+# ---------- rotas de teste ----------
+
+
+async def echo(input: str) -> str:
+    return input
+
+
+async def sleep(input: str) -> str:
+    await asyncio.sleep(0.001)
+    return input
+
+
+async def cpu(input: str) -> str:
+    digest = input.encode()
+    for _ in range(100):
+        digest = hashlib.sha256(digest).digest()
+    return digest.hex()
+
+
+async def lookup() -> int:
+    # ex.: consulta a cache/DB; três destas por request na rota "deps"
+    await asyncio.sleep(0.005)
+    return 1
+
+
+async def deps(
+    input: str,
+    a: int = Depends(lookup),
+    b: int = Depends(lookup),
+    c: int = Depends(lookup),
+) -> str:
+    return input
+
+
+def blocking(input: str) -> str:
+    # handler síncrono com I/O bloqueante (ex.: driver de DB sem asyncio)
+    time.sleep(0.002)
+    return input
+
+
+ROUTES: dict[str, Callable[..., Any]] = {
+    "echo": echo,
+    "sleep": sleep,
+    "cpu": cpu,
+    "deps": deps,
+    "blocking": blocking,
+    "offload": blocking,
+}
+
+# rotas registradas com offload=True (handler no ThreadOffloader)
+OFFLOAD_ROUTES = {"offload"}
+
+ENCODERS: dict[str, tuple[Callable[[], Any], Callable[[], ClientCodec[str]]]] = {
+    "simple": (get_simple_str_ioc, simple_str_codec),
+    "hashed": (get_hashed_str_ioc, hashed_str_codec),
+}
+
+TRANSPORTS = ("tcp", "buffered", "uds", "udp")
+
+
+# ---------- server ----------
+
+
+@dataclass
+class ServerConfig:
+    transport: str = "tcp"
+    encoder: str = "simple"
+    launcher: str = "asyncio"  # asyncio | bounded
+    max_inflight: int = 1024
+    udp_batch: int = 0
+    host: str = "127.0.0.1"
+    port: int = 0
+    path: str = ""
+
+
+def build_app(cfg: ServerConfig) -> App[str]:
+    ioc = ENCODERS[cfg.encoder][0]()
+    if cfg.launcher == "bounded":
+        ioc.register(
+            LaunchTask, lambda _: BoundedLauncher(max_inflight=cfg.max_inflight)
+        )
+    router = ioc.resolve(RouterAPI)
+    for path, handler in ROUTES.items():
+        router.register_route(path, handler, offload=path in OFFLOAD_ROUTES)
+
+    runner = ioc.resolve(TaskRunner)
+    launcher = ioc.resolve(LaunchTask)
+    bp = launcher if isinstance(launcher, BoundedLauncher) else None
+    common: dict[str, Any] = dict(
+        runner=runner, fire_and_forget=False, makeid=_make_id_factory()
+    )
+    server: Any
+    if cfg.transport == "tcp":
+        server = TCPServer(
+            host=cfg.host, port=cfg.port, framed=True, backpressure=bp, **common
+        )
+    elif cfg.transport == "buffered":
+        server = BufferedTCPServer(
+            host=cfg.host, port=cfg.port, backpressure=bp, **common
+        )
+    elif cfg.transport == "uds":
+        server = UnixStreamServer(path=cfg.path, framed=True, backpressure=bp, **common)
+    elif cfg.transport == "udp":
+        # fire_and_forget no UDP só desliga as confirmações; as respostas saem
+        common["fire_and_forget"] = True
+        server = UDPServer(
+            host=cfg.host,
+            port=cfg.port,
+            backpressure=bp,
+            batch_size=cfg.udp_batch,
+            **common,
+        )
+    else:
+        raise ValueError(f"Unknown transport {cfg.transport}")
+    runner.inject_server(server)
+
+    return App(
+        _server=server,
+        _routers=router,
+        _middleware=ioc.resolve(Middleware_),
+        _exception_handler=ioc.resolve(ExceptionRegistry),
+        dependency_overrides=ioc.resolve(DependencyInjector),
+        _launcher=launcher,
+    )
+
+
+def _make_id_factory() -> Callable[[], str]:
+    ids = itertools.count()
+    return lambda: f"c{next(ids)}"
+
+
+def serve(cfg: ServerConfig) -> None:
+    # sem prints do server misturados no relatório
+    sys.stdout = open(os.devnull, "w")
+    try:
+        asyncio.run(build_app(cfg).run())
+    except KeyboardInterrupt:
+        pass
+
+
+# ---------- carga ----------
+
+
+@dataclass
+class LoadConfig:
+    mode: str = "closed"  # closed | open
+    route: str = "echo"
+    size: int = 64
+    duration: float = 5.0
+    warmup: float = 0.5
+    concurrency: int = 64
+    connections: int = 4
+    rate: float = 10000.0
+    timeout: float = 5.0
+
+
+@dataclass
+class RunStats:
+    hist: LatencyHistogram = field(default_factory=LatencyHistogram)
+    sent: int = 0
+    received: int = 0
+    errors: int = 0
+    timeouts: int = 0
+
+
+class UDPLoadClient(asyncio.DatagramProtocol):
+    """Cliente UDP: correlaciona respostas pelo request id do header."""
+
+    def __init__(self, codec: ClientCodec[str], framed: bool):
+        self.codec = codec
+        self.framed = framed
+        self.waiting: dict[str, asyncio.Future[None]] = {}
+        self.ids = itertools.count()
+        self.transport: asyncio.DatagramTransport | None = None
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport  # type: ignore
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        frames = LengthPrefixFramer().feed(data) if self.framed else [data]
+        for frame in frames:
+            req_id, _ = parse_response_header(frame)
+            future = self.waiting.pop(req_id or "", None)
+            if future is not None and not future.done():
+                future.set_result(None)
+
+    async def request(self, route: str, data: str) -> None:
+        req_id = str(next(self.ids))
+        future = asyncio.get_running_loop().create_future()
+        self.waiting[req_id] = future
+        assert self.transport is not None
+        self.transport.sendto(self.codec.encode_request(data, route, req_id))
+        try:
+            await future
+        finally:
+            self.waiting.pop(req_id, None)
+
+
+async def make_requester(
+    cfg: ServerConfig, load: LoadConfig
+) -> tuple[Callable[[], Awaitable[Any]], Callable[[], Awaitable[None]]]:
+    codec = ENCODERS[cfg.encoder][1]()
+    payload = "x" * load.size
+
+    if cfg.transport == "udp":
+        loop = asyncio.get_running_loop()
+        _, proto = await loop.create_datagram_endpoint(
+            lambda: UDPLoadClient(codec, framed=cfg.udp_batch > 0),
+            remote_addr=(cfg.host, cfg.port),
+        )
+
+        async def close_udp() -> None:
+            if proto.transport is not None:
+                proto.transport.close()
+
+        return (lambda: proto.request(load.route, payload)), close_udp
+
+    address = cfg.path if cfg.transport == "uds" else (cfg.host, cfg.port)
+    client = Client([address], codec, pool_size=load.connections, timeout=None)
+    return (lambda: client.request(load.route, payload)), client.close
+
+
+async def timed(
+    request: Callable[[], Awaitable[Any]],
+    stats: RunStats,
+    timeout: float,
+    started: float,
+    record: bool,
+) -> None:
+    stats.sent += 1
+    try:
+        await asyncio.wait_for(request(), timeout)
+    except asyncio.TimeoutError:
+        stats.timeouts += 1
+        return
+    except Exception:
+        stats.errors += 1
+        return
+    stats.received += 1
+    if record:
+        stats.hist.record(time.perf_counter() - started)
+
+
+async def closed_loop(
+    request: Callable[[], Awaitable[Any]], load: LoadConfig, duration: float
+) -> RunStats:
+    stats = RunStats()
+    stop_at = time.perf_counter() + duration
+
+    async def worker() -> None:
+        while time.perf_counter() < stop_at:
+            await timed(request, stats, load.timeout, time.perf_counter(), True)
+
+    await asyncio.gather(*(worker() for _ in range(load.concurrency)))
+    return stats
+
+
+async def open_loop(
+    request: Callable[[], Awaitable[Any]], load: LoadConfig, duration: float
+) -> RunStats:
+    stats = RunStats()
+    interval = 1.0 / load.rate
+    start = time.perf_counter()
+    total = int(duration * load.rate)
+    tasks: set[asyncio.Task[None]] = set()
+    i = 0
+    while i < total:
+        now = time.perf_counter()
+        # manda tudo que já venceu (o sleep não tem resolução para 1 msg por vez)
+        while i < total and start + i * interval <= now:
+            intended = start + i * interval
+            task = asyncio.create_task(
+                timed(request, stats, load.timeout, intended, True)
+            )
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+            i += 1
+        await asyncio.sleep(max(0.0, start + i * interval - time.perf_counter()))
+    if tasks:
+        await asyncio.gather(*tasks)
+    return stats
+
+
+async def drive(cfg: ServerConfig, load: LoadConfig) -> dict[str, Any]:
+    request, close = await make_requester(cfg, load)
+    try:
+        await wait_ready(request)
+        if load.warmup > 0:
+            await closed_loop(request, load, load.warmup)
+
+        run = closed_loop if load.mode == "closed" else open_loop
+        started = time.perf_counter()
+        stats = await run(request, load, load.duration)
+        elapsed = time.perf_counter() - started
+    finally:
+        await close()
+
+    return {
+        "sent": stats.sent,
+        "received": stats.received,
+        "errors": stats.errors,
+        "timeouts": stats.timeouts,
+        "elapsed_s": elapsed,
+        "throughput_msgs_s": stats.received / elapsed if elapsed else 0.0,
+        "latency": stats.hist.summary(),
+        "histogram": stats.hist.buckets(),
+    }
+
+
+async def wait_ready(request: Callable[[], Awaitable[Any]]) -> None:
+    for _ in range(100):
+        try:
+            await asyncio.wait_for(request(), 0.1)
+            return
+        except (OSError, asyncio.TimeoutError, ConnectionError):
+            await asyncio.sleep(0.05)
+        except Exception:
+            await asyncio.sleep(0.05)
+    raise RuntimeError("server did not answer")
+
+
+def run_scenario(cfg: ServerConfig, load: LoadConfig, tmpdir: str) -> dict[str, Any]:
+    if cfg.transport == "uds":
+        cfg.path = os.path.join(tmpdir, "loadgen.sock")
+    else:
+        cfg.port = free_port()
+    proc = multiprocessing.get_context("fork").Process(
+        target=serve, args=(cfg,), daemon=True
+    )
+    proc.start()
+    try:
+        result = asyncio.run(drive(cfg, load))
+    finally:
+        proc.terminate()
+        proc.join()
+    return {"server": asdict(cfg), "load": asdict(load), "results": result}
+
+
+# ---------- relatório ----------
+
+
+def metadata_info() -> dict[str, Any]:
+    try:
+        version = metadata.version("serveapi")
+    except metadata.PackageNotFoundError:
+        version = "unknown"
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, timeout=5
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ""
+    return {
+        "serveapi_version": version,
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def print_report(runs: list[dict[str, Any]]) -> None:
+    print(
+        f"{'transport':<10}{'mode':<8}{'msgs/s':>10}{'p50 us':>9}"
+        f"{'p99 us':>9}{'p999 us':>9}{'max us':>9}{'lost':>7}"
+    )
+    for run in runs:
+        res, lat = run["results"], run["results"]["latency"]
+        lost = res["errors"] + res["timeouts"]
+        print(
+            f"{run['server']['transport']:<10}{run['load']['mode']:<8}"
+            f"{res['throughput_msgs_s']:>10.0f}{lat['p50_us']:>9}"
+            f"{lat['p99_us']:>9}{lat['p999_us']:>9}{lat['max_us']:>9}{lost:>7}"
+        )
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--transport", default="tcp", help=f"lista separada por vírgula: {TRANSPORTS}"
+    )
+    parser.add_argument("--mode", default="closed", help="closed, open ou closed,open")
+    parser.add_argument("--encoder", choices=list(ENCODERS), default="simple")
+    parser.add_argument("--launcher", choices=["asyncio", "bounded"], default="asyncio")
+    parser.add_argument("--max-inflight", type=int, default=1024)
+    parser.add_argument("--udp-batch", type=int, default=0)
+    parser.add_argument("--route", choices=list(ROUTES), default="echo")
+    parser.add_argument("--size", type=int, default=64, help="payload bytes")
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--warmup", type=float, default=0.5)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--rate", type=float, default=10000.0, help="open loop msgs/s")
+    parser.add_argument("--timeout", type=float, default=5.0)
+    parser.add_argument("--json", help="grava os resultados neste arquivo")
+    args = parser.parse_args(argv)
+
+    runs: list[dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for transport in args.transport.split(","):
+            if transport not in TRANSPORTS:
+                parser.error(f"unknown transport {transport}")
+            for mode in args.mode.split(","):
+                cfg = ServerConfig(
+                    transport=transport,
+                    encoder=args.encoder,
+                    launcher=args.launcher,
+                    max_inflight=args.max_inflight,
+                    udp_batch=args.udp_batch,
+                )
+                load = LoadConfig(
+                    mode=mode,
+                    route=args.route,
+                    size=args.size,
+                    duration=args.duration,
+                    warmup=args.warmup,
+                    concurrency=args.concurrency,
+                    connections=args.connections,
+                    rate=args.rate,
+                    timeout=args.timeout,
+                )
+                runs.append(run_scenario(cfg, load, tmpdir))
+
+    print_report(runs)
+    if args.json:
+        with open(args.json, "w") as fp:
+            json.dump({"meta": metadata_info(), "runs": runs}, fp, indent=2)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
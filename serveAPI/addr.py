@@ -5,3 +5,11 @@ from dataclasses import dataclass
 class Addr:
     ip: str
     port: int
+
+
+@dataclass
+class ConnAddr(Addr):
+    """Endereço de um request numa conexão (stream): conexão + número de sequência."""
+
+    conn_id: str = ""
+    seq: int = 0
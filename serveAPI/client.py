@@ -0,0 +1,375 @@
+import asyncio
+import itertools
+from contextlib import suppress
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Generic,
+    Iterable,
+    Iterator,
+    Sequence,
+    TypeVar,
+)
+
+from serveAPI.datatypes.str_input import (
+    HashedStrEncoder,
+    SimpleStrEncoder,
+    make_str_hashed_header,
+    make_str_simple_header,
+)
+from serveAPI.encoder import (
+    BaseEncoder,
+    add_request_id,
+    parse_response_header,
+    parse_stream_end,
+)
+from serveAPI.exceptions import ClientConnectionError
+from serveAPI.servers.conn_writer import ConnectionWriter
+from serveAPI.servers.framing import DEFAULT_MAX_FRAME_SIZE, LengthPrefixFramer
+
+T = TypeVar("T")
+
+# (host, port) para TCP ou path para unix domain socket
+ServerAddress = tuple[str, int] | str
+
+
+# ---------- codec ----------
+
+
+@dataclass
+class ClientCodec(Generic[T]):
+    """
+    Lado cliente de um encoder do server: o mesmo encode/decode_body do
+    payload, com o header do request montado do lado de cá.
+
+    make_header: formatos intrusivos (str), em que o header faz parte do
+    valor antes do encode. None: header "serveAPI:<route>:" em bytes na
+    frente do payload (formatos não intrusivos).
+    """
+
+    encoder: BaseEncoder[T]
+    make_header: Callable[[T, str, str | None], T] | None = None
+
+    def encode_request(self, data: T, route: str, req_id: str | None) -> bytes:
+        if self.make_header is not None:
+            return self.encoder.encode(self.make_header(data, route, req_id))
+        prefix = f"serveAPI:{add_request_id(route, req_id)}:".encode()
+        return prefix + self.encoder.encode(data)
+
+    def decode_body(self, body: bytes | memoryview) -> T:
+        return self.encoder.decode_body(body)
+
+    def decode_response(self, frame: bytes | memoryview) -> tuple[str | None, T]:
+        req_id, body = parse_response_header(frame)
+        return req_id, self.decode_body(body)
+
+
+def simple_str_codec() -> ClientCodec[str]:
+    return ClientCodec(SimpleStrEncoder(), make_str_simple_header)
+
+
+def hashed_str_codec() -> ClientCodec[str]:
+    return ClientCodec(HashedStrEncoder(), make_str_hashed_header)
+
+
+def json_codec() -> ClientCodec[Any]:
+    # pydantic_input importa pydantic/orjson: só quando o codec json é usado
+    from serveAPI.datatypes.pydantic_input import NonIntrusiveMappingEncoder
+
+    return ClientCodec(NonIntrusiveMappingEncoder())
+
+
+# ---------- conexão ----------
+
+_END = object()  # fim de stream na fila de um request
+
+
+@dataclass
+class ClientConnection(Generic[T]):
+    """
+    Uma conexão framed com pipelining: vários requests em voo, cada um com
+    um request id; a coroutine de leitura entrega cada resposta ao request
+    dono do id, em qualquer ordem. Os envios passam por um ConnectionWriter,
+    que junta tudo que foi enviado no mesmo tick num único writelines.
+    """
+
+    reader: asyncio.StreamReader
+    writer: asyncio.StreamWriter
+    codec: ClientCodec[T]
+    max_frame_size: int = DEFAULT_MAX_FRAME_SIZE
+
+    _out: ConnectionWriter | None = None
+    _ids: Iterator[int] = field(default_factory=itertools.count)
+    _waiting: dict[str, "asyncio.Future[T]"] = field(
+        default_factory=dict[str, "asyncio.Future[T]"]
+    )
+    _streams: dict[str, "asyncio.Queue[Any]"] = field(
+        default_factory=dict[str, "asyncio.Queue[Any]"]
+    )
+    _reader_task: "asyncio.Task[None] | None" = None
+    _error: Exception | None = None
+
+    @classmethod
+    async def open(
+        cls, address: ServerAddress, codec: ClientCodec[T], **kwargs: Any
+    ) -> "ClientConnection[T]":
+        if isinstance(address, str):
+            reader, writer = await asyncio.open_unix_connection(address)
+        else:
+            reader, writer = await asyncio.open_connection(*address)
+        conn = cls(reader=reader, writer=writer, codec=codec, **kwargs)
+        conn._out = ConnectionWriter(writer=writer, conn_id=str(address), framed=True)
+        conn._out.start()
+        conn._reader_task = asyncio.create_task(conn._read_loop())
+        return conn
+
+    @property
+    def inflight(self) -> int:
+        return len(self._waiting) + len(self._streams)
+
+    @property
+    def closed(self) -> bool:
+        return self._error is not None
+
+    def _next_id(self) -> str:
+        return str(next(self._ids))
+
+    async def _read_loop(self) -> None:
+        framer = LengthPrefixFramer(max_frame_size=self.max_frame_size)
+        try:
+            while True:
+                data = await self.reader.read(64 * 1024)
+                if not data:
+                    raise ClientConnectionError("Connection closed by server")
+                for frame in framer.feed(data):
+                    self._dispatch(frame)
+        except asyncio.CancelledError:
+            self._fail(ClientConnectionError("Connection closed"))
+            raise
+        except Exception as e:
+            self._fail(
+                e
+                if isinstance(e, ClientConnectionError)
+                else ClientConnectionError(str(e))
+            )
+
+    def _dispatch(self, frame: memoryview) -> None:
+        is_end, end_id = parse_stream_end(frame)
+        if is_end:
+            if end_id is not None and end_id in self._streams:
+                self._streams.pop(end_id).put_nowait(_END)
+            return
+        req_id, body = parse_response_header(frame)
+        if req_id is None:
+            return
+        queue = self._streams.get(req_id)
+        if queue is not None:
+            queue.put_nowait(self.codec.decode_body(body))
+            return
+        future = self._waiting.pop(req_id, None)
+        if future is not None and not future.done():
+            try:
+                future.set_result(self.codec.decode_body(body))
+            except Exception as e:
+                future.set_exception(e)
+
+    def _fail(self, error: Exception) -> None:
+        self._error = error
+        for future in self._waiting.values():
+            if not future.done():
+                future.set_exception(error)
+        for queue in self._streams.values():
+            queue.put_nowait(error)
+        self._waiting.clear()
+        self._streams.clear()
+
+    def _check(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def _send(self, frames: list[bytes]) -> None:
+        assert self._out is not None
+        self._out.send(frames)
+
+    def submit(self, route: str, data: T) -> "asyncio.Future[T]":
+        """Envia sem esperar a resposta; o future resolve quando ela chegar."""
+        self._check()
+        req_id = self._next_id()
+        future: asyncio.Future[T] = asyncio.get_running_loop().create_future()
+        self._waiting[req_id] = future
+        self._send([self.codec.encode_request(data, route, req_id)])
+        return future
+
+    def submit_many(self, route: str, items: Iterable[T]) -> list["asyncio.Future[T]"]:
+        """Vários requests num único envio (um writelines)."""
+        self._check()
+        loop = asyncio.get_running_loop()
+        futures: list[asyncio.Future[T]] = []
+        frames: list[bytes] = []
+        for data in items:
+            req_id = self._next_id()
+            future: asyncio.Future[T] = loop.create_future()
+            self._waiting[req_id] = future
+            futures.append(future)
+            frames.append(self.codec.encode_request(data, route, req_id))
+        self._send(frames)
+        return futures
+
+    def forget(self, future: "asyncio.Future[T]") -> None:
+        """Descarta um request (timeout): a resposta, se vier, é ignorada."""
+        for req_id, waiting in self._waiting.items():
+            if waiting is future:
+                del self._waiting[req_id]
+                return
+
+    async def stream(self, route: str, data: T) -> AsyncIterator[T]:
+        self._check()
+        req_id = self._next_id()
+        queue: asyncio.Queue[Any] = asyncio.Queue()
+        self._streams[req_id] = queue
+        self._send([self.codec.encode_request(data, route, req_id)])
+        try:
+            while True:
+                item = await queue.get()
+                if item is _END:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            self._streams.pop(req_id, None)
+
+    async def close(self) -> None:
+        if self._out is not None:
+            await self._out.close()
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._reader_task
+        self.writer.close()
+        with suppress(ConnectionError):
+            await self.writer.wait_closed()
+
+
+# ---------- pool ----------
+
+
+@dataclass
+class Client(Generic[T]):
+    """
+    Pool de conexões para um ou mais servers (TCP ou unix, sempre framed).
+
+    Cada request vai para a conexão com menos requests em voo; novas
+    conexões são abertas sob demanda até pool_size por server, e conexões
+    que caíram são descartadas e reabertas no próximo request.
+
+        async with Client([("127.0.0.1", 9000)], simple_str_codec()) as client:
+            reply = await client.request("echo", "hi")
+            replies = await client.request_many("echo", ["a", "b", "c"])
+            async for row in client.stream("rows", "query"):
+                ...
+
+    Limitação: o protocolo não marca respostas de erro. Quando o handler
+    falha, o server responde com o payload do exception handler (o JSON do
+    ExceptionRegistry, por padrão) no mesmo formato de uma resposta normal,
+    e request() devolve esse valor em vez de levantar exceção. Quem precisa
+    distinguir deve registrar handlers com um payload reconhecível.
+    """
+
+    addresses: Sequence[ServerAddress]
+    codec: ClientCodec[T]
+    pool_size: int = 4
+    timeout: float | None = 10.0
+    # requests em voo numa conexão antes de abrir outra
+    max_inflight_per_conn: int = 256
+    max_frame_size: int = DEFAULT_MAX_FRAME_SIZE
+
+    _conns: dict[int, list[ClientConnection[T]]] = field(
+        default_factory=dict[int, list[ClientConnection[T]]]
+    )
+    _opening: dict[int, list["asyncio.Task[ClientConnection[T]]"]] = field(
+        default_factory=dict[int, list["asyncio.Task[ClientConnection[T]]"]]
+    )
+    _rr: Iterator[int] = field(default_factory=itertools.count)
+
+    def __post_init__(self):
+        if not self.addresses:
+            raise ValueError("Client needs at least one server address")
+        if self.pool_size < 1:
+            raise ValueError("pool_size must be >= 1")
+
+    async def __aenter__(self) -> "Client[T]":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    @property
+    def connections(self) -> int:
+        return sum(len(conns) for conns in self._conns.values())
+
+    async def _acquire(self) -> ClientConnection[T]:
+        # servers em round robin; dentro do server, a conexão menos ocupada
+        index = next(self._rr) % len(self.addresses)
+        conns = self._conns.setdefault(index, [])
+        conns[:] = [conn for conn in conns if not conn.closed]
+        opening = self._opening.setdefault(index, [])
+
+        best = min(conns, key=lambda conn: conn.inflight, default=None)
+        can_open = len(conns) + len(opening) < self.pool_size
+        if best is not None and (
+            best.inflight < self.max_inflight_per_conn or not can_open
+        ):
+            return best
+        if not can_open:
+            # pool cheio e nenhuma conexão pronta: usa a que está abrindo
+            return await asyncio.shield(opening[0])
+
+        task = asyncio.create_task(self._open(index))
+        opening.append(task)
+        return await asyncio.shield(task)
+
+    async def _open(self, index: int) -> ClientConnection[T]:
+        address = self.addresses[index]
+        try:
+            conn = await ClientConnection.open(
+                address, self.codec, max_frame_size=self.max_frame_size
+            )
+        except OSError as e:
+            raise ClientConnectionError(f"Could not connect to {address}: {e}") from e
+        finally:
+            self._opening[index].remove(asyncio.current_task())  # type: ignore
+        self._conns[index].append(conn)
+        return conn
+
+    async def _wait(self, conn: ClientConnection[T], future: "asyncio.Future[T]") -> T:
+        try:
+            return await asyncio.wait_for(future, self.timeout)
+        except asyncio.TimeoutError:
+            conn.forget(future)
+            raise
+
+    async def request(self, route: str, data: T) -> T:
+        conn = await self._acquire()
+        return await self._wait(conn, conn.submit(route, data))
+
+    async def request_many(self, route: str, items: Iterable[T]) -> list[T]:
+        """Envia todos os items de uma vez (pipelined) e espera as respostas."""
+        conn = await self._acquire()
+        futures = conn.submit_many(route, items)
+        return list(
+            await asyncio.gather(*(self._wait(conn, future) for future in futures))
+        )
+
+    async def stream(self, route: str, data: T) -> AsyncIterator[T]:
+        """Resposta em stream (handler async generator), item a item."""
+        conn = await self._acquire()
+        async for item in conn.stream(route, data):
+            yield item
+
+    async def close(self) -> None:
+        conns = [conn for group in self._conns.values() for conn in group]
+        self._conns.clear()
+        await asyncio.gather(*(conn.close() for conn in conns))
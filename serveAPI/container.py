@@ -1,5 +1,5 @@
 import asyncio
-from typing import Any
+from typing import Any, Callable
 from uuid import uuid4
 
 from serveAPI import middleware
@@ -13,6 +13,7 @@ from serveAPI.di import DependencyInjector, IoCContainer, IoCContainerSingleton
 from serveAPI.encoder import NonIntrusiveHeaderEncoder
 from serveAPI.exceptionhandler import ExceptionRegistry
 from serveAPI.exceptions import (
+    CachedErrorHandler,
     DependencyResolveError,
     EncoderDecodeError,
     EncoderEncodeError,
@@ -23,28 +24,41 @@ from serveAPI.exceptions import (
     UnhandledError,
     internal_exception_handler,
 )
-from serveAPI.interfaces import ISockerServer, LaunchTask, TypeCast
+from serveAPI.interfaces import ExceptionResponse, ISockerServer, LaunchTask, TypeCast
 from serveAPI.launchers.asyncio_launcher import provide_asyncio_launcher
+from serveAPI.launchers.bounded_launcher import BoundedLauncher
+from serveAPI.offload import ThreadOffloader
 from serveAPI.router import RouterAPI
 from serveAPI.safedict import SafeDict
 from serveAPI.serverAPI import App
+from serveAPI.servers.framing import DEFAULT_MAX_FRAME_SIZE
 from serveAPI.servers.tcpserver import TCPServer
+from serveAPI.servers.unixserver import UnixStreamServer
 from serveAPI.taskrunner import TaskRunner
 
 
+def register_internal_handlers(
+    er: ExceptionRegistry, handler: Callable[[BaseException], ExceptionResponse]
+) -> ExceptionRegistry:
+    er.set_handler(EncoderEncodeError, handler)
+    er.set_handler(EncoderDecodeError, handler)
+    er.set_handler(RouterError, handler)
+    er.set_handler(RequestMiddlewareError, handler)
+    er.set_handler(ResponseMiddlewareError, handler)
+    er.set_handler(ParamsResolveError, handler)
+    er.set_handler(DependencyResolveError, handler)
+    er.set_handler(UnhandledError, handler=handler)
+
+    return er
+
+
 def provide_exception(_: IoCContainer) -> ExceptionRegistry:
-    er = ExceptionRegistry()
+    return register_internal_handlers(ExceptionRegistry(), internal_exception_handler)
 
-    er.set_handler(EncoderEncodeError, internal_exception_handler)
-    er.set_handler(EncoderDecodeError, internal_exception_handler)
-    er.set_handler(RouterError, internal_exception_handler)
-    er.set_handler(RequestMiddlewareError, internal_exception_handler)
-    er.set_handler(ResponseMiddlewareError, internal_exception_handler)
-    er.set_handler(ParamsResolveError, internal_exception_handler)
-    er.set_handler(DependencyResolveError, internal_exception_handler)
-    er.set_handler(UnhandledError, handler=internal_exception_handler)
 
-    return er
+def provide_cached_exception(_: IoCContainer) -> ExceptionRegistry:
+    """Erros internos com payloads pré-serializados (ver CachedErrorHandler)."""
+    return register_internal_handlers(ExceptionRegistry(), CachedErrorHandler())
 
 
 def provide_router(_: IoCContainer) -> RouterAPI:
@@ -67,6 +81,7 @@ def provide_taskrunner(container: IoCContainer) -> TaskRunner[Any]:
     router = container.resolve(RouterAPI)
     launcher = container.resolve(LaunchTask)
     exception = container.resolve(ExceptionRegistry)
+    offloader = container.resolve(ThreadOffloader)
     none_server = container.resolve(ISockerServer)
 
     return TaskRunner(
@@ -77,6 +92,7 @@ def provide_taskrunner(container: IoCContainer) -> TaskRunner[Any]:
         router=router,
         launcher=launcher,
         exception_handlers=exception,
+        offloader=offloader,
         _server=none_server,
     )
 
@@ -97,6 +113,10 @@ def provide_makeid(_: IoCContainer) -> MakeID:
     return MakeID()
 
 
+def provide_offloader(_: IoCContainer) -> ThreadOffloader:
+    return ThreadOffloader()
+
+
 def provide_none_server(_: IoCContainer) -> None:
     return None
 
@@ -110,6 +130,7 @@ def get_base_ioc():
     ioc.register(DependencyInjector, provide_di)
     ioc.register(LaunchTask, provide_asyncio_launcher)
     ioc.register(MakeID, provide_makeid)
+    ioc.register(ThreadOffloader, provide_offloader)
 
     ioc.register(TaskRunner, provide_taskrunner)
 
@@ -138,23 +159,72 @@ def get_hashed_str_ioc():
     return ioc
 
 
-def ServerAPI(host: str, port: int, fire_and_forget: bool):
-    ioc = get_str_ioc()
+def ServerAPI(
+    host: str,
+    port: int,
+    fire_and_forget: bool,
+    framed: bool = False,
+    max_frame_size: int = DEFAULT_MAX_FRAME_SIZE,
+    max_inflight: int | None = None,
+    max_pending: int = 4096,
+    reuse_port: bool = False,
+    unix_path: str | None = None,
+    max_connections: int | None = None,
+    idle_timeout: float | None = None,
+    cached_errors: bool = False,
+):
+    """
+    unix_path: serve num socket AF_UNIX (host/port/reuse_port ignorados).
+        Não há SO_REUSEPORT para unix sockets: se outro server já escuta no
+        path, start levanta OSError(EADDRINUSE) (um path por worker).
+    cached_errors: erros internos com payloads pré-serializados e rate limit.
+    """
+    ioc = get_simple_str_ioc()
+    if cached_errors:
+        ioc.register(ExceptionRegistry, provide_cached_exception)
+    if max_inflight is not None:
+        ioc.register(
+            LaunchTask,
+            lambda _: BoundedLauncher(
+                max_inflight=max_inflight, max_pending=max_pending
+            ),
+        )
     taskrunner = ioc.resolve(TaskRunner)
     makeid = ioc.resolve(MakeID)
-    server = TCPServer(
-        host=host,
-        port=port,
-        runner=taskrunner,
-        fire_and_forget=fire_and_forget,
-        makeid=makeid,
-    )
+    launcher = ioc.resolve(LaunchTask)
+    backpressure = launcher if isinstance(launcher, BoundedLauncher) else None
+    server: TCPServer
+    if unix_path is not None:
+        server = UnixStreamServer(
+            path=unix_path,
+            runner=taskrunner,
+            fire_and_forget=fire_and_forget,
+            makeid=makeid,
+            framed=framed,
+            max_frame_size=max_frame_size,
+            backpressure=backpressure,
+            max_connections=max_connections,
+            idle_timeout=idle_timeout,
+        )
+    else:
+        server = TCPServer(
+            host=host,
+            port=port,
+            runner=taskrunner,
+            fire_and_forget=fire_and_forget,
+            makeid=makeid,
+            framed=framed,
+            max_frame_size=max_frame_size,
+            backpressure=backpressure,
+            reuse_port=reuse_port,
+            max_connections=max_connections,
+            idle_timeout=idle_timeout,
+        )
     taskrunner.inject_server(server)
     router = ioc.resolve(RouterAPI)
     middleware = ioc.resolve(Middleware_)
     er = ioc.resolve(ExceptionRegistry)
     do = ioc.resolve(DependencyInjector)
-    launcher = ioc.resolve(LaunchTask)
 
     app = App(
         _server=server,
@@ -163,5 +233,6 @@ def ServerAPI(host: str, port: int, fire_and_forget: bool):
         _exception_handler=er,
         dependency_overrides=do,
         _launcher=launcher,
+        _offloader=ioc.resolve(ThreadOffloader),
     )
     return app
@@ -1,10 +1,15 @@
+import re
 from dataclasses import dataclass, field
 from typing import Any, Callable, Mapping, TypeVar
 
 import orjson
 from pydantic import BaseModel
 
-from serveAPI.encoder import IntrusiveHeaderEncoder, NonIntrusiveHeaderEncoder
+from serveAPI.encoder import (
+    IntrusiveHeaderEncoder,
+    NonIntrusiveHeaderEncoder,
+    add_request_id,
+)
 from serveAPI.exceptions import ParseError
 from serveAPI.interfaces import TypeCast
 
@@ -13,35 +18,45 @@ def dict_encode(value: Mapping[Any, Any]) -> bytes:
     return orjson.dumps(value)
 
 
-def dict_decode(input: bytes) -> Mapping[Any, Any]:
+def dict_decode(input: bytes | memoryview) -> Mapping[Any, Any]:
+    # orjson.loads aceita memoryview (payload de um frame) sem cópia para bytes
     return orjson.loads(input)
 
 
 # CLIENT SIDE CODE COMPATIBLE WITH THE SERVER PARSER
 # at least 2 data copy involved
-def make_nonintrusive_json_header(value: BaseModel, route: str) -> bytes:
+def make_nonintrusive_json_header(
+    value: BaseModel, route: str, req_id: str | None = None
+) -> bytes:
     model_bytes = orjson.dumps(value.model_dump())
-    header_prefix = f"serveAPI:{route}:".encode()
+    header_prefix = f"serveAPI:{add_request_id(route, req_id)}:".encode()
     return header_prefix + model_bytes
 
 
-def parse_nonintrusive_json_header(value: bytes) -> tuple[str, bytes]:
+_ROUTE_SEP = re.compile(rb":")
+
+
+def parse_nonintrusive_json_header(
+    value: bytes | memoryview,
+) -> tuple[str, bytes | memoryview]:
+    # aceita memoryview (frames do TCPServer): payload devolvido sem cópia
     prefix = b"serveAPI:"
-    if not value.startswith(prefix):
+    if value[: len(prefix)] != prefix:
         raise ParseError(
             "Function<parse_nonintrusive_json_header>: Invalid Header: no prefix 'serveAPI:'"
         )
 
     route_start_idx = len(prefix)
-    route_end_idx = value.find(b":", route_start_idx)
+    match = _ROUTE_SEP.search(value, route_start_idx)
 
-    if route_end_idx == -1:
+    if match is None:
         raise ParseError(
             "Function<parse_nonintrusive_json_header>: Invalid Header: no route separator ':'"
         )
+    route_end_idx = match.start()
 
     try:
-        route = value[route_start_idx:route_end_idx].decode("utf-8")
+        route = str(value[route_start_idx:route_end_idx], "utf-8")
     except UnicodeDecodeError:
         raise ParseError(
             "Function<parse_nonintrusive_json_header>: Route UTF-8 decode Fail"
@@ -63,13 +78,16 @@ def parse_intrusive_json_header(
         raise ParseError(
             f'Function<parse_intrusive_json_header>: Input dict has no field "{idx}"'
         )
-    return value[idx], value
+    # request id opcional no campo "_id"
+    return add_request_id(value[idx], value.get("_id")), value
 
 
 @dataclass
 class IntrusiveMappingEncoder(IntrusiveHeaderEncoder[Mapping[str, Any]]):
     _encode: Callable[[Mapping[str, Any]], bytes] = field(default=dict_encode)
-    _decode: Callable[[bytes], Mapping[str, Any]] = field(default=dict_decode)
+    _decode: Callable[[bytes | memoryview], Mapping[str, Any]] = field(
+        default=dict_decode
+    )
     _parser: Callable[[Mapping[str, Any]], tuple[str, Mapping[str, Any]]] = field(
         default=parse_intrusive_json_header
     )
@@ -78,8 +96,10 @@ class IntrusiveMappingEncoder(IntrusiveHeaderEncoder[Mapping[str, Any]]):
 @dataclass
 class NonIntrusiveMappingEncoder(NonIntrusiveHeaderEncoder[Mapping[str, Any]]):
     _encode: Callable[[Mapping[str, Any]], bytes] = field(default=dict_encode)
-    _decode: Callable[[bytes], Mapping[str, Any]] = field(default=dict_decode)
-    _parser: Callable[[bytes], tuple[str, bytes]] = field(
+    _decode: Callable[[bytes | memoryview], Mapping[str, Any]] = field(
+        default=dict_decode
+    )
+    _parser: Callable[[bytes | memoryview], tuple[str, bytes | memoryview]] = field(
         default=parse_nonintrusive_json_header
     )
 
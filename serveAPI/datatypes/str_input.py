@@ -3,17 +3,23 @@ from typing import Callable
 
 from serveAPI.datatypes.str_hash import check_hash, make_hash
 from serveAPI.di import IoCContainer
-from serveAPI.encoder import IntrusiveHeaderEncoder
+from serveAPI.encoder import IntrusiveHeaderEncoder, add_request_id
 from serveAPI.exceptions import ParseError
 from serveAPI.interfaces import TypeCast
 from serveAPI.middleware import Middleware
 
+
+def utf8_decode(input: bytes | memoryview) -> str:
+    # str(..) aceita memoryview direto, sem passar por bytes
+    return str(input, "utf-8")
+
+
 # --------- Simple str Msg ----------------------
 
 
 # CLIENT SIDE CODE COMPATIBLE WITH THE SERVER PARSER
-def make_str_simple_header(value: str, route: str) -> str:
-    return f"serveAPI:{route}:{value}"
+def make_str_simple_header(value: str, route: str, req_id: str | None = None) -> str:
+    return f"serveAPI:{add_request_id(route, req_id)}:{value}"
 
 
 def parse_str_simple_header(value: str) -> tuple[str, str]:
@@ -36,7 +42,7 @@ def parse_str_simple_header(value: str) -> tuple[str, str]:
 @dataclass
 class SimpleStrEncoder(IntrusiveHeaderEncoder[str]):
     _encode: Callable[[str], bytes] = field(default=lambda x: x.encode())
-    _decode: Callable[[bytes], str] = field(default=lambda x: x.decode())
+    _decode: Callable[[bytes | memoryview], str] = field(default=utf8_decode)
     _parser: Callable[[str], tuple[str, str]] = field(default=parse_str_simple_header)
 
 
@@ -54,10 +60,10 @@ def provide_str_middleware(_: IoCContainer) -> MiddlewareStr:
 # --------- Hashed str Msg ----------------------
 
 
-def make_str_hashed_header(value: str, route: str) -> str:
+def make_str_hashed_header(value: str, route: str, req_id: str | None = None) -> str:
     hashed = make_hash(value)
 
-    return f"serveAPI:{hashed}:{route}:{value}"
+    return f"serveAPI:{hashed}:{add_request_id(route, req_id)}:{value}"
 
 
 def parse_str_hashed_header(header: str) -> tuple[str, str]:
@@ -95,12 +101,12 @@ def parse_str_hashed_header(header: str) -> tuple[str, str]:
 @dataclass
 class HashedStrEncoder(IntrusiveHeaderEncoder[str]):
     _encode: Callable[[str], bytes] = field(default=lambda x: x.encode())
-    _decode: Callable[[bytes], str] = field(default=lambda x: x.decode())
+    _decode: Callable[[bytes | memoryview], str] = field(default=utf8_decode)
     _parser: Callable[[str], tuple[str, str]] = field(default=parse_str_hashed_header)
 
 
-def provide_str_hashed_encoder(_: IoCContainer) -> SimpleStrEncoder:
-    return SimpleStrEncoder()
+def provide_str_hashed_encoder(_: IoCContainer) -> HashedStrEncoder:
+    return HashedStrEncoder()
 
 
 class StrCast(TypeCast[str]):
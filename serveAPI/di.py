@@ -1,10 +1,15 @@
+import asyncio
 import inspect
-from dataclasses import dataclass, field
+from contextlib import AsyncExitStack, asynccontextmanager, contextmanager
+from dataclasses import dataclass, field, replace
 from typing import (
     Annotated,
     Any,
     Awaitable,
     Callable,
+    Iterator,
+    Literal,
+    Mapping,
     MutableMapping,
     Sequence,
     get_args,
@@ -12,7 +17,7 @@ from typing import (
     get_type_hints,
 )
 
-from serveAPI.interfaces import Depends
+from serveAPI.interfaces import Depends, DependsScope, IAddr, Params
 
 
 @dataclass
@@ -65,86 +70,457 @@ class IoCContainerSingleton(IoCContainer):
         return instance
 
 
+def unwrap_annotation(annotation: Any) -> tuple[Any, Sequence[Any]]:
+    if annotation is None:
+        return None, ()
+    origin = get_origin(annotation)
+    if origin is None:
+        return annotation, ()
+    if origin is Annotated:
+        args = get_args(annotation)
+        return args[0], args[1:]
+    return annotation, ()
+
+
+@dataclass(frozen=True)
+class ArgPlan:
+    """Um parâmetro de uma função, com a anotação já desembrulhada."""
+
+    name: str
+    real_type: Any
+    depends: "DependencyPlan | None" = None
+    is_type: bool = False
+
+
+@dataclass(frozen=True)
+class DependencyPlan:
+    """
+    Árvore de Depends de uma função, compilada uma vez (inspect.signature e
+    get_type_hints só rodam aqui). from_container: Depends(Tipo), resolvido
+    no IoC; senão func é chamada com os args resolvidos.
+
+    is_async: func ou alguma dependência dela é coroutine function.
+    concurrent: 2+ dependências diretas async, resolvidas em paralelo (são
+    irmãs, nenhuma precisa da outra; as dependências de cada uma continuam
+    resolvidas antes dela).
+    """
+
+    func: Callable[..., Any]
+    args: tuple[ArgPlan, ...] = ()
+    from_container: bool = False
+    scope: DependsScope = "call"
+    is_async: bool = False
+    concurrent: bool = False
+    # func com yield: o valor é o que ela produz e o resto dela roda no
+    # teardown do scope (fim do request ou shutdown do app)
+    generator: Literal["sync", "async"] | None = None
+
+
+def iter_dependencies(plan: DependencyPlan) -> Iterator[DependencyPlan]:
+    """Todos os nós Depends da árvore (sem a raiz), em profundidade."""
+    for arg in plan.args:
+        if arg.depends is not None:
+            yield from iter_dependencies(arg.depends)
+            yield arg.depends
+
+
+def compile_dependencies(
+    func: Callable[..., Any],
+    overrides: Mapping[Any, Any] | None = None,
+    used: set[Any] | None = None,
+) -> DependencyPlan:
+    """
+    overrides: troca a dependência de um Depends (ex.: em testes).
+    used: recebe todas as dependências da árvore (antes do override).
+    """
+    sig = inspect.signature(func)
+    type_hints = get_type_hints(func, include_extras=True)
+    args: list[ArgPlan] = []
+
+    for name, param in sig.parameters.items():
+        real_type, extras = unwrap_annotation(type_hints.get(name))
+
+        depends_obj: Depends | None = None
+        for extra in extras:
+            if isinstance(extra, Depends):
+                depends_obj = extra
+                break
+        if depends_obj is None and isinstance(param.default, Depends):
+            depends_obj = param.default
+
+        depends: DependencyPlan | None = None
+        if depends_obj is not None:
+            dep = depends_obj.dependency
+            if used is not None:
+                used.add(dep)
+            if overrides:
+                dep = overrides.get(dep, dep)
+            if isinstance(dep, type):
+                depends = DependencyPlan(
+                    func=dep, from_container=True, scope=depends_obj.scope
+                )
+            else:
+                depends = replace(
+                    compile_dependencies(dep, overrides, used),
+                    scope=depends_obj.scope,
+                )
+
+        args.append(
+            ArgPlan(
+                name=name,
+                real_type=real_type,
+                depends=depends,
+                is_type=isinstance(real_type, type),
+            )
+        )
+    async_deps = sum(
+        1 for arg in args if arg.depends is not None and arg.depends.is_async
+    )
+    generator: Literal["sync", "async"] | None = None
+    if inspect.isasyncgenfunction(func):
+        generator = "async"
+    elif inspect.isgeneratorfunction(func):
+        generator = "sync"
+    return DependencyPlan(
+        func=func,
+        args=tuple(args),
+        is_async=(
+            inspect.iscoroutinefunction(func) or generator == "async" or async_deps > 0
+        ),
+        concurrent=async_deps > 1,
+        generator=generator,
+    )
+
+
+def _find_arg(plan: DependencyPlan, arg_type: type) -> str | None:
+    for arg in plan.args:
+        if arg.real_type is arg_type:
+            return arg.name
+    return None
+
+
+@dataclass(frozen=True)
+class CallPlan:
+    """O que o TaskRunner precisa saber de um handler, sem reflexão por request."""
+
+    input_type: type | None
+    params_arg: str | None
+    addr_arg: str | None
+    is_stream: bool
+    dependencies: DependencyPlan
+    # False: handler síncrono (roda inline ou no offloader, ver TaskRunner)
+    is_async: bool = True
+
+    def bind(self, params: Params, addr: IAddr) -> dict[str, Any]:
+        kwargs: dict[str, Any] = {}
+        if self.params_arg:
+            kwargs[self.params_arg] = params
+        if self.addr_arg:
+            kwargs[self.addr_arg] = addr
+        return kwargs
+
+
+def is_async_callable(func: Callable[..., Any]) -> bool:
+    """Coroutine/async generator function, inclusive objetos com __call__ async."""
+    for target in (func, getattr(func, "__call__", None)):
+        if inspect.iscoroutinefunction(target) or inspect.isasyncgenfunction(target):
+            return True
+    return False
+
+
+def compile_call_plan(
+    handler: Callable[..., Any], input_type: type | None = None
+) -> CallPlan:
+    dependencies = compile_dependencies(handler)
+    return CallPlan(
+        input_type=input_type,
+        params_arg=_find_arg(dependencies, Params),
+        addr_arg=_find_arg(dependencies, IAddr),
+        is_stream=inspect.isasyncgenfunction(handler),
+        dependencies=dependencies,
+        is_async=is_async_callable(handler),
+    )
+
+
+class DependencyOverrides(MutableMapping[Any, Any]):
+    """dependência -> substituta; cada alteração avisa o injector (on_change)."""
+
+    def __init__(self, on_change: Callable[[Any], None]):
+        self._data: dict[Any, Any] = {}
+        self._on_change = on_change
+
+    def __getitem__(self, key: Any) -> Any:
+        return self._data[key]
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._data[key] = value
+        self._on_change(key)
+
+    def __delitem__(self, key: Any) -> None:
+        del self._data[key]
+        self._on_change(key)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+@dataclass
+class RequestScope:
+    """Valores das dependências scope="request", compartilhados num request."""
+
+    values: dict[Callable[..., Any], Any] = field(
+        default_factory=dict[Callable[..., Any], Any]
+    )
+    # em construção: dependências irmãs esperam o mesmo valor
+    pending: "dict[Callable[..., Any], asyncio.Future[Any]]" = field(
+        default_factory=dict["Callable[..., Any]", "asyncio.Future[Any]"]
+    )
+    _stack: AsyncExitStack | None = None
+
+    @property
+    def stack(self) -> AsyncExitStack:
+        """Teardown das dependências generator (criado só quando há uma)."""
+        if self._stack is None:
+            self._stack = AsyncExitStack()
+        return self._stack
+
+    async def aclose(self) -> None:
+        """Roda o código depois do yield das dependências, na ordem reversa."""
+        stack, self._stack = self._stack, None
+        if stack is not None:
+            await stack.aclose()
+
+
+@dataclass
+class DIStats:
+    hits: int = 0
+    misses: int = 0
+    invalidations: int = 0
+
+
 @dataclass
 class DependencyInjector:
+    """
+    Os planos (DependencyPlan) são cacheados por callable. Um override em
+    dependency_overrides invalida os planos que usam a dependência
+    substituída. Registrar providers no container não invalida nada: o
+    container é consultado na hora de resolver, não na compilação.
+    """
+
     container: IoCContainer = field(default_factory=IoCContainer)
+    dependency_overrides: DependencyOverrides = field(init=False, repr=False)
+    stats: DIStats = field(default_factory=DIStats)
+    _plans: dict[Callable[..., Any], DependencyPlan] = field(
+        default_factory=dict[Callable[..., Any], DependencyPlan]
+    )
+    # dependência -> callables cujo plano a contém
+    _dependents: dict[Any, set[Callable[..., Any]]] = field(
+        default_factory=dict[Any, set[Callable[..., Any]]]
+    )
+    # scope="app": valores prontos e construções em andamento
+    _app_values: dict[Callable[..., Any], Any] = field(
+        default_factory=dict[Callable[..., Any], Any]
+    )
+    _app_pending: "dict[Callable[..., Any], asyncio.Task[Any]]" = field(
+        default_factory=dict["Callable[..., Any]", "asyncio.Task[Any]"]
+    )
+    # scope do processo: teardown dos generators scope="app" no shutdown
+    _app_scope: RequestScope = field(default_factory=RequestScope)
 
-    def _unwrap_annotation(self, annotation: Any) -> tuple[Any, Sequence[Any]]:
-        if annotation is None:
-            return None, ()
-        origin = get_origin(annotation)
-        if origin is None:
-            return annotation, ()
-        if origin is Annotated:
-            args = get_args(annotation)
-            return args[0], args[1:]
-        return annotation, ()
+    def __post_init__(self):
+        self.dependency_overrides = DependencyOverrides(self._invalidate)
+
+    def plan(self, func: Callable[..., Any]) -> DependencyPlan:
+        try:
+            plan = self._plans.get(func)
+        except TypeError:
+            # callable não-hashable: compila sem cache
+            return compile_dependencies(func, self.dependency_overrides)
+        if plan is not None:
+            self.stats.hits += 1
+            return plan
+
+        self.stats.misses += 1
+        used: set[Any] = set()
+        plan = compile_dependencies(func, self.dependency_overrides, used)
+        self._plans[func] = plan
+        for dep in used:
+            self._dependents.setdefault(dep, set()).add(func)
+        return plan
+
+    def _invalidate(self, dep: Any) -> None:
+        roots = self._dependents.pop(dep, set())
+        roots.add(dep)
+        for root in roots:
+            if self._plans.pop(root, None) is not None:
+                self.stats.invalidations += 1
+        self._app_values.pop(dep, None)
+
+    def clear_cache(self) -> None:
+        self._plans.clear()
+        self._dependents.clear()
+
+    async def startup(self, funcs: Sequence[Callable[..., Any]]) -> None:
+        """Constrói as dependências scope="app" usadas por funcs."""
+        for func in funcs:
+            for dep in iter_dependencies(self.plan(func)):
+                if dep.scope == "app":
+                    await self._resolve_app(dep)
+
+    async def shutdown(self) -> None:
+        for task in self._app_pending.values():
+            task.cancel()
+        self._app_pending.clear()
+        self._app_values.clear()
+        scope, self._app_scope = self._app_scope, RequestScope()
+        await scope.aclose()
 
     async def resolve(
         self,
         func: Callable[..., Any],
         context: MutableMapping[Any, Any] | None = None,
     ) -> MutableMapping[str, Any]:
-        context = context or {}
-        return await self._resolve_dependencies(func, context)
+        """
+        Dependências generator ficam abertas até o aclose() do RequestScope
+        do contexto; sem um, o teardown delas não roda.
+        """
+        return await self.resolve_plan(self.plan(func), context)
 
-    async def _resolve_dependencies(
+    async def resolve_plan(
         self,
-        func: Callable[..., Any],
-        context: MutableMapping[Any, Any],
+        plan: DependencyPlan,
+        context: MutableMapping[Any, Any] | None = None,
     ) -> MutableMapping[str, Any]:
-        sig = inspect.signature(func)
-        type_hints = get_type_hints(func, include_extras=True)
+        if context is None:
+            context = {}
+        if RequestScope not in context:
+            context[RequestScope] = RequestScope()
         kwargs: MutableMapping[str, Any] = {}
+        concurrent: list[ArgPlan] = []
 
-        for name, param in sig.parameters.items():
-            annotation = type_hints.get(name)
-            real_type, extras = self._unwrap_annotation(annotation)
-
+        for arg in plan.args:
             # 1) Injeção por contexto (Params, IAddr, etc)
-            if real_type in context:
-                kwargs[name] = context[real_type]
+            if arg.real_type in context:
+                kwargs[arg.name] = context[arg.real_type]
                 continue
 
-            # 2) Procura Depends em Annotated extras
-            depends_obj: Depends | None = None
-            for extra in extras:
-                if isinstance(extra, Depends):
-                    depends_obj = extra
-                    break
-
-            # 3) Se não achou em Annotated, vê se default é Depends
-            if depends_obj is None and isinstance(param.default, Depends):
-                depends_obj = param.default
-
-            # 4) Se for Depends, resolve
-            if depends_obj:
-                value = await self._resolve_single(depends_obj, context)
-                kwargs[name] = value
+            # 2) Depends (em Annotated ou como default)
+            if arg.depends is not None:
+                if plan.concurrent and arg.depends.is_async:
+                    concurrent.append(arg)
+                    continue
+                kwargs[arg.name] = await self._resolve_single(arg.depends, context)
                 continue
 
-            # 5) Caso naked real_type seja um IO-container‐registered type
-            if isinstance(real_type, type) and real_type in self.container:
-                kwargs[name] = self.container.resolve(real_type)
+            # 3) Caso naked real_type seja um IO-container‐registered type
+            if arg.is_type and arg.real_type in self.container:
+                kwargs[arg.name] = self.container.resolve(arg.real_type)
                 continue
 
             # Caso contrário, ignora (param obrigatório levantará TypeError quando chamar)
+
+        if len(concurrent) > 1:
+            values = await self._gather(
+                [self._resolve_single(arg.depends, context) for arg in concurrent]  # type: ignore
+            )
+            for arg, value in zip(concurrent, values):
+                kwargs[arg.name] = value
+        elif concurrent:
+            arg = concurrent[0]
+            kwargs[arg.name] = await self._resolve_single(arg.depends, context)  # type: ignore
         return kwargs
 
+    async def _gather(self, coros: list[Awaitable[Any]]) -> list[Any]:
+        """gather que cancela as irmãs se uma falhar (o primeiro erro sobe)."""
+        tasks = [asyncio.ensure_future(coro) for coro in coros]
+        try:
+            return await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+
     async def _resolve_single(
         self,
-        dep_obj: Depends,
+        dep: DependencyPlan,
         context: MutableMapping[Any, Any],
     ) -> Any:
-        dep = dep_obj.dependency
+        if dep.scope == "request":
+            return await self._resolve_request(dep, context)
+        if dep.scope == "app":
+            return await self._resolve_app(dep)
+        return await self._build(dep, context)
 
-        if isinstance(dep, type):
+    async def _resolve_request(
+        self, dep: DependencyPlan, context: MutableMapping[Any, Any]
+    ) -> Any:
+        scope: RequestScope = context[RequestScope]
+        key = dep.func
+        if key in scope.values:
+            return scope.values[key]
+        pending = scope.pending.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        scope.pending[key] = future
+        try:
+            value = await self._build(dep, context)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # o erro sobe por aqui; quem esperava vê o mesmo erro
+            future.exception()
+            raise
+        else:
+            scope.values[key] = value
+            future.set_result(value)
+            return value
+        finally:
+            del scope.pending[key]
+
+    async def _resolve_app(self, dep: DependencyPlan) -> Any:
+        key = dep.func
+        if key in self._app_values:
+            return self._app_values[key]
+        task = self._app_pending.get(key)
+        if task is None:
+            # contexto próprio: nada do request fica preso num valor do processo
+            task = asyncio.ensure_future(
+                self._build(dep, {RequestScope: self._app_scope})
+            )
+            self._app_pending[key] = task
+            task.add_done_callback(lambda _: self._app_pending.pop(key, None))
+        # shield: cancelar um request não cancela a construção compartilhada
+        value = await asyncio.shield(task)
+        self._app_values[key] = value
+        return value
+
+    async def _build(
+        self,
+        dep: DependencyPlan,
+        context: MutableMapping[Any, Any],
+    ) -> Any:
+        if dep.from_container:
             # resolve do IoC
-            value = self.container.resolve(dep)
+            value = self.container.resolve(dep.func)
         else:
             # função: resolve recursivamente suas próprias deps
-            inner_kwargs = await self._resolve_dependencies(dep, context)
-            value = dep(**inner_kwargs)
+            inner_kwargs = await self.resolve_plan(dep, context)
+            if dep.generator == "async":
+                stack = context[RequestScope].stack
+                cm = asynccontextmanager(dep.func)(**inner_kwargs)
+                return await stack.enter_async_context(cm)
+            if dep.generator == "sync":
+                stack = context[RequestScope].stack
+                return stack.enter_context(contextmanager(dep.func)(**inner_kwargs))
+            value = dep.func(**inner_kwargs)
 
         if isinstance(value, Awaitable):
             value = await value
@@ -155,6 +531,7 @@ class DependencyInjector:
         funcs: Sequence[Callable[..., Any]],
         context: MutableMapping[Any, Any] | None = None,
     ) -> None:
-        context = context or {}
+        if context is None:
+            context = {}
         for func in funcs:
             await self.resolve(func, context)
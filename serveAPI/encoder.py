@@ -1,3 +1,4 @@
+import re
 from dataclasses import dataclass
 from typing import Callable, TypeVar
 
@@ -5,24 +6,90 @@ from serveAPI.interfaces import IEncoder
 
 T = TypeVar("T")
 
+# request id opcional, anexado à rota: "serveAPI:<route>#<id>:<payload>"
+# ('#' não é permitido em rotas pelo PathValidator)
+REQUEST_ID_SEP = "#"
+
+# fim de stream: "serveAPI!<id>:" (separador próprio, nunca igual a uma
+# resposta comum, nem a um item que encode para vazio)
+STREAM_END_SEP = "!"
+
+
+def split_request_id(route: str) -> tuple[str, str | None]:
+    route, sep, req_id = route.partition(REQUEST_ID_SEP)
+    return route, (req_id or None) if sep else None
+
+
+def add_request_id(route: str, req_id: str | None) -> str:
+    return route if req_id is None else f"{route}{REQUEST_ID_SEP}{req_id}"
+
+
+def make_response_header(req_id: str) -> bytes:
+    return f"serveAPI{REQUEST_ID_SEP}{req_id}:".encode()
+
+
+def make_stream_end(req_id: str | None) -> bytes:
+    """
+    Fim de uma resposta em stream (handler async generator): só o header
+    "serveAPI!<id>:" ("serveAPI!:" sem request id), sem corpo.
+    """
+    return f"serveAPI{STREAM_END_SEP}{req_id or ''}:".encode()
+
+
+_RESPONSE_HEADER = re.compile(rb"serveAPI" + REQUEST_ID_SEP.encode() + rb"([^:]*):")
+_STREAM_END = re.compile(rb"serveAPI" + STREAM_END_SEP.encode() + rb"([^:]*):")
+
+
+# CLIENT SIDE CODE COMPATIBLE WITH THE SERVER RESPONSE
+def parse_response_header(
+    value: bytes | memoryview,
+) -> tuple[str | None, bytes | memoryview]:
+    match = _RESPONSE_HEADER.match(value)
+    if match is None:
+        return None, value
+    return match.group(1).decode(), value[match.end() :]
+
+
+def parse_stream_end(value: bytes | memoryview) -> tuple[bool, str | None]:
+    """(é fim de stream, request id) de uma resposta."""
+    match = _STREAM_END.fullmatch(value)
+    if match is None:
+        return False, None
+    return True, match.group(1).decode() or None
+
 
 @dataclass
 class BaseEncoder(IEncoder[T]):
     _encode: Callable[[T], bytes]
-    _decode: Callable[[bytes], T]
+    _decode: Callable[[bytes | memoryview], T]
 
-    def decode(self, input: bytes) -> tuple[str, T]:
+    def decode(self, input: bytes | memoryview) -> tuple[str, T]:
         raise Exception("Base Encoder has no implementation")
 
     def encode(self, output: T) -> bytes:
         return self._encode(output)
 
+    def decode_body(self, input: bytes | memoryview) -> T:
+        """Decodifica só o payload, já sem header (ex.: resposta do server)."""
+        return self._decode(input)
+
+    def decode_request(self, input: bytes | memoryview) -> tuple[str, str | None, T]:
+        route, data = self.decode(input)
+        route, req_id = split_request_id(route)
+        return route, req_id, data
+
+    def encode_response(self, output: T, req_id: str | None) -> bytes:
+        encoded = self._encode(output)
+        if req_id is None:
+            return encoded
+        return make_response_header(req_id) + encoded
+
 
 @dataclass
 class IntrusiveHeaderEncoder(BaseEncoder[T]):
     _parser: Callable[[T], tuple[str, T]]
 
-    def decode(self, input: bytes) -> tuple[str, T]:
+    def decode(self, input: bytes | memoryview) -> tuple[str, T]:
         decoded = self._decode(input)
 
         return self._parser(decoded)
@@ -30,9 +97,9 @@ class IntrusiveHeaderEncoder(BaseEncoder[T]):
 
 @dataclass
 class NonIntrusiveHeaderEncoder(BaseEncoder[T]):
-    _parser: Callable[[bytes], tuple[str, bytes]]
+    _parser: Callable[[bytes | memoryview], tuple[str, bytes | memoryview]]
 
-    def decode(self, input: bytes) -> tuple[str, T]:
+    def decode(self, input: bytes | memoryview) -> tuple[str, T]:
         route, raw_data = self._parser(input)
         data = self._decode(raw_data)
 
@@ -3,13 +3,25 @@ from dataclasses import dataclass, field
 from typing import MutableMapping, Type
 
 from serveAPI.exceptions import UnhandledError
-from serveAPI.interfaces import IExceptionRegistry
+from serveAPI.interfaces import ExceptionResponse, IExceptionRegistry
 
 
 @dataclass
 class ExceptionRegistry(IExceptionRegistry):
-    _handlers: MutableMapping[Type[BaseException], Callable[[BaseException], str]] = (
-        field(default_factory=dict[Type[BaseException], Callable[[BaseException], str]])
+    _handlers: MutableMapping[
+        Type[BaseException], Callable[[BaseException], ExceptionResponse]
+    ] = field(
+        default_factory=dict[
+            Type[BaseException], Callable[[BaseException], ExceptionResponse]
+        ]
+    )
+    # tipo concreto da exceção -> handler (None: nenhum); limpo a cada registro
+    _dispatch: dict[
+        Type[BaseException], Callable[[BaseException], ExceptionResponse] | None
+    ] = field(
+        default_factory=dict[
+            Type[BaseException], Callable[[BaseException], ExceptionResponse] | None
+        ]
     )
 
     def __contains__(self, key: Type[BaseException]) -> bool:
@@ -18,36 +30,55 @@ class ExceptionRegistry(IExceptionRegistry):
     def set_handler(
         self,
         exc_type: Type[BaseException],
-        handler: Callable[[BaseException], str],
+        handler: Callable[[BaseException], ExceptionResponse],
     ) -> None:
         """Registra diretamente um handler para um tipo de exceção."""
         self._handlers[exc_type] = handler
+        self._dispatch.clear()
 
     def decorator(
         self,
         exc_type: Type[BaseException],
     ) -> Callable[
-        [Callable[[BaseException], str]],
-        Callable[[BaseException], str],
+        [Callable[[BaseException], ExceptionResponse]],
+        Callable[[BaseException], ExceptionResponse],
     ]:
         """Decorator para uso como @app.exception_handler(SomeException)."""
 
         def wrapper(
-            func: Callable[[BaseException], str],
-        ) -> Callable[[BaseException], str]:
+            func: Callable[[BaseException], ExceptionResponse],
+        ) -> Callable[[BaseException], ExceptionResponse]:
             self._handlers[exc_type] = func
+            self._dispatch.clear()
             return func
 
         return wrapper
 
-    def resolve(self, exc: BaseException) -> str:
-        """Resolve uma exceção usando o handler registrado."""
-        sorted_handlers = sorted(
+    def _lookup(
+        self, exc_type: Type[BaseException]
+    ) -> Callable[[BaseException], ExceptionResponse] | None:
+        # classe mais específica primeiro, na ordem do MRO
+        for klass in exc_type.__mro__:
+            handler = self._handlers.get(klass)
+            if handler is not None:
+                return handler
+
+        # subclasses virtuais (ABC.register) não aparecem no __mro__
+        for registered, handler in sorted(
             self._handlers.items(), key=lambda item: -len(item[0].mro())
-        )
+        ):
+            if issubclass(exc_type, registered):
+                return handler
+        return None
 
-        for exc_type, handler in sorted_handlers:
-            if isinstance(exc, exc_type):
-                return handler(exc)
+    def resolve(self, exc: BaseException) -> ExceptionResponse:
+        """Resolve uma exceção usando o handler registrado."""
+        exc_type = type(exc)
+        try:
+            handler = self._dispatch[exc_type]
+        except KeyError:
+            handler = self._dispatch[exc_type] = self._lookup(exc_type)
 
-        raise UnhandledError("From ExceptionRegistry") from exc
+        if handler is None:
+            raise UnhandledError("From ExceptionRegistry") from exc
+        return handler(exc)
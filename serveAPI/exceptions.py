@@ -1,6 +1,10 @@
 import json
-from collections import defaultdict
-from typing import MutableMapping
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass, field
+from typing import Callable, MutableMapping
+
+import orjson
 
 
 class ServerAPIException(Exception):
@@ -63,5 +67,106 @@ def internal_exception_handler(
     return json.dumps(err_msg, ensure_ascii=False)
 
 
+@dataclass
+class ErrorStats:
+    built: int = 0  # payloads serializados
+    cached: int = 0  # servidos do cache
+    collapsed: int = 0  # sem OriginalException por causa do rate limit
+
+
+@dataclass
+class CachedErrorHandler:
+    """
+    Mesmo JSON de internal_exception_handler, devolvido já em bytes:
+
+    - {"Exception": {...}} é serializado uma vez por (tipo, msg); para os
+      erros do TaskRunner (msg fixa) isso vira um payload pré-pronto por
+      categoria (decode, rota não encontrada, middleware, ...);
+    - OriginalException, a parte dinâmica, usa orjson;
+    - payloads idênticos recentes saem de um LRU;
+    - acima de detail_rate payloads novos por segundo (rajada de até burst),
+      erros repetidos colapsam para a parte estável, sem OriginalException.
+    """
+
+    cache_size: int = 1024
+    detail_rate: float = 1000.0
+    burst: float = 1000.0
+    clock: Callable[[], float] = time.monotonic
+    stats: ErrorStats = field(default_factory=ErrorStats)
+
+    _heads: dict[tuple[type, str], bytes] = field(
+        default_factory=dict[tuple[type, str], bytes]
+    )
+    _cache: OrderedDict[tuple[type, str, type, str], bytes] = field(
+        default_factory=OrderedDict[tuple[type, str, type, str], bytes]
+    )
+    _tokens: float = field(init=False)
+    _last: float = field(init=False)
+
+    def __post_init__(self):
+        self._tokens = self.burst
+        self._last = self.clock()
+
+    def __call__(self, err: BaseException) -> bytes:
+        err_type, err_msg = type(err), str(err)
+        head = self._head(err_type, err_msg)
+
+        original = err.__cause__ or err.__context__
+        if original is None:
+            return head + b"}"
+
+        key = (err_type, err_msg, type(original), str(original))
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            self.stats.cached += 1
+            return cached
+
+        if not self._take_token():
+            self.stats.collapsed += 1
+            return head + b"}"
+
+        detail = orjson.dumps({"Type": type(original).__name__, "Msg": key[3]})
+        payload = b"".join((head, b',"OriginalException":', detail, b"}"))
+        self.stats.built += 1
+        self._cache[key] = payload
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return payload
+
+    def _head(self, err_type: type, err_msg: str) -> bytes:
+        head = self._heads.get((err_type, err_msg))
+        if head is None:
+            if len(self._heads) >= self.cache_size:
+                # msgs dinâmicas (fora do TaskRunner) não crescem sem limite
+                self._heads.clear()
+            body = orjson.dumps({"Type": err_type.__name__, "Msg": err_msg})
+            head = self._heads[(err_type, err_msg)] = b'{"Exception":' + body
+        return head
+
+    def _take_token(self) -> bool:
+        now = self.clock()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._last) * self.detail_rate
+        )
+        self._last = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+
 class ParseError(ServerAPIException):
     pass
+
+
+class FrameTooLargeError(ServerAPIException):
+    pass
+
+
+class LauncherFullError(ServerAPIException):
+    pass
+
+
+class ClientConnectionError(ServerAPIException):
+    pass
@@ -15,9 +15,18 @@ T = TypeVar("T")
 
 middlewareType = Literal["request", "response"]
 
+# handlers de exceção podem devolver o response já em bytes (sem .encode())
+ExceptionResponse = str | bytes
 
-class Params(dict[str, str]):
-    pass
+# call: resolvida a cada uso; request: uma vez por request; app: uma vez por processo
+DependsScope = Literal["call", "request", "app"]
+
+
+class Params(dict[str, Any]):
+    """
+    Parâmetros de path da rota, já convertidos: str por default, ou o tipo
+    do conversor do template ({id:int} -> int, {id:uuid} -> UUID).
+    """
 
 
 class IAddr(Protocol):
@@ -39,6 +48,14 @@ class IMiddlewareFunc(Protocol[T]):
     ) -> T: ...
 
 
+class IOffloader(Protocol):
+    """Roda funções síncronas fora do event loop."""
+
+    async def run(
+        self, func: Callable[..., Any], /, *args: Any, **kwargs: Any
+    ) -> Any: ...
+
+
 class IMiddleware(Protocol[T]):
     def add_middleware_func(
         self, func: Callable[[T], T], type: middlewareType
@@ -47,12 +64,23 @@ class IMiddleware(Protocol[T]):
         [Callable[[T], T]],
         Callable[[T], T],
     ]: ...
-    async def proc(self, data: T, type: middlewareType) -> T: ...
+    async def proc(
+        self, data: T, type: middlewareType, offloader: IOffloader | None = None
+    ) -> T: ...
 
 
 @dataclass
 class Depends:
     dependency: Callable[[], Any] | type[Any]
+    scope: DependsScope = "call"
+
+
+class ICallPlan(Protocol):
+    @property
+    def is_stream(self) -> bool: ...
+    @property
+    def is_async(self) -> bool: ...
+    def bind(self, params: Params, addr: IAddr) -> dict[str, Any]: ...
 
 
 class IHandlerPack(Protocol):
@@ -64,6 +92,12 @@ class IHandlerPack(Protocol):
     def input_type(self) -> type | None: ...
     @property
     def dependencies(self) -> Sequence[Callable[..., Any]]: ...
+    @property
+    def plan(self) -> ICallPlan: ...
+    @property
+    def path(self) -> str: ...
+    @property
+    def offload(self) -> bool: ...
 
     # @property
     # def output_type(self) -> type | None: ...
@@ -77,6 +111,7 @@ class IRouterAPI(Protocol):
         handler: Callable[..., Any],
         *,
         dependencies: list[Depends] | None = None,
+        offload: bool = False,
     ) -> None: ...
     def route(self, path: str) -> Callable[..., Callable[..., Any]]: ...
     def get_handler_pack(self, route: str) -> tuple[IHandlerPack, Params]: ...
@@ -84,22 +119,43 @@ class IRouterAPI(Protocol):
 
 class ISockerServer(Protocol):
     async def start(self) -> None: ...
+    async def stop_accepting(self) -> None: ...
     async def stop(self) -> None: ...
     async def write(self, data: bytes, addr: IAddr) -> None: ...
 
+    # escrita não final de uma resposta em stream; False = peer não existe mais
+    async def write_stream(self, data: bytes, addr: IAddr) -> bool: ...
+    async def release(self, addr: IAddr) -> None: ...
+
 
 class TypeCast(Protocol[T]):
     def to_model(self, arg: T, model: type | None) -> Any: ...
     def from_model(self, arg: Any) -> T: ...
 
 
+class IDrainResult(Protocol):
+    drained: int
+    cancelled: int
+
+
 class LaunchTask(Protocol):
     def __call__(self, coro: Coroutine[Any, Any, None]) -> None: ...
+    @property
+    def inflight(self) -> int: ...
+    async def drain(self, timeout: float | None = None) -> IDrainResult: ...
+
+
+class IBoundedLauncher(LaunchTask, Protocol):
+    @property
+    def full(self) -> bool: ...
+    async def wait_ready(self) -> None: ...
+    def drop_oldest(self) -> bool: ...
 
 
 class ITaskRunner(Protocol):
     def inject_server(self, server: ISockerServer) -> None: ...
-    def __call__(self, input: bytes, addr: IAddr) -> None: ...
+    def __call__(self, input: bytes | memoryview, addr: IAddr) -> None: ...
+    async def execute(self, input: bytes | memoryview, addr: IAddr) -> None: ...
 
 
 class IExceptionRegistry(Protocol):
@@ -109,20 +165,24 @@ class IExceptionRegistry(Protocol):
     def set_handler(
         self,
         exc_type: Type[BaseException],
-        handler: Callable[[BaseException], str],
+        handler: Callable[[BaseException], ExceptionResponse],
     ) -> None: ...
 
     def decorator(
         self,
         exc_type: Type[BaseException],
     ) -> Callable[
-        [Callable[[BaseException], str]],
-        Callable[[BaseException], str],
+        [Callable[[BaseException], ExceptionResponse]],
+        Callable[[BaseException], ExceptionResponse],
     ]: ...
 
-    def resolve(self, exc: BaseException) -> str: ...
+    def resolve(self, exc: BaseException) -> ExceptionResponse: ...
 
 
 class IEncoder(Protocol[T]):
-    def decode(self, input: bytes) -> tuple[str, T]: ...
+    def decode(self, input: bytes | memoryview) -> tuple[str, T]: ...
     def encode(self, output: T) -> bytes: ...
+    def decode_request(
+        self, input: bytes | memoryview
+    ) -> tuple[str, str | None, T]: ...
+    def encode_response(self, output: T, req_id: str | None) -> bytes: ...
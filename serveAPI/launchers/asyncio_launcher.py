@@ -1,15 +1,34 @@
 import asyncio
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Coroutine
 
 from serveAPI.di import IoCContainer
 from serveAPI.interfaces import LaunchTask
+from serveAPI.launchers.drain import DrainResult, drain_tasks
 
 
 @dataclass
 class AsyncioLauncher(LaunchTask):
+    # referência forte aos tasks (o loop só guarda weakrefs) e base do drain
+    _tasks: set["asyncio.Task[None]"] = field(default_factory=set["asyncio.Task[None]"])
+    _finished: int = 0  # tasks concluídos sem cancelamento (ver drain_tasks)
+
     def __call__(self, coro: Coroutine[Any, Any, None]) -> None:
-        asyncio.create_task(coro)
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._on_done)
+
+    def _on_done(self, task: "asyncio.Task[None]") -> None:
+        self._tasks.discard(task)
+        if not task.cancelled():
+            self._finished += 1
+
+    @property
+    def inflight(self) -> int:
+        return len(self._tasks)
+
+    async def drain(self, timeout: float | None = None) -> DrainResult:
+        return await drain_tasks(self._tasks, timeout, finished=lambda: self._finished)
 
 
 def provide_asyncio_launcher(_: IoCContainer) -> AsyncioLauncher:
@@ -0,0 +1,130 @@
+import asyncio
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Coroutine
+
+from serveAPI.di import IoCContainer
+from serveAPI.exceptions import LauncherFullError
+from serveAPI.interfaces import IBoundedLauncher
+from serveAPI.launchers.drain import DrainResult, drain_tasks
+
+
+@dataclass
+class LauncherStats:
+    launched: int = 0
+    queued: int = 0
+    rejected: int = 0
+    dropped: int = 0
+
+
+@dataclass
+class BoundedLauncher(IBoundedLauncher):
+    """
+    Launcher com limite de tasks em execução e fila de espera limitada.
+
+    Quando tasks e fila estão cheias, 'full' fica True: os servers devem parar
+    de ler (TCP) ou descartar mensagens (UDP) até 'wait_ready' liberar.
+    Se mesmo assim uma coroutine chegar, ela é fechada e LauncherFullError sobe.
+    """
+
+    max_inflight: int = 1024
+    max_pending: int = 4096
+    stats: LauncherStats = field(default_factory=LauncherStats)
+
+    _inflight: int = 0
+    _pending: deque[Coroutine[Any, Any, None]] = field(
+        default_factory=deque[Coroutine[Any, Any, None]]
+    )
+    _ready: asyncio.Event = field(default_factory=asyncio.Event)
+    _tasks: set["asyncio.Task[None]"] = field(default_factory=set["asyncio.Task[None]"])
+    _finished: int = 0  # tasks concluídos sem cancelamento (ver drain_tasks)
+
+    def __post_init__(self):
+        if self.max_inflight < 1 or self.max_pending < 0:
+            raise ValueError("max_inflight must be >= 1 and max_pending >= 0")
+        self._ready.set()
+
+    @property
+    def inflight(self) -> int:
+        return self._inflight
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    @property
+    def full(self) -> bool:
+        return (
+            self._inflight >= self.max_inflight
+            and len(self._pending) >= self.max_pending
+        )
+
+    def __call__(self, coro: Coroutine[Any, Any, None]) -> None:
+        if self._inflight < self.max_inflight:
+            self._start(coro)
+        elif len(self._pending) < self.max_pending:
+            self._pending.append(coro)
+            self.stats.queued += 1
+        else:
+            coro.close()
+            self.stats.rejected += 1
+            raise LauncherFullError(
+                f"Launcher full: {self._inflight} running, {len(self._pending)} pending"
+            )
+        if self.full:
+            self._ready.clear()
+
+    def drop_oldest(self) -> bool:
+        """Descarta a coroutine mais antiga da fila (política 'drop_oldest')."""
+        if not self._pending:
+            return False
+        self._pending.popleft().close()
+        self.stats.dropped += 1
+        if not self.full:
+            self._ready.set()
+        return True
+
+    async def drain(self, timeout: float | None = None) -> DrainResult:
+        """
+        Espera os tasks em execução e a fila até 'timeout'; o que sobrar é
+        cancelado (em execução) ou fechado sem rodar (fila).
+        """
+        result = await drain_tasks(
+            self._tasks,
+            timeout,
+            self._discard_pending,
+            finished=lambda: self._finished,
+        )
+        self._ready.set()
+        return result
+
+    def _discard_pending(self) -> int:
+        count = len(self._pending)
+        while self._pending:
+            self._pending.popleft().close()
+        return count
+
+    async def wait_ready(self) -> None:
+        while self.full:
+            await self._ready.wait()
+
+    def _start(self, coro: Coroutine[Any, Any, None]) -> None:
+        self._inflight += 1
+        self.stats.launched += 1
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._on_done)
+
+    def _on_done(self, task: "asyncio.Task[None]") -> None:
+        self._tasks.discard(task)
+        self._inflight -= 1
+        if not task.cancelled():
+            self._finished += 1
+        if self._pending:
+            self._start(self._pending.popleft())
+        if not self.full:
+            self._ready.set()
+
+
+def provide_bounded_launcher(_: IoCContainer) -> BoundedLauncher:
+    return BoundedLauncher()
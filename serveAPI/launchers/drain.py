@@ -0,0 +1,60 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Callable
+
+
+@dataclass
+class DrainResult:
+    drained: int = 0  # terminaram dentro do prazo
+    cancelled: int = 0  # cancelados (ou nunca iniciados) no fim do prazo
+
+    def __add__(self, other: "DrainResult") -> "DrainResult":
+        return DrainResult(
+            self.drained + other.drained, self.cancelled + other.cancelled
+        )
+
+
+async def drain_tasks(
+    tasks: set["asyncio.Task[None]"],
+    timeout: float | None,
+    discard_pending: Callable[[], int] | None = None,
+    finished: Callable[[], int] | None = None,
+) -> DrainResult:
+    """
+    Espera os tasks do set terminarem até 'timeout' segundos e cancela o
+    resto. O set é o mesmo que o launcher atualiza nos done callbacks, então
+    tasks iniciados durante a espera (fila do BoundedLauncher) também entram.
+
+    discard_pending: descarta o que ainda não começou antes dos cancelamentos
+    (senão cada task cancelado abriria vaga para um da fila) e devolve quantos.
+
+    finished: contador de tasks concluídos (sem cancelamento) do launcher.
+    Com ele, 'drained' conta também os tasks que começaram e terminaram
+    entre duas leituras do set (nunca vistos aqui); sem ele, conta só os
+    que estavam no set em alguma das leituras.
+    """
+    loop = asyncio.get_running_loop()
+    finished_at_start = finished() if finished is not None else 0
+    deadline = None if timeout is None else loop.time() + timeout
+    seen: set["asyncio.Task[None]"] = set()
+
+    while tasks:
+        waiting = set(tasks)
+        seen |= waiting
+        remaining = None if deadline is None else deadline - loop.time()
+        if remaining is not None and remaining <= 0:
+            break
+        await asyncio.wait(waiting, timeout=remaining)
+
+    discarded = discard_pending() if discard_pending is not None else 0
+    left = list(tasks)
+    if finished is not None:
+        drained = finished() - finished_at_start
+    else:
+        drained = len(seen - set(left))
+    for task in left:
+        task.cancel()
+    if left:
+        await asyncio.gather(*left, return_exceptions=True)
+
+    return DrainResult(drained=drained, cancelled=len(left) + discarded)
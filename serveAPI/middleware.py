@@ -9,12 +9,20 @@ from typing import (
     Generic,
     MutableSequence,
     TypeVar,
+    cast,
     get_args,
     get_origin,
     get_type_hints,
 )
 
-from serveAPI.interfaces import Depends, IMiddleware, IMiddlewareFunc, middlewareType
+from serveAPI.di import is_async_callable
+from serveAPI.interfaces import (
+    Depends,
+    IMiddleware,
+    IMiddlewareFunc,
+    IOffloader,
+    middlewareType,
+)
 
 T = TypeVar("T")
 
@@ -27,11 +35,16 @@ class Middleware(IMiddleware[T]):
     procs_resp: MutableSequence[Callable[[T], T]] = field(
         default_factory=list[Callable[[T], T]]
     )
+    # proc -> é async; decidido uma vez, no registro (não por request)
+    _is_async: dict[Callable[[T], Any], bool] = field(
+        default_factory=dict[Callable[[T], Any], bool]
+    )
 
     def add_middleware_func(
         self, func: Callable[[T], T], type: middlewareType
     ) -> Callable[[T], T]:
         """Adiciona middleware diretamente"""
+        self._is_async[func] = is_async_callable(func)
         if type == "request":
             self.procs_req.append(func)
         elif type == "response":
@@ -48,7 +61,13 @@ class Middleware(IMiddleware[T]):
         """Usado como decorador: @middleware.use()"""
         return partial(self.add_middleware_func, type=type)
 
-    async def proc(self, data: T, type: middlewareType) -> T:
+    async def proc(
+        self, data: T, type: middlewareType, offloader: IOffloader | None = None
+    ) -> T:
+        """
+        Middlewares async são aguardados; os síncronos rodam inline, ou no
+        offloader quando a rota pede offload.
+        """
         procs = self.procs_req if type == "request" else self.procs_resp
         if type == "request":
             procs = self.procs_req
@@ -59,8 +78,18 @@ class Middleware(IMiddleware[T]):
                 f'Middleware processing be for "request" or "response". "{type}" is not supported'
             )
 
+        is_async = self._is_async
         for proc in procs:
-            data = proc(data)
+            async_proc = is_async.get(proc)
+            if async_proc is None:
+                # colocado direto em procs_req/procs_resp: decide e guarda
+                async_proc = is_async[proc] = is_async_callable(proc)
+            if async_proc:
+                data = await cast(Awaitable[T], proc(data))
+            elif offloader is not None:
+                data = await offloader.run(proc, data)
+            else:
+                data = proc(data)
         return data
 
 
@@ -113,18 +142,35 @@ def validate_middleware_signature(middleware: Callable[..., Any]) -> None:
 
 @dataclass
 class Middleware2(Generic[T]):
-    stack: list[IMiddlewareFunc[T]] = field(default_factory=list)
+    _stack: list[IMiddlewareFunc[T]] = field(default_factory=list)
+    # incrementado a cada alteração do stack (add/remove/clear); o TaskRunner2
+    # recompila a cadeia de middlewares quando muda
+    version: int = field(default=0, init=False)
+
+    @property
+    def stack(self) -> tuple[IMiddlewareFunc[T], ...]:
+        """Só leitura: alterações passam por add/remove/clear."""
+        return tuple(self._stack)
 
     def __iter__(self):
         """Iterador sobre os middlewares, no formato reverso (para processar da última para a primeira)"""
-        return iter(reversed(self.stack))
+        return iter(reversed(self._stack))
 
     def add(self, middleware: IMiddlewareFunc[T]) -> IMiddlewareFunc[T]:
         """Adiciona middleware no estilo FastAPI"""
         validate_middleware_signature(middleware)
-        self.stack.append(middleware)
+        self._stack.append(middleware)
+        self.version += 1
         return middleware
 
+    def remove(self, middleware: IMiddlewareFunc[T]) -> None:
+        self._stack.remove(middleware)
+        self.version += 1
+
+    def clear(self) -> None:
+        self._stack.clear()
+        self.version += 1
+
     def use(self) -> Callable[[IMiddlewareFunc[T]], IMiddlewareFunc[T]]:
         """Usado como decorador"""
         return self.add
@@ -0,0 +1,135 @@
+import asyncio
+import contextvars
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable
+
+
+@dataclass
+class OffloadStats:
+    submitted: int = 0
+    completed: int = 0
+    failed: int = 0
+    cancelled: int = 0  # saíram da fila sem rodar
+    abandoned: int = 0  # quem esperava foi cancelado (a função pode seguir rodando)
+    slow: int = 0  # execuções acima do slow_threshold
+    queue_ns: int = 0  # tempo total esperando uma thread livre
+    exec_ns: int = 0  # tempo total rodando na thread
+    max_queue_ns: int = 0
+    max_exec_ns: int = 0
+
+    @property
+    def pending(self) -> int:
+        """Na fila ou rodando."""
+        return self.submitted - self.completed - self.failed - self.cancelled
+
+    @property
+    def avg_queue_ms(self) -> float:
+        done = self.completed + self.failed
+        return self.queue_ns / done / 1e6 if done else 0.0
+
+    @property
+    def avg_exec_ms(self) -> float:
+        done = self.completed + self.failed
+        return self.exec_ns / done / 1e6 if done else 0.0
+
+
+@dataclass
+class ThreadOffloader:
+    """
+    Roda funções síncronas (handlers e middlewares) num ThreadPoolExecutor
+    com no máximo max_workers threads, fora do event loop.
+
+    O executor só é criado no primeiro run. Os tempos de fila e de execução
+    são medidos na thread; stats é atualizado no loop (sem lock) pelo done
+    callback do future do executor, isto é, quando a função de fato termina,
+    mesmo que quem esperava já tenha sido cancelado.
+    """
+
+    max_workers: int | None = None
+    # segundos; execuções mais longas contam em stats.slow e geram um aviso
+    slow_threshold: float | None = None
+    stats: OffloadStats = field(default_factory=OffloadStats)
+
+    _executor: ThreadPoolExecutor | None = None
+
+    def __post_init__(self):
+        if self.max_workers is not None and self.max_workers < 1:
+            raise ValueError(f"max_workers must be >= 1, got {self.max_workers}")
+
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix="serveAPI-offload"
+            )
+        return self._executor
+
+    async def run(self, func: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+        loop = asyncio.get_running_loop()
+        # [enfileirado, início, fim] em perf_counter_ns
+        times = [time.perf_counter_ns(), 0, 0]
+        ctx = contextvars.copy_context()
+        future = self.executor.submit(ctx.run, _timed, times, func, args, kwargs)
+        self.stats.submitted += 1
+
+        def done(fut: "Future[Any]") -> None:
+            # roda na thread do executor (ou na que cancelou o future)
+            try:
+                loop.call_soon_threadsafe(self._record, func, fut, times)
+            except RuntimeError:
+                pass  # loop já fechado
+
+        future.add_done_callback(done)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            self.stats.abandoned += 1
+            raise
+
+    def _record(
+        self, func: Callable[..., Any], fut: "Future[Any]", times: list[int]
+    ) -> None:
+        stats = self.stats
+        if fut.cancelled():
+            stats.cancelled += 1
+            return
+        if fut.exception() is not None:
+            stats.failed += 1
+        else:
+            stats.completed += 1
+
+        queued, started, finished = times
+        queue_ns = started - queued
+        exec_ns = finished - started
+        stats.queue_ns += queue_ns
+        stats.exec_ns += exec_ns
+        stats.max_queue_ns = max(stats.max_queue_ns, queue_ns)
+        stats.max_exec_ns = max(stats.max_exec_ns, exec_ns)
+        if self.slow_threshold is not None and exec_ns > self.slow_threshold * 1e9:
+            stats.slow += 1
+            name = getattr(func, "__name__", repr(func))
+            print(
+                f"[WARN] Sync function {name} ran for {exec_ns / 1e6:.1f} ms "
+                f"on the offload pool (queued {queue_ns / 1e6:.1f} ms)"
+            )
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+def _timed(
+    times: list[int],
+    func: Callable[..., Any],
+    args: tuple[Any, ...],
+    kwargs: dict[str, Any],
+) -> Any:
+    times[1] = time.perf_counter_ns()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        times[2] = time.perf_counter_ns()
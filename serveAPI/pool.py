@@ -0,0 +1,147 @@
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import (
+    Annotated,
+    AsyncGenerator,
+    Awaitable,
+    Callable,
+    Generic,
+    TypeVar,
+)
+
+from serveAPI.di import IoCContainer
+from serveAPI.interfaces import Depends
+
+T = TypeVar("T")
+
+
+@dataclass
+class PoolStats:
+    created: int = 0
+    reused: int = 0
+    waits: int = 0  # acquire que precisou esperar um recurso livre
+    discarded: int = 0
+
+
+@dataclass
+class AsyncResourcePool(Generic[T]):
+    """
+    Pool de recursos async (conexões com DB, clientes HTTP, ...).
+
+    No máximo max_size recursos existem ao mesmo tempo; os livres são
+    reutilizados do mais recente para o mais antigo (LIFO). Um recurso
+    devolvido depois de erro no checkout é fechado, não reutilizado.
+    """
+
+    factory: Callable[[], Awaitable[T]]
+    close: Callable[[T], Awaitable[None]] | None = None
+    max_size: int = 10
+    stats: PoolStats = field(default_factory=PoolStats)
+
+    _idle: deque[T] = field(default_factory=deque[T])
+    _slots: asyncio.Semaphore = field(init=False)
+    _closed: bool = False
+
+    def __post_init__(self):
+        if self.max_size < 1:
+            raise ValueError(f"max_size must be >= 1, got {self.max_size}")
+        self._slots = asyncio.Semaphore(self.max_size)
+
+    @property
+    def idle(self) -> int:
+        return len(self._idle)
+
+    async def acquire(self) -> T:
+        if self._closed:
+            raise RuntimeError("AsyncResourcePool is closed")
+        if self._slots.locked():
+            self.stats.waits += 1
+        await self._slots.acquire()
+        try:
+            if self._idle:
+                self.stats.reused += 1
+                return self._idle.pop()
+            item = await self.factory()
+            self.stats.created += 1
+            return item
+        except BaseException:
+            self._slots.release()
+            raise
+
+    async def release(self, item: T, discard: bool = False) -> None:
+        try:
+            if discard or self._closed:
+                self.stats.discarded += 1
+                await self._close_item(item)
+            else:
+                self._idle.append(item)
+        finally:
+            self._slots.release()
+
+    @asynccontextmanager
+    async def checkout(self) -> AsyncGenerator[T, None]:
+        item = await self.acquire()
+        try:
+            yield item
+        except BaseException:
+            await self.release(item, discard=True)
+            raise
+        else:
+            await self.release(item)
+
+    async def aclose(self) -> None:
+        """Fecha os recursos livres; os em uso são fechados ao voltar."""
+        self._closed = True
+        while self._idle:
+            await self._close_item(self._idle.pop())
+
+    async def _close_item(self, item: T) -> None:
+        if self.close is not None:
+            await self.close(item)
+
+
+def provide_pool(
+    factory: Callable[[], Awaitable[T]],
+    *,
+    close: Callable[[T], Awaitable[None]] | None = None,
+    max_size: int = 10,
+    pool_type: type[AsyncResourcePool[T]] = AsyncResourcePool,
+) -> Callable[[IoCContainer], AsyncResourcePool[T]]:
+    """
+    Provider para o IoCContainer. O pool é criado no primeiro resolve e
+    reaproveitado depois (também num IoCContainer sem singleton):
+
+        class DBPool(AsyncResourcePool[Conn]): ...
+
+        ioc.register(DBPool, provide_pool(connect, close=disconnect, pool_type=DBPool))
+    """
+    pool: AsyncResourcePool[T] | None = None
+
+    def provider(_: IoCContainer) -> AsyncResourcePool[T]:
+        nonlocal pool
+        if pool is None:
+            pool = pool_type(factory=factory, close=close, max_size=max_size)
+        return pool
+
+    return provider
+
+
+def pooled(
+    pool_type: type[AsyncResourcePool[T]],
+) -> Callable[..., AsyncGenerator[T, None]]:
+    """
+    Dependência generator: pega um recurso do pool registrado no container
+    e devolve depois que o response foi escrito.
+
+        async def handler(input: str, conn: Conn = Depends(pooled(DBPool))): ...
+    """
+
+    async def checkout(
+        pool: Annotated[AsyncResourcePool[T], Depends(pool_type)],
+    ) -> AsyncGenerator[T, None]:
+        async with pool.checkout() as item:
+            yield item
+
+    return checkout
@@ -1,5 +1,6 @@
 import inspect
 import re
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import (
     Annotated,
@@ -13,8 +14,9 @@ from typing import (
     get_origin,
     get_type_hints,
 )
+from uuid import UUID
 
-from serveAPI.di import Depends
+from serveAPI.di import CallPlan, Depends, compile_call_plan
 from serveAPI.interfaces import IAddr, IHandlerPack, IRouterAPI, Params
 
 T = TypeVar("T")
@@ -27,6 +29,21 @@ class HandlerPack:
     # output_type: type | None
     params: tuple[str, ...]
     dependencies: list[Callable[..., Any]] = field(default_factory=list)
+    # template registrado, com nomes e conversores (ex.: "/user/{id:int}/")
+    path: str = ""
+    # handler síncrono (e middlewares síncronos do request) no offloader
+    offload: bool = False
+    # compilado no registro da rota (sem reflexão por request)
+    plan: CallPlan = field(init=False)
+
+    def __post_init__(self):
+        object.__setattr__(
+            self, "plan", compile_call_plan(self.handler, self.input_type)
+        )
+        if self.offload and self.plan.is_async:
+            raise ValueError(
+                f"offload=True requires a sync handler, '{self.path}' is async"
+            )
 
     # def __str__(self) -> str:
     # return f'HandlerPack(input_type:"{self.input_type}, params:"{self.params}"")'
@@ -39,7 +56,10 @@ class PathValidationError(ValueError):
 @dataclass
 class PathValidator:
     # _pattern: str = field(default=r"^[a-zA-Z0-9_\-/{}]+$") #com hifen
-    _pattern: str = field(default=r"^[a-zA-Z0-9_/{}]+$")  # sem hifen
+    # sem hifen; ':' só dentro de {nome:conversor}
+    _pattern: str = field(
+        default=r"^(?:[a-zA-Z0-9_/]|\{[a-zA-Z0-9_]+(?::[a-zA-Z0-9_]+)?\})+$"
+    )
 
     def _compile(self):
         return re.compile(self._pattern)
@@ -50,15 +70,140 @@ class PathValidator:
             raise PathValidationError(f"{name} cannot be empty.")
         if not self._compile().fullmatch(path):
             raise PathValidationError(
-                f"{name} '{path}' contains invalid characters. Allowed: a-zA-Z0-9_/{{}}"
+                f"{name} '{path}' contains invalid characters. "
+                "Allowed: a-zA-Z0-9_/ and {param} or {param:converter}"
             )
 
 
-def extract_path_params(path: str) -> tuple[tuple[str, ...], str]:
-    pattern = re.compile(r"{([^{}]+)}")
-    params = tuple(pattern.findall(path))
-    normalized = pattern.sub("{}", path)
-    return params, f"/{normalized.strip('/')}/"
+def to_int(value: str) -> int:
+    # int() aceitaria também " 42", "4_2" e dígitos não-ASCII
+    digits = value[1:] if value[:1] == "-" else value
+    if not (digits.isascii() and digits.isdigit()):
+        raise ValueError(f"'{value}' is not an int")
+    return int(value)
+
+
+# conversores de {param:nome}; None = str, sem conversão
+CONVERTERS: dict[str, Callable[[str], Any] | None] = {
+    "str": None,
+    "int": to_int,
+    "uuid": UUID,
+}
+
+_PARAM_SEGMENT = re.compile(r"{([a-zA-Z0-9_]+)(?::([a-zA-Z0-9_]+))?}")
+
+
+@dataclass(frozen=True)
+class RouteTemplate:
+    """Um path registrado: segmentos ("{}" = parâmetro), nomes e conversores."""
+
+    segments: tuple[str, ...]
+    params: tuple[str, ...]
+    converters: tuple[Callable[[str], Any] | None, ...]
+
+    @property
+    def normpath(self) -> str:
+        return normalize_route("/".join(self.segments))
+
+
+def normalize_route(route: str) -> str:
+    """'/a/b/' para qualquer variação de barras; a rota raiz é '/'."""
+    route = route.strip("/")
+    return f"/{route}/" if route else "/"
+
+
+def split_route(route: str) -> list[str]:
+    route = route.strip("/")
+    return route.split("/") if route else []
+
+
+def parse_route_template(path: str) -> RouteTemplate:
+    segments: list[str] = []
+    params: list[str] = []
+    converters: list[Callable[[str], Any] | None] = []
+
+    for segment in split_route(path):
+        if "{" not in segment and "}" not in segment:
+            segments.append(segment)
+            continue
+        match = _PARAM_SEGMENT.fullmatch(segment)
+        if match is None:
+            raise PathValidationError(
+                f"Path parameter must be a whole segment: '{segment}' in '{path}'"
+            )
+        name, converter = match.group(1), match.group(2) or "str"
+        if converter not in CONVERTERS:
+            raise PathValidationError(
+                f"Unknown converter '{converter}' in '{path}'. "
+                f"Available: {', '.join(CONVERTERS)}"
+            )
+        segments.append("{}")
+        params.append(name)
+        converters.append(CONVERTERS[converter])
+
+    return RouteTemplate(tuple(segments), tuple(params), tuple(converters))
+
+
+@dataclass
+class RouteNode:
+    """Nó da árvore de segmentos: filhos literais, um filho parâmetro e a rota."""
+
+    static: dict[str, "RouteNode"] = field(default_factory=dict[str, "RouteNode"])
+    param: "RouteNode | None" = None
+    pack: IHandlerPack | None = None
+    converters: tuple[Callable[[str], Any] | None, ...] = ()
+
+    def insert(self, template: RouteTemplate, pack: IHandlerPack) -> None:
+        node = self
+        for segment in template.segments:
+            if segment == "{}":
+                if node.param is None:
+                    node.param = RouteNode()
+                node = node.param
+            else:
+                node = node.static.setdefault(segment, RouteNode())
+        node.pack = pack
+        node.converters = template.converters
+
+    def match(
+        self, segments: list[str], index: int, values: list[str]
+    ) -> tuple[IHandlerPack, Params] | None:
+        """
+        Literal tem prioridade sobre parâmetro; se o caminho literal não
+        chegar numa rota (ou um conversor recusar o valor), tenta o parâmetro.
+        """
+        if index == len(segments):
+            pack = self.pack
+            if pack is None:
+                return None
+            try:
+                return pack, self._bind(pack, values)
+            except ValueError:
+                return None
+
+        segment = segments[index]
+        child = self.static.get(segment)
+        if child is not None:
+            found = child.match(segments, index + 1, values)
+            if found is not None:
+                return found
+
+        if self.param is not None:
+            # clientes antigos mandam o valor entre chaves: {42}
+            if segment[:1] == "{" and segment[-1:] == "}":
+                segment = segment[1:-1]
+            values.append(segment)
+            found = self.param.match(segments, index + 1, values)
+            if found is not None:
+                return found
+            values.pop()
+        return None
+
+    def _bind(self, pack: IHandlerPack, values: list[str]) -> Params:
+        return Params(
+            (name, value if convert is None else convert(value))
+            for name, convert, value in zip(pack.params, self.converters, values)
+        )
 
 
 def validate_handler_signature(handler: Callable[..., Any]) -> type:
@@ -119,6 +264,19 @@ def validate_handler_signature(handler: Callable[..., Any]) -> type:
     return body_type or dict
 
 
+@dataclass
+class RouteCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+
 @dataclass
 class RouterAPI(IRouterAPI, Generic[T]):
     prefix: str = field(default="")
@@ -126,6 +284,15 @@ class RouterAPI(IRouterAPI, Generic[T]):
         default_factory=dict[str, IHandlerPack]
     )
     path_validator: PathValidator = field(default_factory=PathValidator)
+    _tree: RouteNode = field(default_factory=RouteNode)
+    # rotas sem parâmetro: lookup direto, sem descer a árvore
+    _static: dict[str, IHandlerPack] = field(default_factory=dict[str, IHandlerPack])
+    # LRU: route recebido (sem normalizar) -> rota com parâmetros já convertidos
+    route_cache_size: int = 1024
+    cache_stats: RouteCacheStats = field(default_factory=RouteCacheStats)
+    _cache: OrderedDict[str, tuple[IHandlerPack, Params]] = field(
+        default_factory=OrderedDict[str, tuple[IHandlerPack, Params]]
+    )
 
     # def __post_init__(self):
     # self.prefix = self.prefix.strip("/")
@@ -134,7 +301,7 @@ class RouterAPI(IRouterAPI, Generic[T]):
         return list(self.routes.items())
 
     def _make_fullpath(self, path: str) -> str:
-        return f"/{path.strip('/')}/"
+        return normalize_route(path)
 
     def register_route(
         self,
@@ -142,44 +309,73 @@ class RouterAPI(IRouterAPI, Generic[T]):
         handler: Callable[..., Any],
         *,
         dependencies: list[Depends] | None = None,
+        offload: bool = False,
     ) -> None:
 
         self.path_validator.validate_path(path, name="path")
         input_type = validate_handler_signature(handler)
         full_path = self._make_fullpath(path)
-        params, normpath = extract_path_params(full_path)
+        template = parse_route_template(full_path)
 
         dependencies = dependencies or []
-        self.routes[normpath] = HandlerPack(
+        pack = HandlerPack(
             handler=handler,
             input_type=input_type,
-            params=params,
+            params=template.params,
             dependencies=[dep.dependency for dep in dependencies],
+            path=full_path,
+            offload=offload,
         )
+        self.routes[template.normpath] = pack
+        self.clear_cache()
+        self._tree.insert(template, pack)
+        if not template.params:
+            self._static[template.normpath] = pack
 
-    def route(self, path: str, *, dependencies: list[Depends] | None = None):
+    def route(
+        self,
+        path: str,
+        *,
+        dependencies: list[Depends] | None = None,
+        offload: bool = False,
+    ):
         def decorator(handler: Callable[..., Any]):
-            self.register_route(path, handler, dependencies=dependencies)
+            self.register_route(
+                path, handler, dependencies=dependencies, offload=offload
+            )
             return handler
 
         return decorator
 
-    def get_handler_pack(self, route: str) -> tuple[IHandlerPack, Params]:
-        route = f"/{route.strip('/')}/"
+    def clear_cache(self) -> None:
+        if self._cache:
+            self._cache.clear()
+            self.cache_stats.invalidations += 1
 
-        params_input, normroute = extract_path_params(route)
-
-        if normroute in self.routes:
-            route_pack = self.routes[normroute]
-            params_key = route_pack.params
-
-            if len(params_input) != len(params_key):
-                raise Exception()
-
-            params = Params(zip(params_key, params_input))
-
-            return route_pack, params
-        raise Exception(f"Route {route} not found on RouterAPI")
+    def get_handler_pack(self, route: str) -> tuple[IHandlerPack, Params]:
+        pack = self._static.get(normalize_route(route))
+        if pack is not None:
+            return pack, Params()
+
+        cache = self._cache
+        cached = cache.get(route)
+        if cached is not None:
+            cache.move_to_end(route)
+            self.cache_stats.hits += 1
+            # cópia: o handler pode alterar o Params que recebe
+            return cached[0], Params(cached[1])
+
+        self.cache_stats.misses += 1
+        found = self._tree.match(split_route(route), 0, [])
+        if found is None:
+            raise Exception(f"Route {route} not found on RouterAPI")
+
+        if self.route_cache_size > 0:
+            cache[route] = (found[0], Params(found[1]))
+            if len(cache) > self.route_cache_size:
+                cache.popitem(last=False)
+                self.cache_stats.evictions += 1
+        return found
 
 
 if __name__ == "__main__":
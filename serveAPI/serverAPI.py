@@ -1,16 +1,19 @@
 import asyncio
 from contextlib import AbstractAsyncContextManager, asynccontextmanager
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, AsyncGenerator, Callable, Coroutine, Generic, Type, TypeVar
 
 from serveAPI.di import DependencyInjector
 from serveAPI.interfaces import (
+    Depends,
+    IDrainResult,
     IExceptionRegistry,
     IMiddleware,
     IRouterAPI,
     ISockerServer,
     LaunchTask,
 )
+from serveAPI.offload import ThreadOffloader
 
 T = TypeVar("T")
 
@@ -25,14 +28,57 @@ class App(Generic[T]):
     _launcher: LaunchTask
 
     _lifespan: Callable[[], AbstractAsyncContextManager[None]] | None = None
+    _offloader: ThreadOffloader | None = None
+
+    # prazo para os requests em andamento terminarem no shutdown
+    shutdown_timeout: float = 30.0
+    drain_result: IDrainResult | None = None
+    _serving: "asyncio.Task[None] | None" = field(default=None, repr=False)
 
     @asynccontextmanager
     async def _default_lifespan(self) -> AsyncGenerator[None, None]:
-        await self._server.start()
+        # dependências scope="app" são construídas antes do primeiro request
+        await self.dependency_overrides.startup(
+            [pack.handler for _, pack in self._routers.items()]
+        )
+        # TCP: start() só retorna no fim (serve_forever); UDP: retorna logo
+        self._serving = asyncio.create_task(self._server.start())
         try:
             yield
         finally:
-            await self._server.stop()
+            await self.shutdown()
+
+    async def shutdown(self) -> IDrainResult:
+        """
+        Shutdown gracioso: para de aceitar conexões/mensagens, espera os
+        requests em andamento até shutdown_timeout, escreve o que ficou na
+        fila de saída e só então fecha o server. O que não terminou no prazo
+        é cancelado.
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.shutdown_timeout
+        try:
+            await asyncio.wait_for(self._server.stop_accepting(), self.shutdown_timeout)
+        except asyncio.TimeoutError:
+            pass
+
+        result = await self._launcher.drain(max(0.0, deadline - loop.time()))
+        self.drain_result = result
+        print(
+            f"[INFO] Shutdown: {result.drained} tasks drained, "
+            f"{result.cancelled} cancelled"
+        )
+
+        await self._server.stop()
+        if self._serving is not None:
+            self._serving.cancel()
+            await asyncio.gather(self._serving, return_exceptions=True)
+            self._serving = None
+        await self.dependency_overrides.shutdown()
+        if self._offloader is not None:
+            # o drain já esperou os requests; nada mais roda no pool
+            self._offloader.shutdown(wait=False)
+        return result
 
     def lifespan(
         self, func: Callable[[], AsyncGenerator[None, None]]
@@ -60,15 +106,26 @@ class App(Generic[T]):
         cm = self._lifespan or self._default_lifespan
         async with cm():
             # aqui o servidor já está “up” e bloqueia até shutdown
-            await asyncio.Event().wait()  # ou outra forma de esperar a parada
+            # (cancelamento do task, ex.: SIGTERM no supervisor); erro no
+            # start() do server sobe por aqui
+            if self._serving is not None:
+                await self._serving
+            await asyncio.Event().wait()
 
     # API tipo metodo... app.include_router, add_middleware, add_exception_handler
     def include_router(self, router: IRouterAPI):
         for path, handler_pack in router.items():
-            self._routers.register_route(path, handler_pack.handler)
-
-    def add_api_route(self, path: str, handler: Callable[..., Any]):
-        self._routers.register_route(path, handler)
+            self._routers.register_route(
+                handler_pack.path or path,
+                handler_pack.handler,
+                dependencies=[Depends(dep) for dep in handler_pack.dependencies],
+                offload=handler_pack.offload,
+            )
+
+    def add_api_route(
+        self, path: str, handler: Callable[..., Any], *, offload: bool = False
+    ):
+        self._routers.register_route(path, handler, offload=offload)
 
     def add_middleware(self, middleware: Callable[[T], T]) -> None:
         self._middleware.add_middleware_func(middleware)
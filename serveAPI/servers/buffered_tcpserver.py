@@ -0,0 +1,272 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Callable, cast
+
+from serveAPI.addr import ConnAddr
+from serveAPI.interfaces import IAddr, IBoundedLauncher, ISockerServer, ITaskRunner
+from serveAPI.servers.connection import Connection
+from serveAPI.servers.framing import DEFAULT_MAX_FRAME_SIZE, FRAME_HEADER, frame_header
+
+TransportConnection = Connection[asyncio.Transport]
+
+
+class _BufferedTCPProtocol(asyncio.BufferedProtocol):
+    """
+    Uma instância por conexão.
+
+    O kernel escreve direto no buffer pré-alocado (get_buffer); os headers
+    dos frames são lidos no lugar e cada payload é copiado uma única vez,
+    do buffer de recepção para o bytes entregue ao runner (o buffer é
+    reutilizado na próxima leitura, então o payload não pode ser uma view).
+    """
+
+    def __init__(self, server: "BufferedTCPServer"):
+        self._server = server
+        self._buffer = bytearray(server.buffer_size)
+        self._view = memoryview(self._buffer)
+        self._start = 0  # início dos dados ainda não consumidos
+        self._end = 0  # fim dos dados recebidos
+        self._transport: asyncio.Transport | None = None
+        self._conn: TransportConnection | None = None
+        self._ip = ""
+        self._port = 0
+        self._paused = False
+        self._resume_task: "asyncio.Task[None] | None" = None
+        self._can_write = asyncio.Event()
+        self._can_write.set()
+
+    # ---------- conexão ----------
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self._transport = cast(asyncio.Transport, transport)
+        peer = transport.get_extra_info("peername")
+        conn_id = str(peer) if peer else self._server.makeid()
+        if peer:
+            self._ip, self._port = peer[0], peer[1]
+        self._conn = TransportConnection(
+            conn_id=conn_id, writer=self._transport, ordered=self._server.ordered
+        )
+        self._server._protocols[conn_id] = self
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        if self._conn is not None:
+            self._server._protocols.pop(self._conn.conn_id, None)
+        if self._resume_task is not None:
+            self._resume_task.cancel()
+            self._resume_task = None
+        # acorda quem estava esperando para escrever
+        self._can_write.set()
+
+    # ---------- leitura ----------
+
+    def get_buffer(self, sizehint: int) -> memoryview:
+        if self._end == len(self._buffer):
+            self._make_room(len(self._buffer))
+        return self._view[self._end :]
+
+    def buffer_updated(self, nbytes: int) -> None:
+        self._end += nbytes
+        self._process()
+
+    def _make_room(self, needed: int) -> None:
+        """Move o frame incompleto para o início; cresce o buffer se ele não couber."""
+        pending = self._end - self._start
+        if needed <= len(self._buffer) and self._start > 0:
+            # memoryview trata sobreposição (memmove)
+            self._view[:pending] = self._view[self._start : self._end]
+        else:
+            new = bytearray(max(needed, len(self._buffer) * 2))
+            new[:pending] = self._view[self._start : self._end]
+            self._view.release()
+            self._buffer = new
+            self._view = memoryview(new)
+        self._start, self._end = 0, pending
+
+    def _process(self) -> None:
+        server = self._server
+        view = self._view
+        header_size = FRAME_HEADER.size
+        bp = server.backpressure
+        start, end = self._start, self._end
+
+        while end - start >= header_size:
+            if bp is not None and bp.full:
+                self._pause_until_ready(bp)
+                break
+
+            (size,) = FRAME_HEADER.unpack_from(view, start)
+            if size > server.max_frame_size:
+                conn_id = self._conn.conn_id if self._conn else ""
+                print(
+                    f"[WARN] Frame of {size} bytes exceeds max_frame_size. "
+                    f"Closing connection {conn_id}"
+                )
+                if self._transport is not None:
+                    self._transport.close()
+                self._start = self._end = 0
+                return
+
+            stop = start + header_size + size
+            if stop > end:
+                if header_size + size > len(self._buffer):
+                    self._start = start
+                    self._make_room(header_size + size)
+                    return
+                break
+
+            server._dispatch(bytes(view[start + header_size : stop]), self)
+            start = stop
+
+        if start == end:
+            # tudo consumido: volta ao início do buffer sem copiar nada
+            start = end = 0
+        self._start, self._end = start, end
+
+    def _pause_until_ready(self, bp: IBoundedLauncher) -> None:
+        if self._paused or self._transport is None:
+            return
+        self._paused = True
+        self._transport.pause_reading()
+        # referência guardada: o loop só tem weakref para os tasks
+        self._resume_task = asyncio.create_task(self._resume_when_ready(bp))
+
+    async def _resume_when_ready(self, bp: IBoundedLauncher) -> None:
+        await bp.wait_ready()
+        self._resume_task = None
+        self._paused = False
+        if self._transport is not None and not self._transport.is_closing():
+            # frames já recebidos são entregues mesmo depois de stop_accepting
+            self._process()
+            if not self._paused and self._server._accepting:
+                self._transport.resume_reading()
+
+    # ---------- escrita ----------
+
+    def pause_writing(self) -> None:
+        self._can_write.clear()
+
+    def resume_writing(self) -> None:
+        self._can_write.set()
+
+    def send(self, chunks: list[bytes]) -> None:
+        transport = self._transport
+        if transport is None or transport.is_closing():
+            return
+        for chunk in chunks:
+            transport.writelines((frame_header(len(chunk)), chunk))
+
+    async def wait_writable(self) -> None:
+        await self._can_write.wait()
+
+
+@dataclass
+class BufferedTCPServer(ISockerServer):
+    """
+    Server TCP sobre asyncio.BufferedProtocol, sempre com frames
+    [len:uint32][payload] (mesmo formato do TCPServer(framed=True)).
+
+    Sem StreamReader/StreamWriter: sem coroutine por leitura e sem drain()
+    por escrita; a escrita vai direto para o transport e só espera quando o
+    transport sinaliza pause_writing (buffer de saída acima do high-water).
+    """
+
+    host: str
+    port: int
+    runner: ITaskRunner
+    fire_and_forget: bool
+    makeid: Callable[[], str]
+    buffer_size: int = 64 * 1024
+    max_frame_size: int = DEFAULT_MAX_FRAME_SIZE
+    ordered: bool = False
+    backpressure: IBoundedLauncher | None = None
+    reuse_port: bool = False
+
+    _protocols: dict[str, _BufferedTCPProtocol] = field(
+        default_factory=dict[str, _BufferedTCPProtocol]
+    )
+    _server: asyncio.AbstractServer | None = None
+    _accepting: bool = True
+
+    def _dispatch(self, payload: bytes, proto: _BufferedTCPProtocol) -> None:
+        conn = proto._conn
+        assert conn is not None
+        self.runner(
+            payload, ConnAddr(proto._ip, proto._port, conn.conn_id, conn.next_seq())
+        )
+
+    def _get_proto(self, addr: IAddr) -> tuple[_BufferedTCPProtocol | None, int]:
+        if isinstance(addr, ConnAddr):
+            return self._protocols.get(addr.conn_id), addr.seq
+        return self._protocols.get(str(addr)), -1
+
+    async def write(self, data: bytes, addr: IAddr) -> None:
+        proto, seq = self._get_proto(addr)
+        if proto is None or proto._conn is None:
+            if self.fire_and_forget:
+                print(f"[INFO] Fire-and-forget mode: no response sent to {addr}")
+            else:
+                print(f"[WARN] No connection found for address: {addr}")
+            return
+
+        if seq < 0:
+            proto.send([data])
+        else:
+            conn = proto._conn
+            chunks = conn.deliver(seq, data)
+            chunks.extend(conn.complete(seq))
+            proto.send(chunks)
+        await proto.wait_writable()
+
+    async def write_stream(self, data: bytes, addr: IAddr) -> bool:
+        proto, seq = self._get_proto(addr)
+        if proto is None or proto._conn is None:
+            return False
+        proto.send([data] if seq < 0 else proto._conn.deliver(seq, data))
+        await proto.wait_writable()
+        return True
+
+    async def release(self, addr: IAddr) -> None:
+        proto, seq = self._get_proto(addr)
+        if proto is not None and proto._conn is not None and seq >= 0:
+            proto.send(proto._conn.complete(seq))
+
+    async def set_ordered(self, conn_id: str, ordered: bool) -> None:
+        proto = self._protocols.get(conn_id)
+        if proto is None or proto._conn is None:
+            raise KeyError(f"No connection {conn_id}")
+        proto.send(proto._conn.set_ordered(ordered))
+
+    async def start(self):
+        loop = asyncio.get_running_loop()
+        self._server = await loop.create_server(
+            lambda: _BufferedTCPProtocol(self),
+            self.host,
+            self.port,
+            reuse_port=self.reuse_port,
+        )
+        addr = self._server.sockets[0].getsockname()
+        print(f"BufferedTCPServer started on {addr}")
+
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def stop_accepting(self) -> None:
+        """Fecha o listener e para de ler; respostas ainda podem ser escritas."""
+        self._accepting = False
+        if self._server:
+            self._server.close()
+        for proto in self._protocols.values():
+            if proto._transport is not None and not proto._transport.is_closing():
+                proto._transport.pause_reading()
+
+    async def stop(self):
+        self._accepting = False
+        if self._server:
+            self._server.close()
+        # close() do transport ainda escreve o buffer de saída antes de fechar
+        for proto in list(self._protocols.values()):
+            if proto._transport is not None:
+                proto._transport.close()
+        if self._server:
+            await self._server.wait_closed()
+            print("BufferedTCPServer stopped")
@@ -0,0 +1,121 @@
+from dataclasses import dataclass
+from typing import Callable, Literal
+
+from serveAPI.servers.conn_writer import ConnectionWriter
+from serveAPI.servers.timing_wheel import WheelTimer
+
+CloseReason = Literal["idle", "write_timeout", "slow_read"]
+
+
+@dataclass
+class ConnStats:
+    accepted: int = 0
+    active: int = 0
+    rejected_max_connections: int = 0
+    closed_idle: int = 0
+    closed_write_timeout: int = 0
+    closed_slow_read: int = 0
+    closed_frame_too_large: int = 0
+
+
+@dataclass(eq=False)
+class ConnGuard:
+    """
+    Regras de timeout de uma conexão, avaliadas pelo TimingWheel do server.
+
+    idle_timeout: sem leitura nem escrita concluída nesse intervalo.
+    write_timeout: um drain() parado há mais que isso (cliente não lê).
+    min_read_rate: com um frame incompleto no buffer, o cliente precisa
+    mandar pelo menos min_read_rate bytes/s, medidos em janelas de
+    read_rate_window segundos (proteção contra slowloris).
+
+    O caminho de leitura só atualiza contadores (on_read); quem compara
+    com os limites é check(), chamado pelo wheel.
+    """
+
+    out: ConnectionWriter
+    close: Callable[[CloseReason], None]
+    partial: Callable[[], bool]  # há frame incompleto esperando bytes?
+    now: float
+    idle_timeout: float | None = None
+    write_timeout: float | None = None
+    min_read_rate: float | None = None
+    read_rate_window: float = 10.0
+
+    last_read: float = 0.0
+    window_start: float = 0.0
+    window_bytes: int = 0
+    timer: WheelTimer | None = None
+    _closed: bool = False
+
+    def __post_init__(self):
+        self.last_read = self.window_start = self.now
+
+    def make_timer(self) -> WheelTimer:
+        self.timer = WheelTimer(self.next_deadline(self.now), self.check)
+        return self.timer
+
+    def on_read(self, now: float, nbytes: int) -> None:
+        self.last_read = now
+        self.window_bytes += nbytes
+
+    def on_resume(self, now: float) -> None:
+        """Leitura pausada pelo server (backpressure) não conta contra o cliente."""
+        self.last_read = now
+        self.window_start = now
+        self.window_bytes = 0
+
+    def next_deadline(self, now: float) -> float:
+        deadlines = [now + self.read_rate_window]
+        if self.idle_timeout is not None:
+            deadlines.append(
+                max(self.last_read, self.out.last_flush) + self.idle_timeout
+            )
+        if self.write_timeout is not None and self.out.drain_started is not None:
+            deadlines.append(self.out.drain_started + self.write_timeout)
+        if self.min_read_rate is not None:
+            deadlines.append(self.window_start + self.read_rate_window)
+        return min(deadlines)
+
+    def _expire(self, reason: CloseReason) -> None:
+        self._closed = True
+        self.close(reason)
+
+    def check(self, now: float) -> float | None:
+        if self._closed:
+            return None
+        out = self.out
+
+        drain_started = out.drain_started
+        if (
+            self.write_timeout is not None
+            and drain_started is not None
+            and now - drain_started >= self.write_timeout
+        ):
+            self._expire("write_timeout")
+            return None
+
+        if (
+            self.idle_timeout is not None
+            and drain_started is None
+            and now - max(self.last_read, out.last_flush) >= self.idle_timeout
+        ):
+            self._expire("idle")
+            return None
+
+        if self.min_read_rate is not None and now - self.window_start >= (
+            self.read_rate_window
+        ):
+            elapsed = now - self.window_start
+            if self.partial() and self.window_bytes < self.min_read_rate * elapsed:
+                self._expire("slow_read")
+                return None
+            self.window_start = now
+            self.window_bytes = 0
+
+        return self.next_deadline(now)
+
+
+def count_close(stats: ConnStats, reason: CloseReason) -> None:
+    field_name = f"closed_{reason}"
+    setattr(stats, field_name, getattr(stats, field_name) + 1)
@@ -0,0 +1,143 @@
+import asyncio
+from dataclasses import dataclass, field
+
+from serveAPI.servers.framing import frame_header
+
+DEFAULT_HIGH_WATER = 256 * 1024
+DEFAULT_LOW_WATER = 64 * 1024
+
+
+@dataclass
+class WriterStats:
+    responses: int = 0  # chunks enfileirados
+    flushes: int = 0  # chamadas a writelines (uma por tick com dados)
+    bytes: int = 0
+
+    @property
+    def per_flush(self) -> float:
+        return self.responses / self.flushes if self.flushes else 0.0
+
+
+@dataclass
+class ConnectionWriter:
+    """
+    Dono único do StreamWriter de uma conexão.
+
+    Os handlers só enfileiram (send, síncrono); uma coroutine por conexão
+    junta tudo que ficou pendente no tick em um único writelines e só ela
+    faz drain(). Enquanto o drain espera o socket, as respostas seguintes
+    se acumulam e saem juntas no próximo flush.
+
+    Watermarks: com mais de high_water bytes na fila, wait_writable()
+    bloqueia quem escreve até a fila baixar para low_water.
+    """
+
+    writer: asyncio.StreamWriter
+    conn_id: str = ""
+    framed: bool = False
+    high_water: int = DEFAULT_HIGH_WATER
+    low_water: int = DEFAULT_LOW_WATER
+    stats: WriterStats = field(default_factory=WriterStats)
+
+    _pending: list[bytes] = field(default_factory=list[bytes])
+    _queued: int = 0  # bytes em _pending
+    _flushing: int = 0  # bytes do writelines que está em drain
+    _wakeup: asyncio.Event = field(default_factory=asyncio.Event)
+    _writable: asyncio.Event = field(default_factory=asyncio.Event)
+    _task: "asyncio.Task[None] | None" = None
+    _closing: bool = False
+    _broken: bool = False
+    # loop.time() do último flush concluído / do drain em andamento
+    last_flush: float = 0.0
+    drain_started: float | None = None
+
+    def __post_init__(self):
+        if not 0 <= self.low_water <= self.high_water:
+            raise ValueError(
+                f"Expected 0 <= low_water <= high_water, got "
+                f"{self.low_water} and {self.high_water}"
+            )
+        self._writable.set()
+
+    @property
+    def pending_bytes(self) -> int:
+        return self._queued + self._flushing
+
+    @property
+    def broken(self) -> bool:
+        return self._broken
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    def send(self, chunks: list[bytes]) -> None:
+        if not chunks or self._broken or self._closing:
+            return
+        pending = self._pending
+        for chunk in chunks:
+            if self.framed:
+                pending.append(frame_header(len(chunk)))
+            pending.append(chunk)
+            self._queued += len(chunk)
+        self.stats.responses += len(chunks)
+        if self.pending_bytes > self.high_water:
+            self._writable.clear()
+        self._wakeup.set()
+
+    async def wait_writable(self) -> None:
+        if not self._writable.is_set():
+            await self._writable.wait()
+
+    async def _run(self) -> None:
+        writer = self.writer
+        loop = asyncio.get_running_loop()
+        self.last_flush = loop.time()
+        try:
+            while True:
+                if not self._pending:
+                    if self._closing:
+                        return
+                    await self._wakeup.wait()
+                    self._wakeup.clear()
+                    continue
+
+                batch, self._pending = self._pending, []
+                self._flushing, self._queued = self._queued, 0
+                self.stats.flushes += 1
+                writer.writelines(batch)
+                self.drain_started = loop.time()
+                await writer.drain()
+                self.drain_started = None
+                self.last_flush = loop.time()
+
+                self.stats.bytes += self._flushing
+                self._flushing = 0
+                if self.pending_bytes <= self.low_water:
+                    self._writable.set()
+        except OSError as e:
+            # reset/broken pipe, mas também qualquer outro erro de socket
+            # (ex.: TimeoutError)
+            print(f"[WARN] Failed to send response to {self.conn_id}: {e!r}")
+            self._broken = True
+        finally:
+            # ninguém fica preso esperando uma conexão que não escreve mais
+            self._pending.clear()
+            self._queued = self._flushing = 0
+            self._writable.set()
+
+    async def close(self) -> None:
+        """Escreve o que ainda está na fila, encerra a coroutine e fecha o writer."""
+        self._closing = True
+        self._wakeup.set()
+        try:
+            if self._task is not None:
+                await self._task
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            print(f"[WARN] Failed to flush connection {self.conn_id}: {e!r}")
+            self._broken = True
+        finally:
+            # o transport é fechado mesmo se o último drain falhou
+            self.writer.close()
@@ -0,0 +1,62 @@
+import asyncio
+from dataclasses import dataclass, field
+from typing import Generic, TypeVar
+
+W = TypeVar("W")
+
+
+@dataclass
+class Connection(Generic[W]):
+    """
+    Estado de uma conexão de stream.
+
+    Cada request recebido ganha um número de sequência. Com ordered=True as
+    respostas saem na ordem dos requests: uma resposta que fica pronta antes
+    da vez é retida até os requests anteriores terminarem (write ou release).
+    """
+
+    conn_id: str
+    writer: W  # StreamWriter (TCPServer) ou Transport (BufferedTCPServer)
+    ordered: bool = False
+    # lado de leitura da conexão (pause_reading no stop_accepting)
+    transport: asyncio.Transport | None = None
+
+    _next_seq: int = 0
+    _head: int = 0  # próximo seq a ser entregue
+    _held: dict[int, list[bytes]] = field(default_factory=dict[int, list[bytes]])
+    _done: set[int] = field(default_factory=set[int])
+
+    def next_seq(self) -> int:
+        seq = self._next_seq
+        self._next_seq += 1
+        return seq
+
+    @property
+    def in_flight(self) -> int:
+        return self._next_seq - self._head
+
+    def set_ordered(self, ordered: bool) -> list[bytes]:
+        """Troca o modo; ao sair do modo ordered devolve tudo que estava retido."""
+        self.ordered = ordered
+        if ordered:
+            return []
+        released = [chunk for seq in sorted(self._held) for chunk in self._held[seq]]
+        self._held.clear()
+        return released
+
+    def deliver(self, seq: int, data: bytes) -> list[bytes]:
+        """Retorna o que pode ser escrito agora para o request 'seq'."""
+        if not self.ordered or seq == self._head:
+            return [data]
+        self._held.setdefault(seq, []).append(data)
+        return []
+
+    def complete(self, seq: int) -> list[bytes]:
+        """Marca 'seq' como terminado e retorna respostas retidas que foram liberadas."""
+        self._done.add(seq)
+        released: list[bytes] = []
+        while self._head in self._done:
+            self._done.discard(self._head)
+            self._head += 1
+            released.extend(self._held.pop(self._head, ()))
+        return released
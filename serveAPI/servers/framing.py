@@ -0,0 +1,75 @@
+import struct
+from dataclasses import dataclass, field
+
+from serveAPI.exceptions import FrameTooLargeError
+
+# header: tamanho do payload em 4 bytes, big-endian
+FRAME_HEADER = struct.Struct("!I")
+
+DEFAULT_MAX_FRAME_SIZE = 1 << 20  # 1 MiB
+
+
+def frame_header(size: int) -> bytes:
+    return FRAME_HEADER.pack(size)
+
+
+def make_frame(payload: bytes) -> bytes:
+    """Helper para clientes: header + payload em um único bytes."""
+    return FRAME_HEADER.pack(len(payload)) + payload
+
+
+@dataclass
+class LengthPrefixFramer:
+    """
+    Separa um stream de bytes em frames no formato [len:uint32][payload].
+
+    Os frames completos de um mesmo buffer de leitura são devolvidos como
+    memoryview sobre esse buffer (sem cópia por frame). Apenas o resto de um
+    frame incompleto é guardado para o próximo feed.
+    """
+
+    max_frame_size: int = DEFAULT_MAX_FRAME_SIZE
+    _pending: bytearray = field(default_factory=bytearray)
+
+    def __post_init__(self):
+        if not 0 < self.max_frame_size <= 0xFFFFFFFF:
+            raise ValueError(
+                f"max_frame_size must be between 1 and {0xFFFFFFFF}, got {self.max_frame_size}"
+            )
+
+    @property
+    def buffered(self) -> int:
+        return len(self._pending)
+
+    def feed(self, data: bytes) -> list[memoryview]:
+        if self._pending:
+            # frame anterior incompleto: junta uma vez só com o novo chunk
+            self._pending += data
+            data = bytes(self._pending)
+            self._pending.clear()
+
+        view = memoryview(data)
+        total = len(view)
+        header_size = FRAME_HEADER.size
+        frames: list[memoryview] = []
+        offset = 0
+
+        while total - offset >= header_size:
+            (size,) = FRAME_HEADER.unpack_from(view, offset)
+            if size > self.max_frame_size:
+                raise FrameTooLargeError(
+                    f"Frame of {size} bytes exceeds max_frame_size={self.max_frame_size}"
+                )
+            start = offset + header_size
+            end = start + size
+            if end > total:
+                break
+            frames.append(view[start:end])
+            offset = end
+
+        if offset < total:
+            self._pending += view[offset:]
+        return frames
+
+    def reset(self) -> None:
+        self._pending.clear()
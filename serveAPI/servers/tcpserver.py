@@ -1,83 +1,313 @@
 import asyncio
 from dataclasses import dataclass, field
-from typing import Callable
+from typing import Callable, cast
 
-from serveAPI.interfaces import IAddr, ISockerServer, ITaskRunner
-from serveAPI.safedict import SafeDict
+from serveAPI.addr import ConnAddr
+from serveAPI.exceptions import FrameTooLargeError, LauncherFullError
+from serveAPI.interfaces import IAddr, IBoundedLauncher, ISockerServer, ITaskRunner
+from serveAPI.servers.conn_guard import CloseReason, ConnGuard, ConnStats, count_close
+from serveAPI.servers.conn_writer import (
+    DEFAULT_HIGH_WATER,
+    DEFAULT_LOW_WATER,
+    ConnectionWriter,
+)
+from serveAPI.servers.connection import Connection
+from serveAPI.servers.framing import DEFAULT_MAX_FRAME_SIZE, LengthPrefixFramer
+from serveAPI.servers.timing_wheel import TimingWheel
+
+StreamConnection = Connection[ConnectionWriter]
 
 
 @dataclass
 class TCPServer(ISockerServer):
+    """
+    Sem framing, cada read() é uma mensagem e o cliente recebe só as
+    respostas do handler (escritas pelo runner). O ack de texto
+    'Message received from addr:... for route:...' que era escrito depois
+    de cada mensagem não existe mais: o runner roda em um task próprio e
+    não devolve a rota, e o ack se misturaria às respostas.
+    """
+
     host: str
     port: int
     runner: ITaskRunner
     fire_and_forget: bool
     makeid: Callable[[], str]
-    writers: SafeDict[asyncio.StreamWriter] = field(
-        default_factory=SafeDict[asyncio.StreamWriter]
+    # tudo roda no mesmo loop: dict simples, sem lock por lookup
+    connections: dict[str, StreamConnection] = field(
+        default_factory=dict[str, StreamConnection]
     )
+    # framed=True: cada mensagem é [len:uint32 big-endian][payload], nos dois sentidos
+    framed: bool = False
+    max_frame_size: int = DEFAULT_MAX_FRAME_SIZE
+    read_size: int = 64 * 1024
+    # modo default das conexões novas (ver set_ordered para trocar por conexão)
+    ordered: bool = False
+    # launcher limitado: com ele cheio o server para de ler dos sockets
+    backpressure: IBoundedLauncher | None = None
+    # SO_REUSEPORT: vários processos worker na mesma porta (ver supervisor.py)
+    reuse_port: bool = False
+    # fila de saída por conexão (ver ConnectionWriter)
+    write_high_water: int = DEFAULT_HIGH_WATER
+    write_low_water: int = DEFAULT_LOW_WATER
+    # limites por conexão (None desliga); timeouts avaliados por um TimingWheel
+    # com precisão de timer_tick segundos (ver ConnGuard)
+    max_connections: int | None = None
+    idle_timeout: float | None = None
+    write_timeout: float | None = None
+    min_read_rate: float | None = None  # bytes/s com frame incompleto
+    read_rate_window: float = 10.0
+    timer_tick: float = 1.0
+    stats: ConnStats = field(default_factory=ConnStats)
 
+    _wheel: TimingWheel | None = None
     _server: asyncio.AbstractServer | None = None  # 👈 guarda o server
 
     async def _handle_client(
         self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
     ):
-        addr: str | None = writer.get_extra_info("peername")
+        peer = self._peer(writer)
 
-        if not addr and not self.fire_and_forget:
+        if peer is None:
             print("[ERROR] Could not get client address. Closing connection.")
             writer.close()
             await writer.wait_closed()
             return
 
-        addr_str = str(addr) if addr else self.makeid()
+        addr_str, ip, port = peer
+
+        stats = self.stats
+        if (
+            self.max_connections is not None
+            and len(self.connections) >= self.max_connections
+        ):
+            stats.rejected_max_connections += 1
+            writer.transport.abort()
+            return
+        stats.accepted += 1
+        stats.active += 1
+
+        out = ConnectionWriter(
+            writer=writer,
+            conn_id=addr_str,
+            framed=self.framed,
+            high_water=self.write_high_water,
+            low_water=self.write_low_water,
+        )
+        out.start()
+        conn = StreamConnection(
+            conn_id=addr_str,
+            writer=out,
+            ordered=self.ordered,
+            # o StreamWriter tipa como WriteTransport, mas é o mesmo transport
+            # bidirecional do StreamReader
+            transport=cast(asyncio.Transport, writer.transport),
+        )
+        self.connections[addr_str] = conn
+
+        framer = (
+            LengthPrefixFramer(max_frame_size=self.max_frame_size)
+            if self.framed
+            else None
+        )
 
-        await self.writers.set(addr_str, writer)
+        bp = self.backpressure
+        guard = self._make_guard(writer, out, framer)
+        loop = asyncio.get_running_loop()
 
         try:
             while True:
-                data = await reader.read(1024)
+                if bp is not None and bp.full:
+                    await bp.wait_ready()
+                    if guard is not None:
+                        guard.on_resume(loop.time())
+
+                data = await reader.read(self.read_size)
                 if not data:
                     break
+                if guard is not None:
+                    guard.on_read(loop.time(), len(data))
+
+                if framer is None:
+                    await self._launch(data, conn, ip, port, guard)
+                    continue
 
-                route = await self.runner(data, addr_str)
+                try:
+                    frames = framer.feed(data)
+                except FrameTooLargeError as e:
+                    print(f"[WARN] {e}. Closing connection {addr_str}")
+                    stats.closed_frame_too_large += 1
+                    break
 
-                if not self.fire_and_forget and addr:
-                    msg = f'Message received from addr:"{addr_str}" for route:"{route}"'
-                    writer.write(msg.encode())
-                await writer.drain()
+                for frame in frames:
+                    await self._launch(frame, conn, ip, port, guard)
+        except (ConnectionResetError, BrokenPipeError):
+            pass
         finally:
+            stats.active -= 1
+            if guard is not None and guard.timer is not None and self._wheel:
+                self._wheel.remove(guard.timer)
+            self.connections.pop(addr_str, None)
+            await out.close()
             writer.close()
-            await writer.wait_closed()
-            await self.writers.pop(addr_str)
+            try:
+                await writer.wait_closed()
+            except (ConnectionResetError, BrokenPipeError):
+                pass
 
-    async def write(self, data: bytes, addr: IAddr) -> None:
-        writer = await self.writers.get(addr)
-        if writer:
+    async def _launch(
+        self,
+        data: bytes | memoryview,
+        conn: StreamConnection,
+        ip: str,
+        port: int,
+        guard: ConnGuard | None,
+    ) -> None:
+        """
+        Entrega ao runner, esperando o launcher ter vaga logo antes (outra
+        conexão pode ter enchido o launcher durante o read ou no mesmo
+        wait_ready). O seq é reservado uma vez só, também nas novas tentativas.
+        """
+        bp = self.backpressure
+        addr = ConnAddr(ip, port, conn.conn_id, conn.next_seq())
+        while True:
+            if bp is not None and bp.full:
+                await bp.wait_ready()
+                if guard is not None:
+                    guard.on_resume(asyncio.get_running_loop().time())
             try:
-                writer.write(data)
-                await writer.drain()
-            except (ConnectionResetError, BrokenPipeError) as e:
-                print(f"[WARN] Failed to send response to {addr}: {e}")
-                await self.writers.pop(addr)
+                self.runner(data, addr)
+                return
+            except LauncherFullError as e:
+                if bp is None:
+                    # sem backpressure para esperar: descarta só esta mensagem
+                    print(f"[WARN] {e}. Dropping message from {conn.conn_id}")
+                    await self.release(addr)
+                    return
+                if not bp.full:
+                    # bp não é o launcher que recusou: cede o loop antes de tentar de novo
+                    await asyncio.sleep(0)
+
+    def _make_guard(
+        self,
+        writer: asyncio.StreamWriter,
+        out: ConnectionWriter,
+        framer: LengthPrefixFramer | None,
+    ) -> ConnGuard | None:
+        wheel = self._wheel
+        if wheel is None:
+            return None
+
+        def close(reason: CloseReason) -> None:
+            print(f"[INFO] Closing connection {out.conn_id}: {reason}")
+            count_close(self.stats, reason)
+            # abort: não espera o buffer de saída de um cliente parado
+            writer.transport.abort()
+
+        guard = ConnGuard(
+            out=out,
+            close=close,
+            partial=lambda: framer is not None and framer.buffered > 0,
+            now=asyncio.get_running_loop().time(),
+            idle_timeout=self.idle_timeout,
+            write_timeout=self.write_timeout,
+            min_read_rate=self.min_read_rate,
+            read_rate_window=self.read_rate_window,
+        )
+        wheel.add(guard.make_timer())
+        return guard
+
+    def _peer(self, writer: asyncio.StreamWriter) -> tuple[str, str, int] | None:
+        """(conn_id, ip, port) do cliente; None fecha a conexão."""
+        addr: tuple[str, int] | None = writer.get_extra_info("peername")
+        if addr:
+            return str(addr), addr[0], addr[1]
+        if self.fire_and_forget:
+            return self.makeid(), "", 0
+        return None
+
+    async def set_ordered(self, conn_id: str, ordered: bool) -> None:
+        """Entrega em ordem (ou fora de ordem) para uma conexão específica."""
+        conn = self.connections.get(conn_id)
+        if conn is None:
+            raise KeyError(f"No connection {conn_id}")
+        await self._send(conn, conn.set_ordered(ordered))
+
+    async def _send(self, conn: StreamConnection, chunks: list[bytes]) -> None:
+        # só enfileira; o ConnectionWriter da conexão faz o writelines/drain
+        conn.writer.send(chunks)
+        await conn.writer.wait_writable()
+
+    def _get_conn(self, addr: IAddr) -> tuple[StreamConnection | None, int]:
+        if isinstance(addr, ConnAddr):
+            return self.connections.get(addr.conn_id), addr.seq
+        return self.connections.get(str(addr)), -1
+
+    async def write(self, data: bytes, addr: IAddr) -> None:
+        conn, seq = self._get_conn(addr)
+        if conn:
+            if seq < 0:
+                await self._send(conn, [data])
+                return
+            chunks = conn.deliver(seq, data)
+            chunks.extend(conn.complete(seq))
+            await self._send(conn, chunks)
         else:
             if self.fire_and_forget:
                 print(f"[INFO] Fire-and-forget mode: no response sent to {addr}")
             else:
                 print(f"[WARN] No writer found for address: {addr}")
 
-    async def start(self):
-        self._server = await asyncio.start_server(
-            self._handle_client, self.host, self.port
+    async def write_stream(self, data: bytes, addr: IAddr) -> bool:
+        conn, seq = self._get_conn(addr)
+        if conn is None or conn.writer.broken:
+            return False
+        # deliver sem complete: no modo ordered o request continua sendo a vez
+        await self._send(conn, [data] if seq < 0 else conn.deliver(seq, data))
+        return True
+
+    async def release(self, addr: IAddr) -> None:
+        conn, seq = self._get_conn(addr)
+        if conn and seq >= 0:
+            await self._send(conn, conn.complete(seq))
+
+    async def _open_server(self) -> asyncio.AbstractServer:
+        return await asyncio.start_server(
+            self._handle_client, self.host, self.port, reuse_port=self.reuse_port
         )
+
+    async def start(self):
+        if any(
+            limit is not None
+            for limit in (self.idle_timeout, self.write_timeout, self.min_read_rate)
+        ):
+            self._wheel = TimingWheel(tick=self.timer_tick)
+            self._wheel.start()
+        self._server = await self._open_server()
         addr = self._server.sockets[0].getsockname()
-        print(f"TCPServer started on {addr}")
+        print(f"{type(self).__name__} started on {addr}")
 
         async with self._server:
             await self._server.serve_forever()
 
+    async def stop_accepting(self) -> None:
+        """Fecha o listener e para de ler; respostas ainda podem ser escritas."""
+        if self._server:
+            self._server.close()
+        for conn in self.connections.values():
+            if conn.transport is not None:
+                conn.transport.pause_reading()
+
     async def stop(self):
+        if self._wheel is not None:
+            self._wheel.stop()
         if self._server:
             self._server.close()
+        # escreve o que está na fila de cada conexão antes de fechar
+        conns = list(self.connections.values())
+        await asyncio.gather(*(conn.writer.close() for conn in conns))
+        for conn in conns:
+            conn.writer.writer.close()
+        if self._server:
             await self._server.wait_closed()
-            print("TCPServer stopped")
+            print(f"{type(self).__name__} stopped")
@@ -0,0 +1,110 @@
+import asyncio
+import math
+from dataclasses import dataclass, field
+from typing import Callable
+
+
+@dataclass(eq=False)
+class WheelTimer:
+    """
+    deadline é só um limite inferior: quando ele passa o wheel chama
+    callback(now), que devolve o próximo deadline (o timer continua) ou
+    None (o timer sai do wheel). Assim "adiar" um timer é só mudar um
+    timestamp no dono dele, sem mexer no wheel.
+    """
+
+    deadline: float
+    callback: Callable[[float], float | None]
+    _slot: int = -1
+
+
+@dataclass
+class TimingWheel:
+    """
+    Hashed timing wheel: um único call_later por tick para todos os timers,
+    em vez de um wait_for/call_later por operação.
+
+    Precisão de 'tick' segundos. Deadlines além de uma volta completa
+    (tick * slots) vão para o último slot e são reavaliados quando passam.
+    """
+
+    tick: float = 1.0
+    slots: int = 64
+
+    _wheel: list[set[WheelTimer]] = field(default_factory=list[set[WheelTimer]])
+    _pos: int = 0
+    _count: int = 0
+    _handle: asyncio.TimerHandle | None = None
+    _loop: asyncio.AbstractEventLoop | None = None
+
+    def __post_init__(self):
+        if self.tick <= 0 or self.slots < 2:
+            raise ValueError("TimingWheel needs tick > 0 and at least 2 slots")
+        self._wheel = [set() for _ in range(self.slots)]
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def running(self) -> bool:
+        return self._handle is not None
+
+    def _now(self) -> float:
+        loop = self._loop or asyncio.get_running_loop()
+        return loop.time()
+
+    def _place(self, timer: WheelTimer, now: float) -> None:
+        ticks = math.ceil((timer.deadline - now) / self.tick)
+        ticks = min(max(ticks, 1), self.slots - 1)
+        timer._slot = (self._pos + ticks) % self.slots
+        self._wheel[timer._slot].add(timer)
+
+    def add(self, timer: WheelTimer) -> WheelTimer:
+        self._place(timer, self._now())
+        self._count += 1
+        return timer
+
+    def remove(self, timer: WheelTimer) -> None:
+        if timer._slot >= 0:
+            self._wheel[timer._slot].discard(timer)
+            timer._slot = -1
+            self._count -= 1
+
+    def start(self) -> None:
+        if self._handle is None:
+            self._loop = asyncio.get_running_loop()
+            self._handle = self._loop.call_later(self.tick, self._on_tick)
+
+    def stop(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _on_tick(self) -> None:
+        assert self._loop is not None
+        self._handle = self._loop.call_later(self.tick, self._on_tick)
+        self.advance(self._loop.time())
+
+    def advance(self, now: float) -> None:
+        """Processa o próximo slot (chamado a cada tick)."""
+        self._pos = (self._pos + 1) % self.slots
+        slot = self._wheel[self._pos]
+        if not slot:
+            return
+        self._wheel[self._pos] = set()
+
+        for timer in slot:
+            if timer.deadline <= now:
+                try:
+                    deadline = timer.callback(now)
+                except Exception as e:
+                    print(f"[ERROR] Timer callback failed: {e}")
+                    deadline = None
+                if timer._slot < 0:
+                    continue  # removido pelo próprio callback
+                if deadline is None:
+                    timer._slot = -1
+                    self._count -= 1
+                    continue
+                timer.deadline = deadline
+            self._place(timer, now)
@@ -1,57 +1,280 @@
 import asyncio
-from dataclasses import dataclass
-from typing import Any, Callable, Coroutine
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Literal
 
-from serveAPI.interfaces import ISockerServer, ITaskRunner
+from serveAPI.addr import Addr
+from serveAPI.interfaces import IAddr, IBoundedLauncher, ISockerServer, ITaskRunner
+from serveAPI.servers.framing import frame_header
+
+OverflowPolicy = Literal["drop_newest", "drop_oldest"]
+
+CONFIRMATION = b"Message received"
+
+# payload UDP que cabe num frame Ethernet sem fragmentar (1500 - IP - UDP)
+DEFAULT_MAX_DATAGRAM_SIZE = 1472
+
+
+@dataclass
+class UDPStats:
+    received: int = 0
+    dropped: int = 0
+    # modo batch
+    batches: int = 0
+    batched: int = 0
+    last_batch: int = 0
+    max_batch: int = 0
+    flushes: int = 0
+    datagrams_sent: int = 0
+    frames_sent: int = 0
 
 
 @dataclass
 class UDPServer(asyncio.DatagramProtocol, ISockerServer):
+    """
+    batch_size=0: cada datagrama vira um task no launcher do runner.
+
+    batch_size>0: os datagramas vão para um ring buffer (ring_size) que é
+    esvaziado em lotes por 'consumers' coroutines fixas, processando inline
+    (runner.execute). Confirmações e respostas são acumuladas e enviadas uma
+    vez por iteração do loop: tudo que vai para o mesmo peer sai empacotado
+    em frames [len:uint32][payload] no menor número de datagramas de até
+    max_datagram_size; as confirmações de um peer viram um só frame
+    b"Message received:<n>".
+    """
+
     host: str
     port: int
     runner: ITaskRunner
     fire_and_forget: bool
     makeid: Callable[[], str]
-    spawn: Callable[[Coroutine[Any, Any, Any]], None]
+    # launcher limitado: com ele cheio os datagramas são descartados conforme 'overflow'
+    backpressure: IBoundedLauncher | None = None
+    overflow: OverflowPolicy = "drop_newest"
+    stats: UDPStats = field(default_factory=UDPStats)
+    # SO_REUSEPORT: vários processos worker na mesma porta (ver supervisor.py)
+    reuse_port: bool = False
+
+    batch_size: int = 0
+    consumers: int = 4
+    ring_size: int = 65536
+    max_datagram_size: int = DEFAULT_MAX_DATAGRAM_SIZE
 
     transport: asyncio.DatagramTransport | None = None
 
+    _ring: deque[tuple[bytes, Addr]] = field(default_factory=deque[tuple[bytes, Addr]])
+    _has_data: asyncio.Event = field(default_factory=asyncio.Event)
+    _consumer_tasks: list["asyncio.Task[None]"] = field(
+        default_factory=list["asyncio.Task[None]"]
+    )
+    # chave: endereço de destino do socket (ver _dest)
+    _outgoing: defaultdict[Any, list[bytes]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    _confirms: defaultdict[Any, int] = field(default_factory=lambda: defaultdict(int))
+    _flush_scheduled: bool = False
+    _accepting: bool = True
+    _busy: int = 0  # consumers processando um lote
+    _idle: asyncio.Event = field(default_factory=asyncio.Event)
+
     def connection_made(self, transport: asyncio.BaseTransport):
         # única vez, transport é o mesmo para todas as peers
         self.transport = transport  # type: ignore
-        print(f"UDP listening on {self.host}:{self.port}")
+        print(
+            f"{type(self).__name__} listening on {transport.get_extra_info('sockname')}"
+        )
+
+    def _peer(self, addr: Any) -> Addr:
+        """Endereço do socket (sendto/recvfrom) -> Addr entregue ao runner."""
+        return Addr(addr[0], addr[1])
+
+    def _dest(self, addr: IAddr) -> Any:
+        """Addr -> endereço do socket para o sendto da resposta."""
+        return (addr.ip, addr.port)
+
+    def datagram_received(self, data: bytes, addr: Any):
+        self.stats.received += 1
+        if not self._accepting:
+            self.stats.dropped += 1
+            return
+
+        if self.batch_size > 0:
+            self._enqueue(data, addr)
+            return
+
+        bp = self.backpressure
+        if bp is not None and bp.full:
+            # drop_oldest: abre espaço tirando o mais antigo da fila do launcher
+            if self.overflow != "drop_oldest" or not bp.drop_oldest():
+                self.stats.dropped += 1
+                return
+            self.stats.dropped += 1
+
+        # o runner dispara o processamento em background pelo launcher
+        self.runner(data, self._peer(addr))
+
+        if addr and not self.fire_and_forget and self.transport is not None:
+            self.transport.sendto(CONFIRMATION, addr)
+
+    # ---------- modo batch: entrada ----------
 
-    def datagram_received(self, data: bytes, addr: tuple[str, int]):
-        # aqui você dispara o processamento em background
-        # usando seu spawn (ex: asyncio.create_task ou aiojobs.spawn)
-        self.spawn(self._handle_datagram(data, addr))
+    def _enqueue(self, data: bytes, addr: Any) -> None:
+        ring = self._ring
+        if len(ring) >= self.ring_size:
+            self.stats.dropped += 1
+            if self.overflow != "drop_oldest":
+                return
+            ring.popleft()
 
-    async def _handle_datagram(self, data: bytes, addr: tuple[str, int]):
-        route, msg_id = await self.runner.execute(data, addr)
+        ring.append((data, self._peer(addr)))
+        self._has_data.set()
 
-        if not self.fire_and_forget and isinstance(
-            self.transport, asyncio.DatagramTransport
-        ):
-            confirm = f'Message id="{msg_id}" received for route="{route}"'.encode()
-            self.transport.sendto(confirm, addr)
+        if addr and not self.fire_and_forget:
+            self._confirms[addr] += 1
+            self._schedule_flush()
+
+    async def _consume(self) -> None:
+        ring = self._ring
+        stats = self.stats
+        execute = self.runner.execute
+        while True:
+            if not ring:
+                self._has_data.clear()
+                await self._has_data.wait()
+                continue
+
+            size = min(len(ring), self.batch_size)
+            batch = [ring.popleft() for _ in range(size)]
+            self._busy += 1
+            stats.batches += 1
+            stats.batched += size
+            stats.last_batch = size
+            if size > stats.max_batch:
+                stats.max_batch = size
+
+            try:
+                for data, addr in batch:
+                    try:
+                        await execute(data, addr)
+                    except Exception as e:
+                        # um datagrama com erro não pode matar o consumer
+                        print(f"[WARN] UDP datagram from {addr} failed: {e!r}")
+            finally:
+                self._busy -= 1
+                if not ring and not self._busy:
+                    self._idle.set()
+
+    # ---------- modo batch: saída ----------
+
+    def _schedule_flush(self) -> None:
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        transport = self.transport
+        outgoing, self._outgoing = self._outgoing, defaultdict(list)
+        confirms, self._confirms = self._confirms, defaultdict(int)
+        if transport is None:
+            return
+
+        self.stats.flushes += 1
+        for peer, count in confirms.items():
+            outgoing[peer].insert(0, CONFIRMATION + b":%d" % count)
+
+        max_size = self.max_datagram_size
+        for peer, payloads in outgoing.items():
+            datagram: list[bytes] = []
+            size = 0
+            for payload in payloads:
+                framed = 4 + len(payload)
+                if datagram and size + framed > max_size:
+                    self._sendto(transport, datagram, peer)
+                    datagram, size = [], 0
+                datagram.append(frame_header(len(payload)))
+                datagram.append(payload)
+                size += framed
+            if datagram:
+                self._sendto(transport, datagram, peer)
+            self.stats.frames_sent += len(payloads)
+
+    def _sendto(
+        self,
+        transport: asyncio.DatagramTransport,
+        parts: list[bytes],
+        peer: Any,
+    ) -> None:
+        try:
+            transport.sendto(b"".join(parts), peer)
+            self.stats.datagrams_sent += 1
+        except (ConnectionResetError, BrokenPipeError) as e:
+            print(f"[WARN] UDP sendto to {peer} failed: {e}")
 
     def error_received(self, exc: Exception):
         print(f"[UDP] error_received: {exc}")
 
-    async def write(self, data: bytes, addr: str | tuple[str, int]) -> None:
+    async def write(self, data: bytes, addr: IAddr) -> None:
+        if self.batch_size > 0:
+            self._outgoing[self._dest(addr)].append(data)
+            self._schedule_flush()
+            return
+
         # aqui contexto já garante o endereço
         if self.transport:
             try:
-                self.transport.sendto(data, addr)
+                self.transport.sendto(data, self._dest(addr))
             except (ConnectionResetError, BrokenPipeError) as e:
                 print(f"[WARN] UDP sendto to {addr} failed: {e}")
         else:
             print("[ERROR] transport not initialized")
 
-    async def start(self):
-        loop = asyncio.get_event_loop()
+    async def write_stream(self, data: bytes, addr: IAddr) -> bool:
+        # cada item do stream vai como uma resposta comum
+        await self.write(data, addr)
+        return self.transport is not None
+
+    async def release(self, addr: IAddr) -> None:
+        # datagramas não têm ordem de entrega a manter
+        return None
+
+    async def _open_endpoint(self) -> None:
+        loop = asyncio.get_running_loop()
         # precisa passar um factory que retorna a instância de protocolo
         await loop.create_datagram_endpoint(
             lambda: self,
             local_addr=(self.host, self.port),
+            reuse_port=self.reuse_port,
         )
+
+    async def start(self):
+        await self._open_endpoint()
+        if self.batch_size > 0:
+            self._consumer_tasks = [
+                asyncio.create_task(self._consume()) for _ in range(self.consumers)
+            ]
+
+    async def stop_accepting(self) -> None:
+        """
+        Passa a descartar datagramas novos. No modo batch espera os consumers
+        esvaziarem o ring (o que já foi recebido é processado).
+        """
+        self._accepting = False
+        if self._consumer_tasks and (self._ring or self._busy):
+            self._idle.clear()
+            await self._idle.wait()
+
+    async def stop(self):
+        self._accepting = False
+        for task in self._consumer_tasks:
+            task.cancel()
+        await asyncio.gather(*self._consumer_tasks, return_exceptions=True)
+        self._consumer_tasks.clear()
+        self.stats.dropped += len(self._ring)
+        self._ring.clear()
+        if self._outgoing or self._confirms:
+            self._flush()
+        if self.transport:
+            self.transport.close()
+            self.transport = None
+            print(f"{type(self).__name__} stopped")
@@ -0,0 +1,147 @@
+import asyncio
+import errno
+import os
+import socket
+import stat
+from dataclasses import dataclass, field
+from typing import Any
+
+from serveAPI.addr import Addr
+from serveAPI.interfaces import IAddr
+from serveAPI.servers.tcpserver import TCPServer
+from serveAPI.servers.udpserver import UDPServer
+
+
+def _unlink_stale_socket(path: str, kind: socket.SocketKind) -> None:
+    """
+    Remove um socket file deixado por um processo anterior (bind falharia).
+
+    Antes de remover, tenta conectar: só um socket que recusa a conexão é
+    considerado abandonado. Se alguém responde no path, levanta OSError
+    (EADDRINUSE) em vez de tomar o endereço de um server vivo.
+    """
+    try:
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            return
+    except FileNotFoundError:
+        return
+
+    with socket.socket(socket.AF_UNIX, kind) as probe:
+        probe.setblocking(False)
+        try:
+            probe.connect(path)
+        except ConnectionRefusedError:
+            os.unlink(path)
+            return
+        except BlockingIOError:
+            pass  # backlog cheio: tem alguém escutando
+    raise OSError(errno.EADDRINUSE, "unix socket already in use", path)
+
+
+def _socket_id(path: str) -> tuple[int, int]:
+    st = os.stat(path)
+    return st.st_dev, st.st_ino
+
+
+def _unlink_own_socket(path: str, ident: tuple[int, int] | None) -> None:
+    """Remove o socket file só se ainda for o que esta instância criou."""
+    if ident is None:
+        return
+    try:
+        if _socket_id(path) == ident:
+            os.unlink(path)
+    except FileNotFoundError:
+        pass
+
+
+def _check_path(path: str) -> None:
+    if not path:
+        raise ValueError("path of the unix socket is required")
+
+
+@dataclass
+class UnixStreamServer(TCPServer):
+    """
+    TCPServer sobre AF_UNIX (SOCK_STREAM) para clientes no mesmo host.
+
+    Mesmo framing, ordered e backpressure do TCPServer; só muda o socket.
+    Clientes unix não têm endereço, então cada conexão recebe um id de
+    makeid() e o Addr entregue ao runner tem ip=path e port=0.
+    """
+
+    host: str = field(default="", init=False)
+    port: int = field(default=0, init=False)
+    path: str = ""
+    # permissão do socket file (quem pode conectar); None mantém o umask
+    mode: int | None = None
+
+    _path_id: tuple[int, int] | None = field(default=None, init=False)
+
+    def __post_init__(self):
+        _check_path(self.path)
+
+    def _peer(self, writer: asyncio.StreamWriter) -> tuple[str, str, int] | None:
+        return self.makeid(), self.path, 0
+
+    async def _open_server(self) -> asyncio.AbstractServer:
+        _unlink_stale_socket(self.path, socket.SOCK_STREAM)
+        server = await asyncio.start_unix_server(self._handle_client, self.path)
+        self._path_id = _socket_id(self.path)
+        if self.mode is not None:
+            os.chmod(self.path, self.mode)
+        return server
+
+    async def stop(self):
+        await super().stop()
+        _unlink_own_socket(self.path, self._path_id)
+        self._path_id = None
+
+
+@dataclass
+class UnixDatagramServer(UDPServer):
+    """
+    UDPServer sobre AF_UNIX (SOCK_DGRAM), inclusive o modo batch.
+
+    O endereço de um peer é o path em que o socket do cliente fez bind;
+    cliente sem bind não recebe confirmação nem resposta. O Addr entregue
+    ao runner tem ip=path do cliente e port=0.
+    """
+
+    host: str = field(default="", init=False)
+    port: int = field(default=0, init=False)
+    path: str = ""
+    mode: int | None = None
+    # sem MTU: o limite é o buffer do socket (net.core.wmem_default)
+    max_datagram_size: int = 64 * 1024
+
+    _path_id: tuple[int, int] | None = field(default=None, init=False)
+
+    def __post_init__(self):
+        _check_path(self.path)
+
+    def _peer(self, addr: Any) -> Addr:
+        return Addr(addr or "", 0)
+
+    def _dest(self, addr: IAddr) -> Any:
+        return addr.ip
+
+    async def write(self, data: bytes, addr: IAddr) -> None:
+        if not addr.ip:
+            print("[INFO] Unix datagram client without bound path: no response sent")
+            return
+        await super().write(data, addr)
+
+    async def _open_endpoint(self) -> None:
+        _unlink_stale_socket(self.path, socket.SOCK_DGRAM)
+        loop = asyncio.get_running_loop()
+        await loop.create_datagram_endpoint(
+            lambda: self, local_addr=self.path, family=socket.AF_UNIX
+        )
+        self._path_id = _socket_id(self.path)
+        if self.mode is not None:
+            os.chmod(self.path, self.mode)
+
+    async def stop(self):
+        await super().stop()
+        _unlink_own_socket(self.path, self._path_id)
+        self._path_id = None
@@ -0,0 +1,206 @@
+import asyncio
+import multiprocessing
+import multiprocessing.connection
+import os
+import signal
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from multiprocessing.process import BaseProcess
+from typing import Any, Callable, Coroutine, Protocol
+
+
+class IRunnableApp(Protocol):
+    def run(self) -> Coroutine[Any, Any, None]: ...
+
+
+AppFactory = Callable[[], IRunnableApp]
+
+
+def _worker_main(app_factory: AppFactory) -> None:
+    """Processo worker: monta o app do zero (grafo IoC incluso) e roda até SIGTERM/SIGINT."""
+
+    # handlers herdados do supervisor no fork não valem aqui
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.default_int_handler)
+
+    async def serve() -> None:
+        app = app_factory()
+        task = asyncio.current_task()
+        assert task is not None
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(sig, task.cancel)
+        await app.run()
+
+    try:
+        asyncio.run(serve())
+    except (asyncio.CancelledError, KeyboardInterrupt):
+        pass
+
+
+@dataclass
+class WorkerStats:
+    started: int = 0
+    restarted: int = 0
+    crashed: int = 0
+    given_up: int = 0  # slots abandonados por excesso de restarts
+
+
+@dataclass
+class Supervisor:
+    """
+    Sobe N processos worker, cada um com seu event loop e seu próprio app.
+
+    Os servers devem ser criados com reuse_port=True para que todos os workers
+    façam bind na mesma porta (SO_REUSEPORT); o kernel distribui as conexões.
+    Worker que morre com erro é reiniciado depois de um backoff exponencial
+    (restart_backoff, dobrando até restart_backoff_max) sem bloquear o loop de
+    monitoramento; um slot que passa de max_restarts dentro de restart_window
+    segundos é abandonado. SIGTERM/SIGINT no supervisor repassa SIGTERM aos
+    workers e espera até shutdown_timeout antes de matar quem sobrou.
+    """
+
+    app_factory: AppFactory
+    workers: int = field(default_factory=lambda: os.cpu_count() or 1)
+    restart_on_crash: bool = True
+    restart_backoff: float = 0.5
+    restart_backoff_max: float = 30.0
+    max_restarts: int = 5
+    restart_window: float = 60.0
+    shutdown_timeout: float = 10.0
+    stats: WorkerStats = field(default_factory=WorkerStats)
+
+    _procs: dict[int, BaseProcess] = field(default_factory=dict[int, BaseProcess])
+    _stopping: threading.Event = field(default_factory=threading.Event)
+    # slot -> instante (monotonic) do próximo restart
+    _restart_at: dict[int, float] = field(default_factory=dict[int, float])
+    # slot -> instantes dos restarts dentro da janela
+    _restarts: dict[int, deque[float]] = field(default_factory=dict[int, deque[float]])
+
+    def __post_init__(self):
+        if self.workers < 1:
+            raise ValueError("workers must be >= 1")
+
+    @property
+    def pids(self) -> list[int | None]:
+        return [proc.pid for proc in self._procs.values()]
+
+    def _spawn(self, slot: int) -> None:
+        ctx = multiprocessing.get_context("fork")
+        proc = ctx.Process(
+            target=_worker_main,
+            args=(self.app_factory,),
+            name=f"serveAPI-worker-{slot}",
+            daemon=False,
+        )
+        proc.start()
+        self._procs[slot] = proc
+        self.stats.started += 1
+
+    def stop(self) -> None:
+        self._stopping.set()
+
+    def _install_signals(self) -> dict[int, Any]:
+        if threading.current_thread() is not threading.main_thread():
+            return {}
+        previous: dict[int, Any] = {}
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            previous[sig] = signal.signal(sig, lambda *_: self.stop())
+        return previous
+
+    def run(self) -> None:
+        """Bloqueia até stop() (ou SIGTERM/SIGINT) e todos os workers terminarem."""
+        previous = self._install_signals()
+        for slot in range(self.workers):
+            self._spawn(slot)
+        print(f"[Supervisor] started {self.workers} workers: {self.pids}")
+
+        try:
+            while not self._stopping.is_set() and (self._procs or self._restart_at):
+                timeout = 0.2
+                if self._restart_at:
+                    next_at = min(self._restart_at.values())
+                    timeout = min(timeout, max(0.0, next_at - time.monotonic()))
+                sentinels = {proc.sentinel: slot for slot, proc in self._procs.items()}
+                if sentinels:
+                    ready = multiprocessing.connection.wait(
+                        list(sentinels), timeout=timeout
+                    )
+                    for sentinel in ready:
+                        self._on_exit(sentinels[sentinel])  # type: ignore
+                else:
+                    self._stopping.wait(timeout)
+                self._restart_due()
+        finally:
+            self._shutdown()
+            for sig, handler in previous.items():
+                signal.signal(sig, handler)
+
+    def _on_exit(self, slot: int) -> None:
+        proc = self._procs.pop(slot)
+        proc.join()
+        if self._stopping.is_set():
+            return
+        if proc.exitcode == 0:
+            print(f"[Supervisor] worker {proc.pid} exited")
+            return
+
+        self.stats.crashed += 1
+        print(f"[WARN] worker {proc.pid} died with exitcode {proc.exitcode}")
+        if not self.restart_on_crash:
+            return
+
+        now = time.monotonic()
+        window = self._restarts.setdefault(slot, deque[float]())
+        while window and now - window[0] > self.restart_window:
+            window.popleft()
+        if len(window) >= self.max_restarts:
+            self.stats.given_up += 1
+            print(
+                f"[ERROR] worker slot {slot} crashed {len(window) + 1} times in "
+                f"{self.restart_window:.0f}s, giving up on it"
+            )
+            return
+        self._restart_at[slot] = now + self._restart_delay(len(window))
+
+    def _restart_delay(self, restarts: int) -> float:
+        """Backoff para o próximo restart, dado quantos já houve na janela."""
+        return min(self.restart_backoff * 2**restarts, self.restart_backoff_max)
+
+    def _restart_due(self) -> None:
+        now = time.monotonic()
+        for slot, at in list(self._restart_at.items()):
+            if at > now or self._stopping.is_set():
+                continue
+            del self._restart_at[slot]
+            self._spawn(slot)
+            self._restarts[slot].append(now)
+            self.stats.restarted += 1
+
+    def _shutdown(self) -> None:
+        procs = list(self._procs.values())
+        for proc in procs:
+            if proc.is_alive() and proc.pid is not None:
+                os.kill(proc.pid, signal.SIGTERM)
+
+        deadline = time.monotonic() + self.shutdown_timeout
+        for proc in procs:
+            proc.join(max(0.0, deadline - time.monotonic()))
+            if proc.is_alive():
+                print(f"[WARN] worker {proc.pid} did not stop in time, killing")
+                proc.kill()
+                proc.join()
+        self._procs.clear()
+        self._restart_at.clear()
+        print("[Supervisor] all workers stopped")
+
+
+def run_workers(app_factory: AppFactory, workers: int | None = None, **kwargs: Any):
+    """Atalho: Supervisor(app_factory, workers).run()"""
+    supervisor = Supervisor(
+        app_factory=app_factory, workers=workers or os.cpu_count() or 1, **kwargs
+    )
+    supervisor.run()
+    return supervisor
@@ -1,22 +1,30 @@
 import inspect
-from dataclasses import dataclass
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from functools import partial
 from typing import (
-    Annotated,
     Any,
+    AsyncGenerator,
     Awaitable,
     Callable,
     Generic,
+    Iterable,
     Iterator,
     Mapping,
+    MutableMapping,
     Protocol,
-    Sequence,
     TypeVar,
-    get_args,
-    get_origin,
+    cast,
     get_type_hints,
 )
 
-from serveAPI.di import DependencyInjector
+from serveAPI.di import (
+    CallPlan,
+    DependencyInjector,
+    RequestScope,
+    compile_call_plan,
+)
+from serveAPI.encoder import make_response_header, make_stream_end
 from serveAPI.exceptions import (
     DependencyResolveError,
     EncoderDecodeError,
@@ -33,10 +41,12 @@ from serveAPI.exceptions import (
 from serveAPI.interfaces import (
     Depends,
     IAddr,
+    ICallPlan,
     IEncoder,
     IExceptionRegistry,
     IMiddleware,
     IMiddlewareFunc,
+    IOffloader,
     IRouterAPI,
     ISockerServer,
     ITaskRunner,
@@ -44,40 +54,64 @@ from serveAPI.interfaces import (
     Params,
     TypeCast,
 )
+from serveAPI.offload import ThreadOffloader
 
 T = TypeVar("T")
 
 
-def get_one_arg_name(handler: Callable[..., Any], arg_type: type) -> str | None:
-    sig = inspect.signature(handler)
-
-    for name, param in sig.parameters.items():
-        ann = param.annotation
-        if get_origin(ann) is Annotated:
-            inner, *_ = get_args(ann)  # extras from Annotated
-            if inner is arg_type:
-                return name
-        elif ann is arg_type:
-            return name
-    return None
-
-
-def get_all_arg_name(
-    handler: Callable[..., Any], arg_type: type
-) -> Sequence[str] | None:
-    sig = inspect.signature(handler)
-
-    args_names: list[str] = []
-
-    for name, param in sig.parameters.items():
-        ann = param.annotation
-        if get_origin(ann) is Annotated:
-            inner, *_ = get_args(ann)  # extras from Annotated
-            if inner is arg_type:
-                args_names.append(name)
-        elif ann is arg_type:
-            args_names.append(name)
-    return None
+@dataclass
+class ResponseStream:
+    """Resposta de um handler async generator: um frame por item + fim de stream."""
+
+    frames: AsyncGenerator[bytes, None]
+    end: bytes
+
+
+async def send_result(
+    server: ISockerServer, result: bytes | ResponseStream | None, addr: IAddr
+) -> None:
+    if result is None:
+        # sem resposta: avisa o server (libera a vez no modo ordered)
+        await server.release(addr)
+    elif isinstance(result, bytes):
+        await server.write(result, addr)
+    else:
+        # cada item sai assim que fica pronto; write_stream espera o
+        # transport quando o buffer de saída está cheio
+        async with aclosing(result.frames) as frames:
+            async for frame in frames:
+                if not await server.write_stream(frame, addr):
+                    await server.release(addr)
+                    return
+        await server.write(result.end, addr)
+
+
+async def call_handler(
+    handler: Callable[..., Any],
+    plan: ICallPlan,
+    offloader: IOffloader | None,
+    data: Any,
+    kwargs: Mapping[str, Any],
+) -> Any:
+    """Handlers síncronos rodam inline, ou no offloader quando a rota pede."""
+    if plan.is_async:
+        return await handler(data, **kwargs)
+    if offloader is not None:
+        response = await offloader.run(handler, data, **kwargs)
+    else:
+        response = handler(data, **kwargs)
+    if inspect.isawaitable(response):
+        # callable síncrono que devolve awaitable (ex.: wrapper de coroutine)
+        response = await response
+    return response
+
+
+async def close_scope(scope: RequestScope) -> None:
+    """Teardown das dependências generator, depois do response escrito."""
+    try:
+        await scope.aclose()
+    except Exception as e:
+        print(f"[WARN] Dependency teardown failed: {e!r}")
 
 
 @dataclass
@@ -90,6 +124,8 @@ class TaskRunner(ITaskRunner, Generic[T]):
     launcher: LaunchTask
     exception_handlers: IExceptionRegistry
     fire_forget: bool = False
+    # handlers/middlewares síncronos das rotas com offload=True
+    offloader: IOffloader = field(default_factory=ThreadOffloader)
     _server: ISockerServer | None = None
 
     def __post_init__(self):
@@ -99,76 +135,137 @@ class TaskRunner(ITaskRunner, Generic[T]):
     def inject_server(self, server: ISockerServer) -> None:
         self._server = server
 
-    def _resolve_exception(self, err: Exception) -> bytes:
+    def _resolve_exception(self, err: Exception, req_id: str | None = None) -> bytes:
         try:
             result = self.exception_handlers.resolve(err)
         except UnhandledError as unhandled:
             result = self.exception_handlers.resolve(unhandled)
-        encoded = result.encode()
+        encoded = result if isinstance(result, bytes) else result.encode()
+        if req_id is not None:
+            return make_response_header(req_id) + encoded
         return encoded
 
-    def __call__(self, input: bytes, addr: IAddr) -> None:
+    def __call__(self, input: bytes | memoryview, addr: IAddr) -> None:
         self.launcher(self._run_task(input, addr))
 
-    async def _run_task(self, input: bytes, addr: IAddr) -> None:
+    async def execute(self, input: bytes | memoryview, addr: IAddr) -> None:
+        """Processa no task atual, sem passar pelo launcher."""
+        await self._run_task(input, addr)
+
+    async def _run_task(self, input: bytes | memoryview, addr: IAddr) -> None:
+        scope = RequestScope()
+        try:
+            result = await self._process(input, addr, scope)
+
+            if self._server is None:
+                raise Exception("Server Not defined on dispatcher")
+            await send_result(self._server, result, addr)
+        finally:
+            await close_scope(scope)
+
+    async def _process(
+        self, input: bytes | memoryview, addr: IAddr, scope: RequestScope
+    ) -> bytes | ResponseStream | None:
         Exc: Callable[[str], ServerAPIException] | None = EncoderDecodeError
+        req_id: str | None = None
         try:
-            route, data = self.encoder.decode(input)
+            route, req_id, data = self.encoder.decode_request(input)
 
             Exc = RouterError
             route_pack, params = self.router.get_handler_pack(route)
 
+            offloader = self.offloader if route_pack.offload else None
+
             Exc = RequestMiddlewareError
-            data = await self.middleware.proc(data, "request")
+            data = await self.middleware.proc(data, "request", offloader)
 
             Exc = TypeCastToModelError
             obj_data = self.cast.to_model(data, route_pack.input_type)
 
             Exc = ParamsResolveError
-            kwargs: dict[str, Any] = {}
             handler = route_pack.handler
-            params_arg = get_one_arg_name(handler, Params)
-            if params_arg:
-                kwargs[params_arg] = params
-            addr_arg = get_one_arg_name(handler, IAddr)
-            if addr_arg:
-                kwargs[addr_arg] = addr
+            plan = route_pack.plan
+            kwargs: dict[str, Any] = plan.bind(params, addr)
 
             Exc = DependencyResolveError
-            deps = await self.injector.resolve(handler)
+            deps = await self.injector.resolve(handler, {RequestScope: scope})
             kwargs = {**kwargs, **deps}
 
             # Client Function Run
             Exc = None
-            response: Any | None = await handler(obj_data, **kwargs)
+            if plan.is_stream:
+                return await self._stream(handler(obj_data, **kwargs), req_id)
+            response: Any | None = await call_handler(
+                handler, plan, offloader, obj_data, kwargs
+            )
 
             if response is None:
-                return
+                return None
 
             Exc = ResponseMiddlewareError
-            response = await self.middleware.proc(response, "response")
+            response = await self.middleware.proc(response, "response", offloader)
 
             if self.fire_forget:
-                return
+                return None
 
             Exc = TypeCastFromModelError
             cast_response = self.cast.from_model(response)
 
             Exc = EncoderEncodeError
-            encoded = self.encoder.encode(cast_response)
+            encoded = self.encoder.encode_response(cast_response, req_id)
 
         except Exception as e:
             err = Exc("Error on TaskRunner") if Exc else e
             if Exc:
                 err.__cause__ = e
-            encoded = self._resolve_exception(err)
+            encoded = self._resolve_exception(err, req_id)
 
-        if self._server is None:
-            raise Exception("Server Not defined on dispatcher")
-        await self._server.write(encoded, addr)
+        return encoded
+
+    async def _stream(
+        self, items: AsyncGenerator[Any, None], req_id: str | None
+    ) -> ResponseStream | None:
+        frames = self._encode_stream(items, req_id)
+        if self.fire_forget:
+            # roda o generator até o fim (efeitos colaterais), sem resposta
+            async with aclosing(frames):
+                async for _ in frames:
+                    pass
+            return None
+        return ResponseStream(frames, make_stream_end(req_id))
+
+    async def _encode_stream(
+        self, items: AsyncGenerator[Any, None], req_id: str | None
+    ) -> AsyncGenerator[bytes, None]:
+        """Middleware de response, cast e encode por item; erro vira o último frame."""
+        Exc: Callable[[str], ServerAPIException] | None = None
+        async with aclosing(items):
+            try:
+                async for item in items:
+                    if item is None:
+                        continue
+
+                    Exc = ResponseMiddlewareError
+                    item = await self.middleware.proc(item, "response")
+
+                    Exc = TypeCastFromModelError
+                    cast_item = self.cast.from_model(item)
+
+                    Exc = EncoderEncodeError
+                    encoded = self.encoder.encode_response(cast_item, req_id)
+
+                    Exc = None
+                    yield encoded
+            except Exception as e:
+                err = Exc("Error on TaskRunner") if Exc else e
+                if Exc:
+                    err.__cause__ = e
+                yield self._resolve_exception(err, req_id)
 
 
 class IMiddleware2(Protocol[T]):
+    # opcional: um atributo 'version' que muda a cada alteração evita
+    # comparar o stack inteiro por request (ver TaskRunner2.middleware_chain)
 
     def __iter__(self) -> Iterator[IMiddlewareFunc[T]]: ...
     def add(self, middleware: IMiddlewareFunc[T]) -> IMiddlewareFunc[T]: ...
@@ -176,15 +273,26 @@ class IMiddleware2(Protocol[T]):
     async def run(self, data: T, final_handler: Callable[[T], Awaitable[T]]) -> T: ...
 
 
-def get_params_addr(handler: Callable[..., Any], params: Params, addr: IAddr):
-    kwargs: dict[str, Any] = {}
-    params_arg = get_one_arg_name(handler, Params)
-    if params_arg:
-        kwargs[params_arg] = params
-    addr_arg = get_one_arg_name(handler, IAddr)
-    if addr_arg:
-        kwargs[addr_arg] = addr
-    return kwargs
+@dataclass(frozen=True)
+class MiddlewareStep:
+    """Um middleware com a assinatura já analisada (sem reflexão por request)."""
+
+    func: IMiddlewareFunc[Any]
+    plan: CallPlan
+    has_deps: bool
+
+    @classmethod
+    def compile(cls, func: IMiddlewareFunc[Any]) -> "MiddlewareStep":
+        plan = compile_call_plan(func)
+        has_deps = any(arg.depends is not None for arg in plan.dependencies.args)
+        return cls(func=func, plan=plan, has_deps=has_deps)
+
+
+def compile_middlewares(
+    middleware: Iterable[IMiddlewareFunc[Any]],
+) -> tuple[MiddlewareStep, ...]:
+    """Do mais externo para o mais interno (o IMiddleware2 itera ao contrário)."""
+    return tuple(MiddlewareStep.compile(func) for func in reversed(list(middleware)))
 
 
 @dataclass
@@ -197,7 +305,11 @@ class TaskRunner2(ITaskRunner, Generic[T]):
     launcher: LaunchTask
     exception_handlers: IExceptionRegistry
     fire_forget: bool = False
+    # handlers/middlewares síncronos das rotas com offload=True
+    offloader: IOffloader = field(default_factory=ThreadOffloader)
     _server: ISockerServer | None = None
+    # (versão do IMiddleware2, cadeia compilada)
+    _chain: tuple[Any, tuple[MiddlewareStep, ...]] | None = None
 
     def __post_init__(self):
         if UnhandledError not in self.exception_handlers:
@@ -206,28 +318,65 @@ class TaskRunner2(ITaskRunner, Generic[T]):
     def inject_server(self, server: ISockerServer) -> None:
         self._server = server
 
-    def _resolve_exception(self, err: Exception) -> bytes:
+    def _resolve_exception(self, err: Exception, req_id: str | None = None) -> bytes:
         try:
             result = self.exception_handlers.resolve(err)
         except UnhandledError as unhandled:
             result = self.exception_handlers.resolve(unhandled)
-        encoded = result.encode()
+        encoded = result if isinstance(result, bytes) else result.encode()
+        if req_id is not None:
+            return make_response_header(req_id) + encoded
         return encoded
 
-    def __call__(self, input: bytes, addr: IAddr) -> None:
+    def __call__(self, input: bytes | memoryview, addr: IAddr) -> None:
         self.launcher(self._run_task(input, addr))
 
-    async def _run_task(self, input: bytes, addr: IAddr) -> None:
+    def middleware_chain(self) -> tuple[MiddlewareStep, ...]:
+        """Cadeia compilada; recompila só quando o stack de middlewares muda."""
+        # sem 'version' a chave é uma cópia do stack (mudanças nunca passam)
+        key = getattr(self.middleware, "version", None)
+        if key is None:
+            key = tuple(self.middleware)
+        if self._chain is None or self._chain[0] != key:
+            self._chain = (key, compile_middlewares(self.middleware))
+        return self._chain[1]
+
+    async def execute(self, input: bytes | memoryview, addr: IAddr) -> None:
+        """Processa no task atual, sem passar pelo launcher."""
+        await self._run_task(input, addr)
+
+    async def _run_task(self, input: bytes | memoryview, addr: IAddr) -> None:
+        scope = RequestScope()
+        try:
+            result = await self._process(input, addr, scope)
+
+            if self._server is None:
+                raise Exception("Server Not defined on dispatcher")
+            await send_result(self._server, result, addr)
+        finally:
+            await close_scope(scope)
+
+    async def _process(
+        self, input: bytes | memoryview, addr: IAddr, scope: RequestScope
+    ) -> bytes | ResponseStream | None:
         Exc: Callable[[str], ServerAPIException] | None = EncoderDecodeError
+        req_id: str | None = None
         try:
-            route, data = self.encoder.decode(input)
+            route, req_id, data = self.encoder.decode_request(input)
 
             Exc = RouterError
             route_pack, params = self.router.get_handler_pack(route)
             handler = route_pack.handler
+            plan = route_pack.plan
 
             Exc = None
-            context: dict[Any, Any] = {Params: params, IAddr: addr}
+            # um contexto por request: dependências scope="request" são
+            # compartilhadas entre route deps, handler e middlewares
+            context: dict[Any, Any] = {
+                Params: params,
+                IAddr: addr,
+                RequestScope: scope,
+            }
             await self.injector.run_validate_dependencies(
                 route_pack.dependencies, context
             )
@@ -236,41 +385,85 @@ class TaskRunner2(ITaskRunner, Generic[T]):
             obj_data = self.cast.to_model(data, route_pack.input_type)
 
             Exc = ParamsResolveError
-            kwargs: dict[str, Any] = get_params_addr(handler, params, addr)
+            kwargs: dict[str, Any] = plan.bind(params, addr)
 
             Exc = DependencyResolveError
-            deps = await self.injector.resolve(handler)
+            deps = await self.injector.resolve(handler, context)
             kwargs = {**kwargs, **deps}
 
+            offloader = self.offloader if route_pack.offload else None
+
             async def bound_handler(data: T):
-                return await handler(data, **kwargs)
+                if plan.is_stream:
+                    # middlewares recebem o generator como response
+                    return handler(data, **kwargs)
+                return await call_handler(handler, plan, offloader, data, kwargs)
 
             # Client Function Run
             response = await self._run_middlewares(
-                obj_data, bound_handler, params, addr
+                obj_data, bound_handler, params, addr, context
             )
 
             if response is None:
-                return
+                return None
+
+            if inspect.isasyncgen(response):
+                return await self._stream(
+                    cast(AsyncGenerator[Any, None], response), req_id
+                )
 
             if self.fire_forget:
-                return
+                return None
 
             Exc = TypeCastFromModelError
             cast_response = self.cast.from_model(response)
 
             Exc = EncoderEncodeError
-            encoded = self.encoder.encode(cast_response)
+            encoded = self.encoder.encode_response(cast_response, req_id)
 
         except Exception as e:
             err = Exc("Error on TaskRunner") if Exc else e
             if Exc:
                 err.__cause__ = e
-            encoded = self._resolve_exception(err)
+            encoded = self._resolve_exception(err, req_id)
+
+        return encoded
 
-        if self._server is None:
-            raise Exception("Server Not defined on dispatcher")
-        await self._server.write(encoded, addr)
+    async def _stream(
+        self, items: AsyncGenerator[Any, None], req_id: str | None
+    ) -> ResponseStream | None:
+        frames = self._encode_stream(items, req_id)
+        if self.fire_forget:
+            async with aclosing(frames):
+                async for _ in frames:
+                    pass
+            return None
+        return ResponseStream(frames, make_stream_end(req_id))
+
+    async def _encode_stream(
+        self, items: AsyncGenerator[Any, None], req_id: str | None
+    ) -> AsyncGenerator[bytes, None]:
+        """Cast e encode por item (os middlewares já envolveram o generator)."""
+        Exc: Callable[[str], ServerAPIException] | None = None
+        async with aclosing(items):
+            try:
+                async for item in items:
+                    if item is None:
+                        continue
+
+                    Exc = TypeCastFromModelError
+                    cast_item = self.cast.from_model(item)
+
+                    Exc = EncoderEncodeError
+                    encoded = self.encoder.encode_response(cast_item, req_id)
+
+                    Exc = None
+                    yield encoded
+            except Exception as e:
+                err = Exc("Error on TaskRunner") if Exc else e
+                if Exc:
+                    err.__cause__ = e
+                yield self._resolve_exception(err, req_id)
 
     async def _run_middlewares(
         self,
@@ -278,24 +471,33 @@ class TaskRunner2(ITaskRunner, Generic[T]):
         handler: Callable[..., Any],
         params: Params,
         addr: IAddr,
+        context: MutableMapping[Any, Any] | None = None,
     ) -> T:
         """Executa os middlewares e chama o handler final após a cadeia de middlewares."""
-        handler_chain = handler  # Inicia com o handler final
-
-        for middleware in self.middleware:
-
-            kwargs: dict[str, Any] = get_params_addr(middleware, params, addr)
-            deps = await self.injector.resolve(middleware)
-            kwargs = {**kwargs, **deps}
-
-            # early binding
-            async def wrapped(
-                data: T, _mw=middleware, _next=handler_chain, _kwargs=kwargs
-            ):
-                return await _mw(input=data, call_next=_next, **_kwargs)
-
-            # Atualiza o handler_chain com o middleware
-            handler_chain = wrapped
-
-        # Executa a cadeia de middlewares e o handler final
-        return await handler_chain(data)
+        steps = self.middleware_chain()
+        if not steps:
+            return await handler(data)
+
+        # por request só os valores: Params, IAddr e as dependências
+        bound: list[dict[str, Any]] = []
+        for step in steps:
+            kwargs = step.plan.bind(params, addr)
+            if step.has_deps:
+                deps = await self.injector.resolve(step.func, context)
+                kwargs = {**kwargs, **deps}
+            bound.append(kwargs)
+
+        return await self._call_next(steps, bound, handler, 0, data)
+
+    async def _call_next(
+        self,
+        steps: tuple[MiddlewareStep, ...],
+        bound: list[dict[str, Any]],
+        handler: Callable[..., Any],
+        index: int,
+        data: T,
+    ) -> T:
+        if index == len(steps):
+            return await handler(data)
+        call_next = partial(self._call_next, steps, bound, handler, index + 1)
+        return await steps[index].func(input=data, call_next=call_next, **bound[index])
@@ -1,15 +1,18 @@
-from typing import Annotated, Any, Callable, Mapping, Optional, Union
+from typing import Annotated, Any, Awaitable, Callable, Mapping, Optional, Union
 from unittest.mock import AsyncMock
 
 import pytest
 
+from serveAPI.addr import Addr
 from serveAPI.container import get_simple_str_ioc
+from serveAPI.datatypes.str_input import make_str_simple_header
 from serveAPI.dependencies.model import Injectable
 from serveAPI.di import DependencyInjector, IoCContainer, IoCContainerSingleton
 from serveAPI.exceptionhandler import ExceptionRegistry
-from serveAPI.interfaces import ISockerServer
+from serveAPI.interfaces import IAddr, ISockerServer, ITaskRunner
 from serveAPI.middleware import Middleware
 from serveAPI.router import RouterAPI
+from serveAPI.taskrunner import TaskRunner
 
 # ---------- IoC and DI ----------
 
@@ -127,6 +130,77 @@ async def taskrunner2_mockedserver_ioc() -> IoCContainerSingleton:
     return ioc
 
 
+# ---------- TaskRunner com server de teste ----------
+
+
+class RecordingServer:
+    """ISockerServer de teste: guarda, em ordem, tudo que o runner envia."""
+
+    def __init__(self, alive: int = 1000):
+        self.events: list[tuple[str, bytes]] = []
+        # write_stream devolve False (peer foi embora) depois de 'alive' frames
+        self.alive = alive
+
+    @property
+    def writes(self) -> list[bytes]:
+        return [data for kind, data in self.events if kind == "write"]
+
+    @property
+    def last(self) -> bytes:
+        return self.events[-1][1]
+
+    async def write(self, data: bytes, addr: IAddr) -> None:
+        self.events.append(("write", data))
+
+    async def write_stream(self, data: bytes, addr: IAddr) -> bool:
+        self.events.append(("stream", data))
+        self.alive -= 1
+        return self.alive > 0
+
+    async def release(self, addr: IAddr) -> None:
+        self.events.append(("release", b""))
+
+
+Send = Callable[..., Awaitable[None]]
+
+
+@pytest.fixture
+def str_ioc() -> IoCContainerSingleton:
+    return get_simple_str_ioc()
+
+
+@pytest.fixture
+def recording_server() -> RecordingServer:
+    return RecordingServer()
+
+
+@pytest.fixture
+def str_router(str_ioc: IoCContainerSingleton) -> RouterAPI:
+    return str_ioc.resolve(RouterAPI)
+
+
+@pytest.fixture
+def str_runner(
+    str_ioc: IoCContainerSingleton, recording_server: RecordingServer
+) -> TaskRunner:
+    runner = str_ioc.resolve(TaskRunner)
+    runner.inject_server(recording_server)  # type: ignore
+    return runner
+
+
+@pytest.fixture
+def send() -> Send:
+    """Processa um request str (header simples) no task atual."""
+
+    async def send(
+        runner: ITaskRunner, route: str, data: str = "x", req_id: str = "1"
+    ) -> None:
+        msg = make_str_simple_header(data, route, req_id=req_id).encode()
+        await runner.execute(msg, Addr("localhost", 1))
+
+    return send
+
+
 # -------------------- DEPENDENCIES
 
 
@@ -0,0 +1,149 @@
+import asyncio
+import os
+import socket
+import threading
+import time
+from pathlib import Path
+
+from serveAPI.container import ServerAPI
+from serveAPI.servers.framing import LengthPrefixFramer, make_frame
+from serveAPI.supervisor import Supervisor
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def pid_handler(input: str) -> str:
+    return str(os.getpid())
+
+
+class PidAppFactory:
+    def __init__(self, port: int):
+        self.port = port
+
+    def __call__(self):
+        app = ServerAPI(
+            "127.0.0.1", self.port, fire_and_forget=False, framed=True, reuse_port=True
+        )
+        app.add_api_route("pid", pid_handler)
+        return app
+
+
+class CrashOnceApp:
+    def __init__(self, marker: Path):
+        self.marker = marker
+
+    async def run(self) -> None:
+        if not self.marker.exists():
+            self.marker.touch()
+            os._exit(3)
+        await asyncio.Event().wait()
+
+
+def run_in_thread(supervisor: Supervisor) -> threading.Thread:
+    thread = threading.Thread(target=supervisor.run)
+    thread.start()
+    return thread
+
+
+def ask_pid(port: int) -> str:
+    deadline = time.monotonic() + 5
+    while True:
+        try:
+            sock = socket.create_connection(("127.0.0.1", port), timeout=2)
+            break
+        except ConnectionRefusedError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+    with sock:
+        sock.sendall(make_frame(b"serveAPI:pid:x"))
+        framer = LengthPrefixFramer()
+        while True:
+            frames = framer.feed(sock.recv(1024))
+            if frames:
+                return bytes(frames[0]).decode()
+
+
+def test_workers_share_port_with_reuseport():
+    port = free_port()
+    supervisor = Supervisor(app_factory=PidAppFactory(port), workers=2)
+    thread = run_in_thread(supervisor)
+    try:
+        pids = {ask_pid(port) for _ in range(20)}
+        worker_pids = {str(pid) for pid in supervisor.pids}
+        assert pids <= worker_pids
+        assert supervisor.stats.crashed == 0
+    finally:
+        supervisor.stop()
+        thread.join(15)
+    assert not thread.is_alive()
+
+
+def test_restart_crashed_worker(tmp_path: Path):
+    supervisor = Supervisor(
+        app_factory=lambda: CrashOnceApp(tmp_path / "crashed"),
+        workers=1,
+        restart_backoff=0.01,
+        shutdown_timeout=5,
+    )
+    thread = run_in_thread(supervisor)
+    try:
+        deadline = time.monotonic() + 5
+        while supervisor.stats.restarted < 1 and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert supervisor.stats.crashed == 1
+        assert supervisor.stats.restarted == 1
+        assert supervisor.stats.started == 2
+    finally:
+        supervisor.stop()
+        thread.join(10)
+    assert not thread.is_alive()
+
+
+class AlwaysCrashApp:
+    async def run(self) -> None:
+        os._exit(3)
+
+
+def test_gives_up_on_slot_after_max_restarts():
+    supervisor = Supervisor(
+        app_factory=AlwaysCrashApp,
+        workers=1,
+        restart_backoff=0.01,
+        max_restarts=2,
+        restart_window=30,
+    )
+    thread = run_in_thread(supervisor)
+    thread.join(10)
+    # sem workers e sem restarts pendentes, run() retorna sozinho
+    assert not thread.is_alive()
+    assert supervisor.stats.crashed == 3
+    assert supervisor.stats.restarted == 2
+    assert supervisor.stats.given_up == 1
+
+
+def test_stop_not_blocked_by_restart_backoff():
+    supervisor = Supervisor(app_factory=AlwaysCrashApp, workers=1, restart_backoff=30)
+    thread = run_in_thread(supervisor)
+    try:
+        deadline = time.monotonic() + 5
+        while supervisor.stats.crashed < 1 and time.monotonic() < deadline:
+            time.sleep(0.02)
+        assert supervisor.stats.crashed == 1
+    finally:
+        supervisor.stop()
+        thread.join(2)
+    assert not thread.is_alive()
+    assert supervisor.stats.restarted == 0
+
+
+def test_restart_backoff_is_exponential_and_capped():
+    supervisor = Supervisor(
+        app_factory=AlwaysCrashApp, restart_backoff=0.5, restart_backoff_max=3
+    )
+    delays = [supervisor._restart_delay(n) for n in range(5)]
+    assert delays == [0.5, 1.0, 2.0, 3, 3]
@@ -0,0 +1,29 @@
+import asyncio
+
+from benchmarks.bench_stages import STAGES, Pipeline, compare, measure, str_kind
+from serveAPI.addr import Addr
+
+
+def test_pipeline_stages_and_run_task_succeed():
+    pipeline = Pipeline(str_kind())
+    msg = pipeline.kind.make_request(16)
+    stages = pipeline.stages(msg)
+    assert set(stages) == set(STAGES)
+
+    asyncio.run(pipeline.runner._run_task(msg, Addr("127.0.0.1", 0)))
+    asyncio.run(pipeline.runner2._run_task(msg, Addr("127.0.0.1", 0)))
+    # dois responses reais (header + payload), nenhum erro
+    assert pipeline.server.writes == 2
+    assert pipeline.server.bytes == 2 * len("serveAPI#1:" + "x" * 16)
+
+
+def test_measure_and_compare_flag_regressions():
+    res = measure(lambda: None, repeat=2, min_time=0.001)
+    assert res["ns"] > 0 and res["number"] >= 1
+
+    results = {
+        "a": {"ns": 150.0, "median_ns": 150.0},
+        "b": {"ns": 100.0, "median_ns": 100.0},
+    }
+    baseline = {"a": {"ns": 100.0}, "b": {"ns": 100.0}}
+    assert compare(results, baseline, threshold=0.2) == ["a"]
@@ -0,0 +1,153 @@
+import asyncio
+
+import pytest
+
+from serveAPI.exceptions import LauncherFullError
+from serveAPI.launchers.bounded_launcher import BoundedLauncher
+from serveAPI.servers.framing import make_frame
+from serveAPI.servers.tcpserver import TCPServer
+from serveAPI.servers.udpserver import UDPServer
+
+
+async def blocker(event: asyncio.Event, done: list[int], i: int) -> None:
+    await event.wait()
+    done.append(i)
+
+
+async def test_limits_inflight_and_queues():
+    launcher = BoundedLauncher(max_inflight=2, max_pending=2)
+    release = asyncio.Event()
+    done: list[int] = []
+
+    for i in range(4):
+        launcher(blocker(release, done, i))
+    await asyncio.sleep(0)
+
+    assert launcher.inflight == 2
+    assert launcher.pending == 2
+    assert launcher.full
+
+    release.set()
+    await asyncio.sleep(0.05)
+    assert sorted(done) == [0, 1, 2, 3]
+    assert launcher.inflight == 0
+    assert not launcher.full
+    assert launcher.stats.launched == 4
+    assert launcher.stats.queued == 2
+
+
+async def test_rejects_when_full():
+    launcher = BoundedLauncher(max_inflight=1, max_pending=0)
+    release = asyncio.Event()
+    launcher(blocker(release, [], 0))
+
+    coro = blocker(release, [], 1)
+    with pytest.raises(LauncherFullError):
+        launcher(coro)
+    assert launcher.stats.rejected == 1
+    assert coro.cr_frame is None  # coroutine fechada, sem warning
+    release.set()
+
+
+async def test_wait_ready_unblocks():
+    launcher = BoundedLauncher(max_inflight=1, max_pending=1)
+    release = asyncio.Event()
+    launcher(blocker(release, [], 0))
+    launcher(blocker(release, [], 1))
+
+    waiter = asyncio.create_task(launcher.wait_ready())
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    release.set()
+    await asyncio.wait_for(waiter, 1)
+
+
+async def test_drop_oldest():
+    launcher = BoundedLauncher(max_inflight=1, max_pending=2)
+    release = asyncio.Event()
+    done: list[int] = []
+    for i in range(3):
+        launcher(blocker(release, done, i))
+
+    assert launcher.drop_oldest()
+    assert not launcher.full
+    launcher(blocker(release, done, 3))
+
+    release.set()
+    await asyncio.sleep(0.05)
+    assert sorted(done) == [0, 2, 3]
+    assert launcher.stats.dropped == 1
+
+
+@pytest.mark.parametrize(
+    "policy, expected",
+    [("drop_newest", [0, 1]), ("drop_oldest", [0, 2])],
+)
+async def test_udp_overflow_policy(policy, expected):
+    launcher = BoundedLauncher(max_inflight=1, max_pending=1)
+    release = asyncio.Event()
+    done: list[int] = []
+
+    def runner(data: bytes, addr) -> None:
+        launcher(blocker(release, done, int(data)))
+
+    server = UDPServer(
+        host="127.0.0.1",
+        port=0,
+        runner=runner,  # type: ignore
+        fire_and_forget=True,
+        makeid=lambda: "id",
+        backpressure=launcher,
+        overflow=policy,
+    )
+    for i in range(3):
+        server.datagram_received(str(i).encode(), ("127.0.0.1", 9999))
+
+    release.set()
+    await asyncio.sleep(0.05)
+    assert sorted(done) == expected
+    assert server.stats.received == 3
+    assert server.stats.dropped == 1
+
+
+@pytest.mark.parametrize("framed", [False, True])
+async def test_tcp_backpressure_many_connections(framed: bool):
+    launcher = BoundedLauncher(max_inflight=1, max_pending=0)
+    received: list[bytes] = []
+
+    async def handle(data: bytes) -> None:
+        await asyncio.sleep(0.002)
+        received.append(bytes(data))
+
+    server = TCPServer(
+        host="127.0.0.1",
+        port=0,
+        runner=lambda data, addr: launcher(handle(data)),  # type: ignore
+        fire_and_forget=False,
+        makeid=lambda: "id",
+        framed=framed,
+        backpressure=launcher,
+    )
+    asyncio.create_task(server.start())
+    while server._server is None or not server._server.sockets:
+        await asyncio.sleep(0.01)
+    port = server._server.sockets[0].getsockname()[1]
+
+    async def client(n: int) -> None:
+        _, writer = await asyncio.open_connection("127.0.0.1", port)
+        for i in range(5):
+            msg = f"{n}-{i};".encode()
+            writer.write(make_frame(msg) if framed else msg)
+            await writer.drain()
+            await asyncio.sleep(0.001)
+        await asyncio.sleep(0.3)
+        writer.close()
+
+    await asyncio.gather(*(client(n) for n in range(4)))
+
+    # nenhuma conexão derrubada: tudo que foi enviado chegou ao handler
+    messages = b"".join(received).decode().split(";")[:-1]
+    assert sorted(messages) == sorted(f"{n}-{i}" for n in range(4) for i in range(5))
+    assert launcher.stats.rejected == 0
+    await server.stop()
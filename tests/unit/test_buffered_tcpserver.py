@@ -0,0 +1,131 @@
+import asyncio
+from typing import Any
+
+from serveAPI.launchers.bounded_launcher import BoundedLauncher
+from serveAPI.servers.buffered_tcpserver import BufferedTCPServer
+from serveAPI.servers.framing import LengthPrefixFramer, make_frame
+
+
+async def start_server(**kwargs: Any) -> tuple[BufferedTCPServer, list, int]:
+    received: list[tuple[bytes, Any]] = []
+
+    def runner(data: bytes, addr: Any) -> None:
+        received.append((data, addr))
+
+    server = BufferedTCPServer(
+        host="127.0.0.1",
+        port=0,
+        runner=runner,  # type: ignore
+        fire_and_forget=False,
+        makeid=lambda: "id",
+        **kwargs,
+    )
+    asyncio.create_task(server.start())
+    while server._server is None or not server._server.sockets:
+        await asyncio.sleep(0.01)
+    return server, received, server._server.sockets[0].getsockname()[1]
+
+
+async def wait_for(cond, timeout: float = 2.0) -> None:
+    for _ in range(int(timeout / 0.01)):
+        if cond():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("timeout")
+
+
+async def test_frames_split_and_glued():
+    server, received, port = await start_server(buffer_size=16)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+
+    payloads = [b"a", b"b" * 40, b"", b"c" * 5]
+    stream = b"".join(make_frame(p) for p in payloads)
+    for i in range(0, len(stream), 7):
+        writer.write(stream[i : i + 7])
+        await writer.drain()
+        await asyncio.sleep(0)
+
+    await wait_for(lambda: len(received) == len(payloads))
+    assert [data for data, _ in received] == payloads
+    assert [addr.seq for _, addr in received] == [0, 1, 2, 3]
+
+    writer.close()
+    await server.stop()
+
+
+async def test_write_framed_response_in_order():
+    server, received, port = await start_server(ordered=True)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(make_frame(b"one") + make_frame(b"two"))
+    await writer.drain()
+    await wait_for(lambda: len(received) == 2)
+
+    (_, addr0), (_, addr1) = received
+    await server.write(b"second", addr1)
+    await server.write(b"first", addr0)
+
+    framer = LengthPrefixFramer()
+    frames: list[bytes] = []
+    while len(frames) < 2:
+        frames.extend(bytes(f) for f in framer.feed(await reader.read(1024)))
+    assert frames == [b"first", b"second"]
+
+    writer.close()
+    await server.stop()
+
+
+async def test_frame_too_large_closes_connection():
+    server, received, port = await start_server(max_frame_size=4)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(make_frame(b"12345"))
+    await writer.drain()
+
+    assert await asyncio.wait_for(reader.read(), 2) == b""
+    assert received == []
+    await server.stop()
+
+
+async def test_backpressure_resume_task_is_kept_and_cancelled():
+    launcher = BoundedLauncher(max_inflight=1, max_pending=0)
+    release = asyncio.Event()
+    done: list[bytes] = []
+
+    async def handle(data: bytes) -> None:
+        await release.wait()
+        done.append(data)
+
+    server = BufferedTCPServer(
+        host="127.0.0.1",
+        port=0,
+        runner=lambda data, addr: launcher(handle(data)),  # type: ignore
+        fire_and_forget=False,
+        makeid=lambda: "id",
+        backpressure=launcher,
+    )
+    asyncio.create_task(server.start())
+    await wait_for(lambda: server._server is not None and server._server.sockets)
+    port = server._server.sockets[0].getsockname()[1]  # type: ignore
+
+    _, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(make_frame(b"a") + make_frame(b"b"))
+    await wait_for(lambda: len(server._protocols) == 1)
+    proto = next(iter(server._protocols.values()))
+    await wait_for(lambda: proto._resume_task is not None)
+
+    # com a vaga liberada o frame pendente é entregue e a leitura volta
+    release.set()
+    await wait_for(lambda: done == [b"a", b"b"])
+    assert proto._resume_task is None and not proto._paused
+
+    release.clear()
+    writer.write(make_frame(b"c") + make_frame(b"d"))
+    await wait_for(lambda: proto._resume_task is not None)
+    task = proto._resume_task
+
+    # leitura pausada: o fim da conexão vem do stop(), via connection_lost
+    await server.stop()
+    await wait_for(lambda: task.done())  # type: ignore
+    assert task.cancelled()  # type: ignore
+    assert proto._resume_task is None
+    writer.close()
+    release.set()
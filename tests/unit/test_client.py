@@ -0,0 +1,156 @@
+import asyncio
+import socket
+from pathlib import Path
+from typing import Any, AsyncGenerator
+
+import pytest
+
+from serveAPI.client import Client, simple_str_codec
+from serveAPI.container import ServerAPI
+from serveAPI.exceptions import ClientConnectionError
+
+
+async def echo(input: str) -> str:
+    return input
+
+
+async def slow(input: str) -> str:
+    await asyncio.sleep(float(input))
+    return input
+
+
+async def rows(input: str) -> AsyncGenerator[str, None]:
+    for i in range(int(input)):
+        yield f"row{i}"
+
+
+async def sparse(input: str) -> AsyncGenerator[str, None]:
+    # itens vazios não podem ser confundidos com o fim do stream
+    for item in ("", input, "", input):
+        yield item
+
+
+async def boom(input: str) -> str:
+    raise RuntimeError(input)
+
+
+async def start_app(**kwargs: Any) -> tuple[Any, "asyncio.Task[None]"]:
+    app = ServerAPI("127.0.0.1", 0, fire_and_forget=False, framed=True, **kwargs)
+    app.add_api_route("echo", echo)
+    app.add_api_route("slow", slow)
+    app.add_api_route("rows", rows)
+    app.add_api_route("sparse", sparse)
+    app.add_api_route("boom", boom)
+    running = asyncio.create_task(app.run())
+    server = app._server
+    while server._server is None or not server._server.sockets:
+        await asyncio.sleep(0.01)
+    return app, running
+
+
+def address(app: Any) -> tuple[str, int]:
+    return app._server._server.sockets[0].getsockname()[:2]
+
+
+async def stop_app(running: "asyncio.Task[None]") -> None:
+    running.cancel()
+    await asyncio.gather(running, return_exceptions=True)
+
+
+async def test_request_and_pipelining():
+    app, running = await start_app()
+    async with Client([address(app)], simple_str_codec(), pool_size=1) as client:
+        assert await client.request("echo", "hello") == "hello"
+
+        # a resposta lenta não segura a rápida na mesma conexão
+        slow_reply = asyncio.create_task(client.request("slow", "0.2"))
+        await asyncio.sleep(0.01)
+        assert await client.request("echo", "fast") == "fast"
+        assert not slow_reply.done()
+        assert await slow_reply == "0.2"
+        assert client.connections == 1
+    await stop_app(running)
+
+
+async def test_request_many_and_pool():
+    app, running = await start_app()
+    async with Client([address(app)], simple_str_codec(), pool_size=3) as client:
+        items = [f"m{i}" for i in range(500)]
+        assert await client.request_many("echo", items) == items
+
+        replies = await asyncio.gather(
+            *(client.request("echo", str(i)) for i in range(200))
+        )
+        assert replies == [str(i) for i in range(200)]
+        assert client.connections <= 3
+    await stop_app(running)
+
+
+async def test_stream():
+    app, running = await start_app()
+    async with Client([address(app)], simple_str_codec()) as client:
+        got = [row async for row in client.stream("rows", "5")]
+        assert got == [f"row{i}" for i in range(5)]
+    await stop_app(running)
+
+
+async def test_stream_with_empty_items():
+    app, running = await start_app()
+    async with Client([address(app)], simple_str_codec()) as client:
+        got = [row async for row in client.stream("sparse", "x")]
+        assert got == ["", "x", "", "x"]
+        assert await client.request("echo", "after") == "after"
+    await stop_app(running)
+
+
+async def test_server_error_comes_back_as_value():
+    # respostas de erro não são marcadas: o payload do handler vira o valor
+    app, running = await start_app()
+    async with Client([address(app)], simple_str_codec()) as client:
+        reply = await client.request("boom", "kaput")
+        assert '"RuntimeError"' in reply and "kaput" in reply
+        assert await client.request("echo", "after") == "after"
+    await stop_app(running)
+
+
+async def test_timeout_drops_late_response():
+    app, running = await start_app()
+    async with Client([address(app)], simple_str_codec(), timeout=0.05) as client:
+        with pytest.raises(asyncio.TimeoutError):
+            await client.request("slow", "0.2")
+        await asyncio.sleep(0.25)
+        assert await client.request("echo", "after") == "after"
+    await stop_app(running)
+
+
+async def test_unix_socket(tmp_path: Path):
+    path = str(tmp_path / "c.sock")
+    app = ServerAPI("", 0, fire_and_forget=False, framed=True, unix_path=path)
+    app.add_api_route("echo", echo)
+    running = asyncio.create_task(app.run())
+    while app._server._server is None:  # type: ignore
+        await asyncio.sleep(0.01)
+
+    async with Client([path], simple_str_codec()) as client:
+        assert await client.request("echo", "uds") == "uds"
+    await stop_app(running)
+
+
+async def test_connection_refused():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    async with Client([("127.0.0.1", port)], simple_str_codec()) as client:
+        with pytest.raises(ClientConnectionError):
+            await client.request("echo", "x")
+
+
+async def test_server_gone_fails_pending_requests():
+    app, running = await start_app()
+    app.shutdown_timeout = 0.01
+    async with Client([address(app)], simple_str_codec()) as client:
+        pending = asyncio.create_task(client.request("slow", "5"))
+        await asyncio.sleep(0.05)
+        await stop_app(running)
+        with pytest.raises(ClientConnectionError):
+            await pending
@@ -0,0 +1,119 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from serveAPI.servers.conn_writer import ConnectionWriter
+from serveAPI.servers.framing import LengthPrefixFramer
+
+
+class FakeWriter:
+    def __init__(self):
+        self.calls: list[list[bytes]] = []
+        self.can_drain = asyncio.Event()
+        self.can_drain.set()
+        self.error: Exception | None = None
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+    def writelines(self, data: list[bytes]) -> None:
+        self.calls.append(list(data))
+
+    async def drain(self) -> None:
+        await self.can_drain.wait()
+        if self.error is not None:
+            raise self.error
+
+
+def make(**kwargs: Any) -> tuple[ConnectionWriter, FakeWriter]:
+    fake = FakeWriter()
+    out = ConnectionWriter(writer=fake, **kwargs)  # type: ignore
+    out.start()
+    return out, fake
+
+
+async def test_coalesces_sends_of_one_tick():
+    out, fake = make()
+    for i in range(10):
+        out.send([b"r%d" % i])
+    await asyncio.sleep(0)
+    await asyncio.sleep(0)
+
+    assert len(fake.calls) == 1
+    assert fake.calls[0] == [b"r%d" % i for i in range(10)]
+    assert out.stats.responses == 10
+    assert out.stats.flushes == 1
+    assert out.stats.per_flush == 10
+    await out.close()
+
+
+async def test_framed_output():
+    out, fake = make(framed=True)
+    out.send([b"a", b"bcd"])
+    await out.close()
+    stream = b"".join(b"".join(call) for call in fake.calls)
+    assert [bytes(f) for f in LengthPrefixFramer().feed(stream)] == [b"a", b"bcd"]
+    assert out.stats.bytes == 4
+
+
+async def test_accumulates_while_draining():
+    out, fake = make()
+    fake.can_drain.clear()
+    out.send([b"first"])
+    await asyncio.sleep(0)
+    for _ in range(5):
+        out.send([b"x"])
+    await asyncio.sleep(0)
+    assert len(fake.calls) == 1
+
+    fake.can_drain.set()
+    await asyncio.sleep(0.01)
+    assert fake.calls[1] == [b"x"] * 5
+    await out.close()
+
+
+async def test_watermarks_block_writers():
+    out, fake = make(high_water=10, low_water=4)
+    fake.can_drain.clear()
+    out.send([b"0123456789AB"])
+    assert out.pending_bytes == 12
+
+    waiter = asyncio.create_task(out.wait_writable())
+    await asyncio.sleep(0.01)
+    assert not waiter.done()
+
+    fake.can_drain.set()
+    await asyncio.wait_for(waiter, 1)
+    assert out.pending_bytes == 0
+    await out.close()
+
+
+async def test_broken_connection_releases_waiters():
+    out, fake = make(high_water=1, low_water=0)
+    fake.error = ConnectionResetError("reset")
+    out.send([b"abc"])
+    await asyncio.wait_for(out.wait_writable(), 1)
+    assert out.broken
+    out.send([b"ignored"])
+    assert out.pending_bytes == 0
+    await out.close()
+
+
+def test_invalid_watermarks():
+    with pytest.raises(ValueError):
+        ConnectionWriter(writer=None, high_water=1, low_water=2)  # type: ignore
+
+
+@pytest.mark.parametrize(
+    "error", [TimeoutError("slow"), OSError(5, "io"), ValueError()]
+)
+async def test_close_closes_writer_when_final_drain_fails(error: Exception):
+    out, fake = make()
+    fake.error = error
+    out.send([b"last"])
+    await out.close()
+
+    assert fake.closed
+    assert out.broken
@@ -4,7 +4,13 @@ from typing import Annotated
 
 import pytest
 
-from serveAPI.di import Depends
+from serveAPI.di import (
+    Depends,
+    RequestScope,
+    compile_call_plan,
+    compile_dependencies,
+)
+from serveAPI.interfaces import IAddr, Params
 
 
 @dataclass
@@ -137,3 +143,247 @@ async def test_dependency_chain_with_annotated(annotated_injector):
 
     kwargs = await annotated_injector.resolve(outer)
     assert kwargs["dep"] == "Hello from ChainedAnnotated"
+
+
+# ---------- Call Plan Tests ----------
+
+
+def test_compile_call_plan_finds_params_addr_and_stream():
+    async def handler(
+        input: str,
+        p: Params,
+        a: Annotated[IAddr, "x"],
+        dep: str = Depends(make_service),
+    ) -> str:
+        return input
+
+    async def streamer(input: str):
+        yield input
+
+    plan = compile_call_plan(handler, str)
+    assert plan.input_type is str
+    assert (plan.params_arg, plan.addr_arg, plan.is_stream) == ("p", "a", False)
+    assert plan.bind(Params(k="v"), "addr") == {"p": {"k": "v"}, "a": "addr"}  # type: ignore
+    assert compile_call_plan(streamer).is_stream
+
+
+@pytest.mark.asyncio
+async def test_resolve_plan_without_reflection(annotated_injector, monkeypatch):
+    annotated_injector.container.register(Service, lambda c: Service("Planned"))
+
+    def inner(dep: Annotated[Service, Depends(Service)]) -> str:
+        return f"Hello from {dep.name}"
+
+    async def outer(dep: Annotated[str, Depends(inner)], other: Service):
+        return dep
+
+    annotated_injector.plan(outer)  # compila e guarda no cache
+
+    def fail(*args, **kwargs):
+        raise AssertionError("reflection on the request path")
+
+    monkeypatch.setattr("serveAPI.di.inspect.signature", fail)
+    monkeypatch.setattr("serveAPI.di.get_type_hints", fail)
+
+    kwargs = await annotated_injector.resolve(outer)
+    assert kwargs["dep"] == "Hello from Planned"
+    assert kwargs["other"].name == "Planned"
+    assert annotated_injector.stats.hits == 1
+    assert annotated_injector.stats.misses == 1
+
+
+@pytest.mark.asyncio
+async def test_override_invalidates_cached_plans(annotated_injector):
+    def inner() -> str:
+        return "real"
+
+    def fake() -> str:
+        return "fake"
+
+    def middle(value: str = Depends(inner)) -> str:
+        return value
+
+    async def handler(value: Annotated[str, Depends(middle)]):
+        return value
+
+    assert (await annotated_injector.resolve(handler))["value"] == "real"
+
+    annotated_injector.dependency_overrides[inner] = fake
+    assert (await annotated_injector.resolve(handler))["value"] == "fake"
+    assert annotated_injector.stats.invalidations == 1
+
+    annotated_injector.dependency_overrides.clear()
+    assert (await annotated_injector.resolve(handler))["value"] == "real"
+    assert annotated_injector.stats.misses == 3
+
+
+def test_compile_dependencies_records_used_before_override():
+    def inner() -> str:
+        return "real"
+
+    def handler(value: str = Depends(inner), service: Service = Depends(Service)):
+        return value
+
+    used: set = set()
+    plan = compile_dependencies(handler, {Service: make_service}, used)
+    assert used == {inner, Service}
+    assert plan.args[1].depends.func is make_service  # type: ignore
+
+
+# ---------- Scope Tests ----------
+
+
+@pytest.mark.asyncio
+async def test_request_scope_resolves_once_per_context(annotated_injector):
+    calls = []
+
+    async def get_db() -> object:
+        calls.append(1)
+        return object()
+
+    def repo(db: object = Depends(get_db, scope="request")) -> object:
+        return db
+
+    async def handler(
+        db: object = Depends(get_db, scope="request"), r: object = Depends(repo)
+    ):
+        return db
+
+    async def middleware(db: object = Depends(get_db, scope="request")):
+        return db
+
+    context = {RequestScope: RequestScope()}
+    kwargs = await annotated_injector.resolve(handler, context)
+    mw_kwargs = await annotated_injector.resolve(middleware, context)
+    assert kwargs["db"] is kwargs["r"] is mw_kwargs["db"]
+    assert len(calls) == 1
+
+    # outro request, outro valor
+    await annotated_injector.resolve(handler)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_app_scope_built_once(annotated_injector):
+    calls = []
+
+    async def get_client() -> object:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return object()
+
+    async def handler(client: object = Depends(get_client, scope="app")):
+        return client
+
+    await annotated_injector.startup([handler])
+    assert len(calls) == 1
+
+    results = await asyncio.gather(
+        *(annotated_injector.resolve(handler) for _ in range(5))
+    )
+    assert len({id(r["client"]) for r in results}) == 1
+    assert len(calls) == 1
+
+    await annotated_injector.shutdown()
+    await annotated_injector.resolve(handler)
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_app_scope_concurrent_first_use(annotated_injector):
+    calls = []
+
+    async def get_client() -> object:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return object()
+
+    async def handler(client: object = Depends(get_client, scope="app")):
+        return client
+
+    results = await asyncio.gather(
+        *(annotated_injector.resolve(handler) for _ in range(5))
+    )
+    assert len({id(r["client"]) for r in results}) == 1
+    assert len(calls) == 1
+
+
+# ---------- Concurrent Resolution Tests ----------
+
+
+@pytest.mark.asyncio
+async def test_sibling_async_dependencies_run_concurrently(annotated_injector):
+    order: list[str] = []
+
+    async def lookup() -> int:
+        await asyncio.sleep(0.05)
+        return 1
+
+    async def first() -> str:
+        order.append("first")
+        return "first"
+
+    async def needs_first(value: str = Depends(first)) -> str:
+        order.append("needs_first")
+        return value + "!"
+
+    async def handler(
+        a: int = Depends(lookup),
+        b: int = Depends(lookup),
+        c: int = Depends(lookup),
+        d: str = Depends(needs_first),
+    ):
+        return a
+
+    assert annotated_injector.plan(handler).concurrent
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    kwargs = await annotated_injector.resolve(handler)
+    assert loop.time() - start < 0.12
+    assert kwargs == {"a": 1, "b": 1, "c": 1, "d": "first!"}
+    assert order == ["first", "needs_first"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_siblings_share_request_scope(annotated_injector):
+    calls = []
+
+    async def get_db() -> object:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return object()
+
+    async def repo_a(db: object = Depends(get_db, scope="request")) -> object:
+        return db
+
+    async def repo_b(db: object = Depends(get_db, scope="request")) -> object:
+        return db
+
+    async def handler(a: object = Depends(repo_a), b: object = Depends(repo_b)):
+        return a
+
+    kwargs = await annotated_injector.resolve(handler)
+    assert kwargs["a"] is kwargs["b"]
+    assert len(calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_failure_cancels_siblings(annotated_injector):
+    finished = []
+
+    async def slow() -> int:
+        await asyncio.sleep(0.2)
+        finished.append(1)
+        return 1
+
+    async def broken() -> int:
+        raise ValueError("boom")
+
+    async def handler(a: int = Depends(slow), b: int = Depends(broken)):
+        return a
+
+    with pytest.raises(ValueError):
+        await annotated_injector.resolve(handler)
+    await asyncio.sleep(0.25)
+    assert finished == []
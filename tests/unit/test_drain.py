@@ -0,0 +1,102 @@
+import asyncio
+
+from serveAPI.container import ServerAPI
+from serveAPI.datatypes.str_input import make_str_simple_header
+from serveAPI.encoder import parse_response_header
+from serveAPI.launchers.asyncio_launcher import AsyncioLauncher
+from serveAPI.launchers.bounded_launcher import BoundedLauncher
+from serveAPI.servers.framing import LengthPrefixFramer, make_frame
+
+
+async def sleeper(delay: float, done: list[float]) -> None:
+    await asyncio.sleep(delay)
+    done.append(delay)
+
+
+async def test_asyncio_launcher_drain_and_cancel():
+    launcher = AsyncioLauncher()
+    done: list[float] = []
+    for delay in (0.01, 0.02, 5):
+        launcher(sleeper(delay, done))
+    assert launcher.inflight == 3
+
+    result = await launcher.drain(timeout=0.2)
+    assert (result.drained, result.cancelled) == (2, 1)
+    assert done == [0.01, 0.02]
+    assert launcher.inflight == 0
+
+
+async def test_drain_counts_tasks_started_during_drain():
+    launcher = AsyncioLauncher()
+    done: list[float] = []
+
+    async def spawner() -> None:
+        # começa e termina durante o drain, entre duas leituras do set
+        launcher(sleeper(0, done))
+        await asyncio.sleep(0.05)
+        launcher(sleeper(0.05, done))
+
+    launcher(spawner())
+    result = await launcher.drain(timeout=1)
+
+    assert (result.drained, result.cancelled) == (3, 0)
+    assert done == [0, 0.05]
+    assert launcher.inflight == 0
+
+
+async def test_bounded_launcher_drains_queue():
+    launcher = BoundedLauncher(max_inflight=1, max_pending=4)
+    done: list[float] = []
+    for _ in range(3):
+        launcher(sleeper(0.01, done))
+    assert launcher.pending == 2
+
+    result = await launcher.drain(timeout=1)
+    assert (result.drained, result.cancelled) == (3, 0)
+    assert len(done) == 3
+
+
+async def test_bounded_launcher_discards_queue_on_timeout():
+    launcher = BoundedLauncher(max_inflight=1, max_pending=4)
+    done: list[float] = []
+    launcher(sleeper(5, done))
+    launcher(sleeper(0.01, done))
+    launcher(sleeper(0.01, done))
+
+    result = await launcher.drain(timeout=0.05)
+    assert (result.drained, result.cancelled) == (0, 3)
+    assert launcher.inflight == 0
+    assert launcher.pending == 0
+    assert done == []
+
+
+async def test_app_shutdown_finishes_inflight_requests():
+    app = ServerAPI("127.0.0.1", 0, fire_and_forget=False, framed=True)
+
+    async def slow(input: str) -> str:
+        await asyncio.sleep(0.1)
+        return input
+
+    app.add_api_route("slow", slow)
+    running = asyncio.create_task(app.run())
+    server = app._server
+    while server._server is None or not server._server.sockets:  # type: ignore
+        await asyncio.sleep(0.01)
+    port = server._server.sockets[0].getsockname()[1]  # type: ignore
+
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    msg = make_str_simple_header("bye", "slow", req_id="1").encode()
+    writer.write(make_frame(msg))
+    await writer.drain()
+    await asyncio.sleep(0.02)
+
+    running.cancel()
+    frames = LengthPrefixFramer().feed(await asyncio.wait_for(reader.read(1024), 2))
+    req_id, rest = parse_response_header(frames[0])
+    assert (req_id, bytes(rest)) == ("1", b"bye")
+
+    await asyncio.gather(running, return_exceptions=True)
+    assert app.drain_result is not None
+    assert (app.drain_result.drained, app.drain_result.cancelled) == (1, 0)
+    assert await reader.read() == b""
+    writer.close()
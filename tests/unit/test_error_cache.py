@@ -0,0 +1,67 @@
+import json
+
+from serveAPI.container import provide_cached_exception
+from serveAPI.di import IoCContainerSingleton
+from serveAPI.exceptionhandler import ExceptionRegistry
+from serveAPI.exceptions import (
+    CachedErrorHandler,
+    RouterError,
+    internal_exception_handler,
+)
+from serveAPI.taskrunner import TaskRunner
+from tests.conftest import RecordingServer, Send
+
+
+def router_error(msg: str) -> RouterError:
+    err = RouterError("Error on TaskRunner")
+    err.__cause__ = Exception(msg)
+    return err
+
+
+def test_same_json_as_internal_handler():
+    handler = CachedErrorHandler()
+    for err in (router_error("Route /x/ not found — ç"), RouterError("plain")):
+        assert json.loads(handler(err)) == json.loads(internal_exception_handler(err))
+
+
+def test_identical_errors_served_from_cache():
+    handler = CachedErrorHandler()
+    first = handler(router_error("Route /x/ not found"))
+    second = handler(router_error("Route /x/ not found"))
+    assert first is second
+    assert (handler.stats.built, handler.stats.cached) == (1, 1)
+
+
+def test_new_details_collapse_under_rate_limit():
+    now = [0.0]
+    handler = CachedErrorHandler(detail_rate=1.0, burst=2, clock=lambda: now[0])
+
+    for i in range(4):
+        handler(router_error(f"Route /{i}/ not found"))
+    assert handler.stats.built == 2
+    assert handler.stats.collapsed == 2
+    collapsed = json.loads(handler(router_error("Route /9/ not found")))
+    assert collapsed == {
+        "Exception": {"Type": "RouterError", "Msg": "Error on TaskRunner"}
+    }
+
+    now[0] = 1.0  # um token de volta
+    detailed = json.loads(handler(router_error("Route /10/ not found")))
+    assert detailed["OriginalException"]["Msg"] == "Route /10/ not found"
+
+
+async def test_runner_writes_cached_error_bytes(
+    str_ioc: IoCContainerSingleton, recording_server: RecordingServer, send: Send
+):
+    str_ioc.register(ExceptionRegistry, provide_cached_exception)
+    runner = str_ioc.resolve(TaskRunner)
+    runner.inject_server(recording_server)  # type: ignore
+
+    await send(runner, "missing", req_id="5")
+
+    header = b"serveAPI#5:"
+    write = recording_server.writes[0]
+    assert write.startswith(header)
+    err = json.loads(write[len(header) :])
+    assert err["Exception"]["Type"] == "RouterError"
+    assert "not found on RouterAPI" in err["OriginalException"]["Msg"]
@@ -87,3 +87,29 @@ async def test_multiple_handlers_match_first_correct_type(registry):
 
     assert result == "specific handler"
     assert calls == ["specific"]  # deve chamar apenas o mais específico
+
+
+def test_dispatch_cache_invalidated_on_register(registry):
+    registry.set_handler(MyError, lambda exc: "base")
+    assert registry.resolve(MySubError("x")) == "base"
+    assert MySubError in registry._dispatch
+
+    registry.set_handler(MySubError, lambda exc: "specific")
+    assert registry.resolve(MySubError("x")) == "specific"
+
+    @registry.decorator(OtherError)
+    def other(exc: BaseException) -> str:
+        return "other"
+
+    assert registry.resolve(OtherError("x")) == "other"
+
+
+def test_virtual_subclass_still_resolved(registry):
+    import abc
+
+    class Marker(abc.ABC):
+        pass
+
+    Marker.register(OtherError)
+    registry.set_handler(Marker, lambda exc: "marker")  # type: ignore
+    assert registry.resolve(OtherError("x")) == "marker"
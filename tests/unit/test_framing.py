@@ -0,0 +1,125 @@
+import asyncio
+from typing import Any
+
+import pytest
+
+from serveAPI.container import ServerAPI
+from serveAPI.datatypes.str_input import SimpleStrEncoder, make_str_simple_header
+from serveAPI.exceptions import FrameTooLargeError
+from serveAPI.servers.framing import LengthPrefixFramer, make_frame
+from serveAPI.servers.tcpserver import TCPServer
+
+
+def test_single_frame():
+    framer = LengthPrefixFramer()
+    frames = framer.feed(make_frame(b"hello"))
+    assert [bytes(f) for f in frames] == [b"hello"]
+    assert framer.buffered == 0
+
+
+def test_glued_frames_share_buffer():
+    framer = LengthPrefixFramer()
+    data = make_frame(b"one") + make_frame(b"two") + make_frame(b"three")
+    frames = framer.feed(data)
+
+    assert [bytes(f) for f in frames] == [b"one", b"two", b"three"]
+    # sem cópia: todos os frames apontam para o mesmo buffer recebido
+    assert all(f.obj is data for f in frames)
+
+
+@pytest.mark.parametrize("chunk", [1, 2, 3, 5, 7])
+def test_split_frames(chunk: int):
+    framer = LengthPrefixFramer()
+    payloads = [b"a" * 10, b"", b"bc" * 700, b"d"]
+    stream = b"".join(make_frame(p) for p in payloads)
+
+    received: list[bytes] = []
+    for i in range(0, len(stream), chunk):
+        received.extend(bytes(f) for f in framer.feed(stream[i : i + chunk]))
+
+    assert received == payloads
+    assert framer.buffered == 0
+
+
+def test_frame_too_large():
+    framer = LengthPrefixFramer(max_frame_size=8)
+    framer.feed(make_frame(b"12345678"))
+    with pytest.raises(FrameTooLargeError):
+        framer.feed(make_frame(b"123456789"))
+
+
+def test_invalid_max_frame_size():
+    with pytest.raises(ValueError):
+        LengthPrefixFramer(max_frame_size=0)
+
+
+def test_str_encoder_decodes_memoryview():
+    msg = make_str_simple_header("x" * 4096, "route").encode()
+    frame = LengthPrefixFramer().feed(make_frame(msg))[0]
+
+    route, data = SimpleStrEncoder().decode(frame)
+    assert route == "route"
+    assert data == "x" * 4096
+
+
+async def test_tcpserver_framed_roundtrip():
+    received: list[tuple[bytes, Any]] = []
+
+    def runner(data: bytes, addr: Any) -> None:
+        received.append((bytes(data), addr))
+
+    server = TCPServer(
+        host="127.0.0.1",
+        port=0,
+        runner=runner,  # type: ignore
+        fire_and_forget=False,
+        makeid=lambda: "id",
+        framed=True,
+    )
+    task = asyncio.create_task(server.start())
+    while server._server is None or not server._server.sockets:
+        await asyncio.sleep(0.01)
+    port = server._server.sockets[0].getsockname()[1]
+
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    big = b"y" * 5000
+    writer.write(make_frame(b"first") + make_frame(big) + make_frame(b"last"))
+    await writer.drain()
+
+    for _ in range(100):
+        if len(received) == 3:
+            break
+        await asyncio.sleep(0.01)
+    assert [data for data, _ in received] == [b"first", big, b"last"]
+
+    await server.write(b"response", received[0][1])
+    assert await reader.readexactly(4 + len(b"response")) == make_frame(b"response")
+
+    writer.close()
+    await writer.wait_closed()
+    await server.stop()
+    task.cancel()
+
+
+async def test_tcpserver_unframed_replies_without_ack():
+    app = ServerAPI("127.0.0.1", 0, fire_and_forget=False, framed=False)
+
+    async def echo(input: str) -> str:
+        return input
+
+    app.add_api_route("echo", echo)
+    running = asyncio.create_task(app.run())
+    server = app._server
+    while server._server is None or not server._server.sockets:  # type: ignore
+        await asyncio.sleep(0.01)
+    port = server._server.sockets[0].getsockname()[1]  # type: ignore
+
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(make_str_simple_header("hi", "echo", req_id="1").encode())
+    reply = await asyncio.wait_for(reader.read(1024), 2)
+
+    # só a resposta do handler, sem o antigo "Message received ..."
+    assert reply == b"serveAPI#1:hi"
+    writer.close()
+    running.cancel()
+    await asyncio.gather(running, return_exceptions=True)
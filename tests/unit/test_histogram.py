@@ -0,0 +1,44 @@
+import random
+
+from benchmarks.histogram import LatencyHistogram, bucket_index, bucket_upper
+
+
+def test_buckets_are_monotonic_and_cover_values():
+    prev = -1
+    for value in list(range(5000)) + [10**6, 10**7 + 3]:
+        index = bucket_index(value)
+        assert index >= prev
+        assert bucket_upper(index) >= value
+        # erro relativo do bucket <= 1/32
+        assert bucket_upper(index) - value <= max(1, value // 32)
+        prev = index
+
+
+def test_percentiles_close_to_exact():
+    rng = random.Random(7)
+    samples = [rng.expovariate(1 / 0.002) for _ in range(20000)]
+    hist = LatencyHistogram()
+    for sample in samples:
+        hist.record(sample)
+
+    exact = sorted(int(s * 1_000_000) for s in samples)
+    for pct in (50, 99, 99.9):
+        expected = exact[round(len(exact) * pct / 100) - 1]
+        assert abs(hist.percentile(pct) - expected) <= expected / 32 + 1
+
+    summary = hist.summary()
+    assert summary["count"] == 20000
+    assert summary["max_us"] == exact[-1]
+    assert summary["min_us"] == exact[0]
+
+
+def test_merge():
+    a, b = LatencyHistogram(), LatencyHistogram()
+    for value in (0.001, 0.002):
+        a.record(value)
+    b.record(0.0005)
+    a.merge(b)
+    assert a.count == 3
+    assert a.min_us == 500
+    assert a.max_us == 2000
+    assert LatencyHistogram().percentile(99) == 0
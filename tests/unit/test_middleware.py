@@ -1,3 +1,4 @@
+import serveAPI.middleware as middleware_module
 from serveAPI.middleware import Middleware
 
 
@@ -61,3 +62,20 @@ async def test_proc_with_middleware_that_removes_data(
 
     result = await simple_middleware.proc("something", "response")
     assert result == ""
+
+
+async def test_proc_kind_decided_at_registration(
+    simple_middleware: Middleware[str], monkeypatch
+):
+    async def async_upper(data: str) -> str:
+        return data.upper()
+
+    simple_middleware.add_middleware_func(async_upper, "request")
+    simple_middleware.add_middleware_func(lambda d: d + "!", "request")
+
+    def no_reflection(func):
+        raise AssertionError("sync/async checked per request")
+
+    monkeypatch.setattr(middleware_module, "is_async_callable", no_reflection)
+    assert await simple_middleware.proc("a", "request") == "A!"
+    assert await simple_middleware.proc("b", "request") == "B!"
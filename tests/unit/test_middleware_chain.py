@@ -0,0 +1,187 @@
+from typing import Any, Awaitable, Callable
+
+import pytest
+
+import serveAPI.di as di_module
+from serveAPI.container import Encoder_
+from serveAPI.di import DependencyInjector, IoCContainerSingleton
+from serveAPI.exceptionhandler import ExceptionRegistry
+from serveAPI.interfaces import IAddr, LaunchTask, Params, TypeCast
+from serveAPI.middleware import Middleware2
+from serveAPI.router import RouterAPI
+from serveAPI.taskrunner import TaskRunner2
+from tests.conftest import RecordingServer, Send
+
+Next = Callable[[str], Awaitable[str]]
+
+
+@pytest.fixture
+def middleware() -> Middleware2[str]:
+    return Middleware2[str]()
+
+
+@pytest.fixture
+def runner(
+    str_ioc: IoCContainerSingleton,
+    str_router: RouterAPI,
+    middleware: Middleware2[str],
+    recording_server: RecordingServer,
+) -> TaskRunner2[str]:
+    runner = TaskRunner2[str](
+        encoder=str_ioc.resolve(Encoder_),
+        cast=str_ioc.resolve(TypeCast),
+        injector=str_ioc.resolve(DependencyInjector),
+        middleware=middleware,
+        router=str_router,
+        launcher=str_ioc.resolve(LaunchTask),
+        exception_handlers=str_ioc.resolve(ExceptionRegistry),
+    )
+    runner.inject_server(recording_server)  # type: ignore
+    return runner
+
+
+async def echo(input: str) -> str:
+    return input
+
+
+def tag_middleware(tag: str):
+    async def middleware(input: str, call_next: Next) -> str:
+        return tag + await call_next(input + tag) + tag
+
+    return middleware
+
+
+async def test_chain_order_matches_registration(
+    runner: TaskRunner2[str],
+    middleware: Middleware2[str],
+    str_router: RouterAPI,
+    recording_server: RecordingServer,
+    send: Send,
+):
+    str_router.register_route("echo", echo)
+    middleware.add(tag_middleware("a"))
+    middleware.add(tag_middleware("b"))
+
+    await send(runner, "echo")
+    assert recording_server.last.endswith(b"abxabba")
+
+
+async def test_chain_compiled_once(
+    runner: TaskRunner2[str],
+    middleware: Middleware2[str],
+    str_router: RouterAPI,
+    recording_server: RecordingServer,
+    send: Send,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    str_router.register_route("echo", echo)
+    middleware.add(tag_middleware("a"))
+
+    await send(runner, "echo")
+    chain = runner.middleware_chain()
+
+    def no_reflection(*args: Any, **kwargs: Any):
+        raise AssertionError("signature inspected per request")
+
+    monkeypatch.setattr(di_module, "compile_dependencies", no_reflection)
+    await send(runner, "echo")
+    assert runner.middleware_chain() is chain
+    assert recording_server.last.endswith(b"axaa")
+
+
+async def test_chain_recompiled_when_stack_changes(
+    runner: TaskRunner2[str],
+    middleware: Middleware2[str],
+    str_router: RouterAPI,
+    recording_server: RecordingServer,
+    send: Send,
+):
+    str_router.register_route("echo", echo)
+    middleware.add(tag_middleware("a"))
+
+    await send(runner, "echo")
+    first = runner.middleware_chain()
+
+    middleware.add(tag_middleware("b"))
+    await send(runner, "echo")
+    assert runner.middleware_chain() is not first
+    assert len(runner.middleware_chain()) == 2
+    assert recording_server.last.endswith(b"abxabba")
+
+
+async def test_chain_binds_request_values(
+    runner: TaskRunner2[str],
+    middleware: Middleware2[str],
+    str_router: RouterAPI,
+    send: Send,
+):
+    str_router.register_route("items/{id}", echo)
+    seen: list[Any] = []
+
+    async def ctx(
+        input: str,
+        call_next: Next,
+        params: Params,
+        addr: IAddr,
+    ) -> str:
+        seen.append((dict(params), addr.port))
+        return await call_next(input)
+
+    middleware.add(ctx)
+    await send(runner, "items/1")
+    await send(runner, "items/2")
+
+    assert seen == [({"id": "1"}, 1), ({"id": "2"}, 1)]
+
+
+async def test_stack_is_read_only_and_changes_recompile(
+    runner: TaskRunner2[str],
+    middleware: Middleware2[str],
+    str_router: RouterAPI,
+    recording_server: RecordingServer,
+    send: Send,
+):
+    str_router.register_route("echo", echo)
+    a = middleware.add(tag_middleware("a"))
+    middleware.add(tag_middleware("b"))
+
+    assert isinstance(middleware.stack, tuple)
+    await send(runner, "echo")
+
+    middleware.remove(a)
+    await send(runner, "echo")
+    assert recording_server.last.endswith(b"bxbb")
+
+    middleware.clear()
+    await send(runner, "echo")
+    assert runner.middleware_chain() == ()
+    assert recording_server.last.endswith(b"x")
+
+
+class ListMiddleware:
+    """IMiddleware2 de terceiros, sem 'version'."""
+
+    def __init__(self):
+        self.items: list[Any] = []
+
+    def __iter__(self):
+        return iter(reversed(self.items))
+
+
+async def test_chain_without_version_follows_stack(
+    runner: TaskRunner2[str],
+    str_router: RouterAPI,
+    recording_server: RecordingServer,
+    send: Send,
+):
+    custom = ListMiddleware()
+    runner.middleware = custom  # type: ignore
+    str_router.register_route("echo", echo)
+
+    custom.items.append(tag_middleware("a"))
+    await send(runner, "echo")
+    assert recording_server.last.endswith(b"axaa")
+
+    custom.items.append(tag_middleware("b"))
+    await send(runner, "echo")
+    assert recording_server.last.endswith(b"abxabba")
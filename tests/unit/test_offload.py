@@ -0,0 +1,148 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from serveAPI.container import get_simple_str_ioc
+from serveAPI.di import IoCContainerSingleton
+from serveAPI.offload import ThreadOffloader
+from serveAPI.router import RouterAPI
+from serveAPI.taskrunner import TaskRunner
+from tests.conftest import RecordingServer, Send
+
+
+async def test_offloader_runs_in_thread_and_records_stats():
+    offloader = ThreadOffloader(max_workers=1)
+    loop_thread = threading.get_ident()
+
+    def work(value: int) -> tuple[int, int]:
+        time.sleep(0.01)
+        return value * 2, threading.get_ident()
+
+    results = await asyncio.gather(offloader.run(work, 1), offloader.run(work, 2))
+    offloader.shutdown()
+
+    assert [value for value, _ in results] == [2, 4]
+    assert all(thread != loop_thread for _, thread in results)
+    stats = offloader.stats
+    assert stats.submitted == stats.completed == 2
+    assert stats.pending == 0
+    # um worker só: o segundo esperou o primeiro na fila
+    assert stats.max_queue_ns >= 5_000_000
+    assert stats.max_exec_ns >= 10_000_000
+
+
+async def test_offloader_counts_failures_and_slow_calls(
+    capsys: pytest.CaptureFixture[str],
+):
+    offloader = ThreadOffloader(max_workers=1, slow_threshold=0.001)
+
+    def boom() -> None:
+        time.sleep(0.005)
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        await offloader.run(boom)
+    offloader.shutdown()
+
+    assert offloader.stats.failed == 1
+    assert offloader.stats.slow == 1
+    assert "[WARN] Sync function boom" in capsys.readouterr().out
+
+
+async def test_cancelled_caller_does_not_corrupt_stats():
+    offloader = ThreadOffloader(max_workers=1)
+    release = threading.Event()
+
+    def work() -> str:
+        release.wait(1)
+        return "done"
+
+    running = asyncio.create_task(offloader.run(work))
+    queued = asyncio.create_task(offloader.run(work))
+    await asyncio.sleep(0.02)
+    running.cancel()
+    queued.cancel()
+    await asyncio.gather(running, queued, return_exceptions=True)
+
+    stats = offloader.stats
+    # a primeira segue rodando na thread; a segunda saiu da fila sem rodar
+    assert (stats.abandoned, stats.cancelled, stats.failed) == (2, 1, 0)
+    assert stats.pending == 1
+
+    release.set()
+    offloader.shutdown()
+    await asyncio.sleep(0.01)
+    assert stats.completed == 1 and stats.pending == 0
+    assert stats.exec_ns > 0 and stats.max_exec_ns > 0
+
+
+async def test_sync_handler_runs_inline(
+    str_ioc: IoCContainerSingleton,
+    str_runner: TaskRunner,
+    str_router: RouterAPI,
+    recording_server: RecordingServer,
+    send: Send,
+):
+    offloader = str_ioc.resolve(ThreadOffloader)
+    threads: list[int] = []
+
+    def handler(input: str) -> str:
+        threads.append(threading.get_ident())
+        return input.upper()
+
+    str_router.register_route("sync", handler)
+    await send(str_runner, "sync")
+
+    assert recording_server.last.endswith(b"X")
+    assert threads == [threading.get_ident()]
+    assert offloader.stats.submitted == 0
+
+
+async def test_offload_route_runs_handler_and_sync_middleware_in_pool(
+    str_ioc: IoCContainerSingleton,
+    str_runner: TaskRunner,
+    str_router: RouterAPI,
+    recording_server: RecordingServer,
+    send: Send,
+):
+    offloader = str_ioc.resolve(ThreadOffloader)
+    middleware = str_runner.middleware
+    threads: list[int] = []
+
+    def handler(input: str) -> str:
+        threads.append(threading.get_ident())
+        return input + "h"
+
+    def tag(data: str) -> str:
+        threads.append(threading.get_ident())
+        return data + "m"
+
+    async def async_tag(data: str) -> str:
+        return data + "a"
+
+    middleware.add_middleware_func(tag, "request")
+    middleware.add_middleware_func(async_tag, "response")
+    str_router.register_route("slow", handler, offload=True)
+    await send(str_runner, "slow")
+    offloader.shutdown()
+
+    assert recording_server.last.endswith(b"xmha")
+    assert threading.get_ident() not in threads
+    assert offloader.stats.completed == 2
+
+
+def test_offload_requires_sync_handler():
+    router = RouterAPI()
+
+    async def handler(input: str) -> str:
+        return input
+
+    with pytest.raises(ValueError):
+        router.register_route("async", handler, offload=True)
+
+
+def test_container_shares_offloader():
+    ioc = get_simple_str_ioc()
+    assert ioc.resolve(TaskRunner).offloader is ioc.resolve(ThreadOffloader)
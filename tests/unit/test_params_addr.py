@@ -2,8 +2,8 @@ from typing import Annotated
 
 import pytest
 
+from serveAPI.di import compile_call_plan
 from serveAPI.interfaces import IAddr, Params
-from serveAPI.taskrunner import get_one_arg_name
 
 
 def params_func(params: Params, addr: IAddr) -> Params:
@@ -35,12 +35,10 @@ def params_annotated_func_str(
     [params_func, params_annotated_func, params_func_str, params_annotated_func_str],
 )
 def test_params(func):
+    plan = compile_call_plan(func)
+    assert plan.params_arg == "params"
 
-    args_name = get_one_arg_name(func, Params)
-    assert args_name == "params"
-
-    addr_name = get_one_arg_name(func, IAddr)
     if func.__name__ == "params_annotated_func":
-        assert addr_name is None
+        assert plan.addr_arg is None
     else:
-        assert addr_name == "addr"
+        assert plan.addr_arg == "addr"
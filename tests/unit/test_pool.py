@@ -0,0 +1,181 @@
+import asyncio
+from typing import AsyncGenerator, Generator
+
+import pytest
+
+from serveAPI.di import DependencyInjector, IoCContainer, IoCContainerSingleton
+from serveAPI.interfaces import Depends
+from serveAPI.pool import AsyncResourcePool, pooled, provide_pool
+from serveAPI.router import RouterAPI
+from serveAPI.taskrunner import TaskRunner
+from tests.conftest import RecordingServer, Send
+
+
+class Conn:
+    def __init__(self, n: int):
+        self.n = n
+        self.closed = False
+
+
+class ConnPool(AsyncResourcePool[Conn]):
+    pass
+
+
+def make_factory():
+    count = 0
+
+    async def connect() -> Conn:
+        nonlocal count
+        count += 1
+        return Conn(count)
+
+    return connect
+
+
+async def disconnect(conn: Conn) -> None:
+    conn.closed = True
+
+
+async def test_pool_reuses_and_limits():
+    pool = AsyncResourcePool(make_factory(), close=disconnect, max_size=2)
+
+    a = await pool.acquire()
+    b = await pool.acquire()
+    waiter = asyncio.create_task(pool.acquire())
+    await asyncio.sleep(0)
+    assert not waiter.done()
+
+    await pool.release(a)
+    c = await waiter
+    assert c is a
+    assert pool.stats.created == 2
+    assert pool.stats.reused == 1
+    assert pool.stats.waits == 1
+
+    await pool.release(b)
+    await pool.release(c)
+    await pool.aclose()
+    assert a.closed and b.closed
+
+
+async def test_pool_discards_on_checkout_error():
+    pool = AsyncResourcePool(make_factory(), close=disconnect, max_size=1)
+    with pytest.raises(ValueError):
+        async with pool.checkout() as conn:
+            raise ValueError("broken")
+    assert conn.closed
+    assert pool.idle == 0
+    assert pool.stats.discarded == 1
+
+    async with pool.checkout() as fresh:
+        assert fresh is not conn
+
+
+def test_provide_pool_returns_same_pool():
+    ioc = IoCContainer()
+    ioc.register(ConnPool, provide_pool(make_factory(), pool_type=ConnPool))
+    pool = ioc.resolve(ConnPool)
+    assert isinstance(pool, ConnPool)
+    assert ioc.resolve(ConnPool) is pool
+
+
+async def test_generator_teardown_runs_after_write(
+    str_runner: TaskRunner,
+    str_router: RouterAPI,
+    recording_server: RecordingServer,
+    send: Send,
+):
+    events = recording_server.events
+
+    async def session() -> AsyncGenerator[str, None]:
+        events.append(("open", b""))
+        yield "s"
+        events.append(("close", b""))
+
+    def tracer() -> Generator[str, None, None]:
+        yield "t"
+        events.append(("tracer_close", b""))
+
+    async def handler(
+        input: str, s: str = Depends(session), t: str = Depends(tracer)
+    ) -> str:
+        return input + s + t
+
+    str_router.register_route("gen", handler)
+    await send(str_runner, "gen")
+
+    assert events == [
+        ("open", b""),
+        ("write", b"serveAPI#1:xst"),
+        ("tracer_close", b""),
+        ("close", b""),
+    ]
+
+
+async def test_generator_teardown_runs_on_handler_error(
+    str_runner: TaskRunner,
+    str_router: RouterAPI,
+    recording_server: RecordingServer,
+    send: Send,
+):
+    events = recording_server.events
+
+    async def session() -> AsyncGenerator[str, None]:
+        try:
+            yield "s"
+        finally:
+            events.append(("close", b""))
+
+    async def handler(input: str, s: str = Depends(session)) -> str:
+        raise RuntimeError("boom")
+
+    str_router.register_route("fail", handler)
+    await send(str_runner, "fail")
+
+    assert events[0][0] == "write"
+    assert events[0][1].startswith(b"serveAPI#1:")
+    assert events[1:] == [("close", b"")]
+
+
+async def test_pooled_dependency_returns_connection(
+    str_ioc: IoCContainerSingleton,
+    str_runner: TaskRunner,
+    str_router: RouterAPI,
+    recording_server: RecordingServer,
+    send: Send,
+):
+    injector = str_ioc.resolve(DependencyInjector)
+    injector.container.register(
+        ConnPool, provide_pool(make_factory(), max_size=1, pool_type=ConnPool)
+    )
+
+    async def handler(input: str, conn: Conn = Depends(pooled(ConnPool))) -> str:
+        return f"{input}{conn.n}"
+
+    str_router.register_route("db", handler)
+    for i in range(3):
+        await send(str_runner, "db", "c", req_id=str(i))
+
+    pool = injector.container.resolve(ConnPool)
+    assert recording_server.writes == [f"serveAPI#{i}:c1".encode() for i in range(3)]
+    assert pool.stats.created == 1
+    assert pool.stats.reused == 2
+    assert pool.idle == 1
+
+
+async def test_app_scoped_generator_closed_on_shutdown():
+    closed: list[bool] = []
+    injector = DependencyInjector()
+
+    async def client() -> AsyncGenerator[str, None]:
+        yield "client"
+        closed.append(True)
+
+    async def handler(c: str = Depends(client, scope="app")):
+        return c
+
+    await injector.startup([handler])
+    assert (await injector.resolve(handler))["c"] == "client"
+    assert closed == []
+    await injector.shutdown()
+    assert closed == [True]
@@ -0,0 +1,119 @@
+import asyncio
+from typing import Any, cast
+
+import pytest
+
+from serveAPI.addr import ConnAddr
+from serveAPI.datatypes.str_input import (
+    HashedStrEncoder,
+    SimpleStrEncoder,
+    make_str_hashed_header,
+    make_str_simple_header,
+)
+from serveAPI.encoder import parse_response_header, split_request_id
+from serveAPI.interfaces import ISockerServer
+from serveAPI.router import RouterAPI
+from serveAPI.servers.connection import Connection
+from serveAPI.taskrunner import TaskRunner
+
+
+@pytest.mark.parametrize(
+    "route, expected",
+    [
+        ("/api/route", ("/api/route", None)),
+        ("/api/route#42", ("/api/route", "42")),
+        ("/api/route#", ("/api/route", None)),
+    ],
+)
+def test_split_request_id(route: str, expected: tuple[str, str | None]):
+    assert split_request_id(route) == expected
+
+
+@pytest.mark.parametrize(
+    "encoder, make_header",
+    [
+        (SimpleStrEncoder(), make_str_simple_header),
+        (HashedStrEncoder(), make_str_hashed_header),
+    ],
+)
+def test_decode_request_with_id(encoder: Any, make_header: Any):
+    msg = make_header("value", "/api/route", req_id="abc").encode()
+    assert encoder.decode_request(msg) == ("/api/route", "abc", "value")
+
+    msg = make_header("value", "/api/route").encode()
+    assert encoder.decode_request(msg) == ("/api/route", None, "value")
+
+
+def test_encode_response_echoes_id():
+    encoder = SimpleStrEncoder()
+    response = encoder.encode_response("done", "abc")
+    assert response == b"serveAPI#abc:done"
+    assert parse_response_header(response) == ("abc", b"done")
+    assert encoder.encode_response("done", None) == b"done"
+
+
+def make_conn(ordered: bool) -> Connection:
+    return Connection(conn_id="c", writer=None, ordered=ordered)  # type: ignore
+
+
+def test_connection_out_of_order_passthrough():
+    conn = make_conn(ordered=False)
+    seqs = [conn.next_seq() for _ in range(3)]
+    assert conn.deliver(seqs[2], b"2") == [b"2"]
+    assert conn.complete(seqs[2]) == []
+    assert conn.deliver(seqs[0], b"0") == [b"0"]
+    assert conn.complete(seqs[0]) == []
+
+
+def test_connection_in_order_holds_until_previous_done():
+    conn = make_conn(ordered=True)
+    s0, s1, s2 = (conn.next_seq() for _ in range(3))
+
+    assert conn.deliver(s2, b"2") == []
+    assert conn.complete(s2) == []
+    assert conn.deliver(s1, b"1") == []
+    assert conn.complete(s1) == []
+    assert conn.in_flight == 3
+
+    # s0 termina sem resposta (release): libera s1 e s2, em ordem
+    assert conn.complete(s0) == [b"1", b"2"]
+    assert conn.in_flight == 0
+
+
+def test_connection_switch_to_unordered_flushes_held():
+    conn = make_conn(ordered=True)
+    s0, s1 = conn.next_seq(), conn.next_seq()
+    conn.deliver(s1, b"1")
+    assert conn.set_ordered(False) == [b"1"]
+    assert conn.deliver(s0, b"0") == [b"0"]
+
+
+async def test_taskrunner_echoes_request_id(taskrunner2_mockedserver_ioc):
+    ioc = taskrunner2_mockedserver_ioc
+    router = cast(RouterAPI[str], ioc.resolve(RouterAPI))
+    mockedserver = ioc.resolve(ISockerServer)
+    taskrunner = cast(TaskRunner[str], ioc.resolve(TaskRunner))
+
+    async def echo(input: str) -> str:
+        return input.upper()
+
+    async def silent(input: str) -> None:
+        return None
+
+    router.register_route("echo", echo)
+    router.register_route("silent", silent)
+    addr = ConnAddr("localhost", 1234, "conn", 0)
+
+    taskrunner(make_str_simple_header("hello", "echo", req_id="7").encode(), addr)
+    await asyncio.sleep(0.1)
+    mockedserver.write.assert_called_with(b"serveAPI#7:HELLO", addr)
+
+    taskrunner(make_str_simple_header("hello", "nope", req_id="8").encode(), addr)
+    await asyncio.sleep(0.1)
+    args, _ = mockedserver.write.call_args
+    req_id, _ = parse_response_header(args[0])
+    assert req_id == "8"
+
+    taskrunner(make_str_simple_header("hello", "silent", req_id="9").encode(), addr)
+    await asyncio.sleep(0.1)
+    mockedserver.release.assert_called_with(addr)
@@ -1,4 +1,5 @@
 from typing import Annotated, Any, Callable
+from uuid import uuid4
 
 import pytest
 
@@ -6,7 +7,7 @@ from serveAPI.router import (
     HandlerPack,
     PathValidationError,
     RouterAPI,
-    extract_path_params,
+    parse_route_template,
 )
 
 
@@ -19,12 +20,13 @@ from serveAPI.router import (
         ("/path1/{id}", (("id",), "/path1/{}/")),
         ("/path1/{id}/{user}", (("id", "user"), "/path1/{}/{}/")),
         ("/path1/{id}/path2/{user}", (("id", "user"), "/path1/{}/path2/{}/")),
+        ("/path1/{id:int}/", (("id",), "/path1/{}/")),
     ],
 )
-def test_path_param(path: str, expected: tuple[tuple[str, ...], str] | None):
-    param, npath = extract_path_params(path)
-    assert param == expected[0]
-    assert npath == expected[1]
+def test_path_param(path: str, expected: tuple[tuple[str, ...], str]):
+    template = parse_route_template(path)
+    assert template.params == expected[0]
+    assert template.normpath == expected[1]
 
 
 @pytest.mark.parametrize(
@@ -107,9 +109,11 @@ def test_get_handler_pack_with_valid_route(router: RouterAPI):
 
 
 def test_get_handler_pack_with_invalid_route(router: RouterAPI):
-    router.register_route("/api/{param1}", lambda data: data)
+    router.register_route("/api/{param1:int}", lambda data: data)
     with pytest.raises(Exception):
         router.get_handler_pack("/api/invalid")
+    with pytest.raises(Exception):
+        router.get_handler_pack("/api/1/extra")
 
 
 def test_route_with_dynamic_path(router: RouterAPI):
@@ -129,3 +133,93 @@ def test_route_registration_type_hints(router: RouterAPI):
     router.register_route("/api/{param1}", handler)
     route_pack, _ = router.get_handler_pack("/api/{value1}")
     assert route_pack.input_type == str
+
+
+def test_concrete_path_matches_template(router: RouterAPI):
+    def handler(data: str) -> str:
+        return data
+
+    router.register_route("/user/{id}/", handler)
+    route_pack, params = router.get_handler_pack("user/42")
+    assert route_pack.handler == handler
+    assert params == {"id": "42"}
+
+
+def test_typed_converters(router: RouterAPI):
+    user_id = uuid4()
+    router.register_route("/user/{id:int}/post/{post:uuid}", lambda data: data)
+    _, params = router.get_handler_pack(f"/user/42/post/{user_id}/")
+    assert params == {"id": 42, "post": user_id}
+
+    for bad in ("/user/4_2/post/{}", "/user/ 42/post/{}", "/user/42/post/nope"):
+        with pytest.raises(Exception):
+            router.get_handler_pack(bad.format(user_id))
+
+
+def test_static_segment_wins_and_falls_back_to_param(router: RouterAPI):
+    def me(data: str) -> str:
+        return "me"
+
+    def by_id(data: str) -> str:
+        return "id"
+
+    def posts(data: str) -> str:
+        return "posts"
+
+    router.register_route("/user/me", me)
+    router.register_route("/user/{id}", by_id)
+    router.register_route("/user/{id}/posts", posts)
+
+    assert router.get_handler_pack("/user/me")[0].handler == me
+    assert router.get_handler_pack("/user/7")[0].handler == by_id
+    # "me" literal não tem /posts: volta e casa como parâmetro
+    route_pack, params = router.get_handler_pack("/user/me/posts")
+    assert route_pack.handler == posts
+    assert params == {"id": "me"}
+
+
+@pytest.mark.parametrize(
+    "path", ["/api/pre{id}", "/api/{id:float}", "/api/{id:}", "/api/a:b"]
+)
+def test_invalid_templates(router: RouterAPI, path: str):
+    with pytest.raises(PathValidationError):
+        router.register_route(path, lambda data: data)
+
+
+def test_route_cache_hits_evicts_and_invalidates():
+    router = RouterAPI(route_cache_size=2)
+    router.register_route("/user/{id:int}", lambda data: data)
+
+    _, params = router.get_handler_pack("/user/1")
+    params["id"] = 99  # cópia: não contamina o cache
+    _, params = router.get_handler_pack("/user/1")
+    assert params == {"id": 1}
+    assert (router.cache_stats.hits, router.cache_stats.misses) == (1, 1)
+
+    router.get_handler_pack("/user/2")
+    router.get_handler_pack("/user/3")
+    assert router.cache_stats.evictions == 1
+    router.get_handler_pack("/user/1")
+    assert router.cache_stats.misses == 4
+    assert router.cache_stats.hit_rate == 0.2
+
+    def other(data: str) -> str:
+        return data
+
+    router.register_route("/user/{id:int}", other)
+    assert router.cache_stats.invalidations == 1
+    assert router.get_handler_pack("/user/1")[0].handler == other
+
+
+@pytest.mark.parametrize("route", ["", "/", "//"])
+def test_root_route_uses_static_fast_path(route: str):
+    router = RouterAPI()
+
+    async def root(input: str) -> str:
+        return input
+
+    router.register_route("/", root)
+    pack, params = router.get_handler_pack(route)
+    assert pack.handler is root and pack.path == "/"
+    assert params == {}
+    assert router.cache_stats.misses == 0
@@ -0,0 +1,138 @@
+import asyncio
+from typing import AsyncGenerator
+
+from serveAPI.addr import Addr
+from serveAPI.container import ServerAPI
+from serveAPI.datatypes.str_input import make_str_simple_header
+from serveAPI.encoder import parse_response_header, parse_stream_end
+from serveAPI.router import RouterAPI
+from serveAPI.servers.framing import LengthPrefixFramer, make_frame
+from serveAPI.taskrunner import TaskRunner
+from tests.conftest import RecordingServer, Send
+
+
+async def test_stream_items_then_end_marker(
+    str_runner: TaskRunner,
+    str_router: RouterAPI,
+    recording_server: RecordingServer,
+    send: Send,
+):
+
+    async def rows(input: str) -> AsyncGenerator[str, None]:
+        for i in range(3):
+            yield f"{input}{i}"
+
+    str_router.register_route("rows", rows)
+    await send(str_runner, "rows", "r", req_id="9")
+
+    assert recording_server.events == [
+        ("stream", b"serveAPI#9:r0"),
+        ("stream", b"serveAPI#9:r1"),
+        ("stream", b"serveAPI#9:r2"),
+        ("write", b"serveAPI!9:"),
+    ]
+
+
+async def test_stream_empty_item_is_not_end_marker(
+    str_runner: TaskRunner,
+    str_router: RouterAPI,
+    recording_server: RecordingServer,
+    send: Send,
+):
+
+    async def blanks(input: str) -> AsyncGenerator[str, None]:
+        yield ""
+        yield input
+
+    str_router.register_route("blanks", blanks)
+    await send(str_runner, "blanks", "b", req_id="3")
+
+    frames = [data for _, data in recording_server.events]
+    assert frames == [b"serveAPI#3:", b"serveAPI#3:b", b"serveAPI!3:"]
+    assert [parse_stream_end(f)[0] for f in frames] == [False, False, True]
+
+
+async def test_stream_error_becomes_last_frame(
+    str_runner: TaskRunner,
+    str_router: RouterAPI,
+    recording_server: RecordingServer,
+):
+
+    async def broken(input: str) -> AsyncGenerator[str, None]:
+        yield "ok"
+        raise RuntimeError("boom")
+
+    str_router.register_route("broken", broken)
+    await str_runner.execute(b"serveAPI:broken:x", Addr("localhost", 1))
+
+    kinds = [kind for kind, _ in recording_server.events]
+    assert kinds == ["stream", "stream", "write"]
+    assert recording_server.events[0][1] == b"ok"
+    assert recording_server.events[2][1] == b"serveAPI!:"
+
+
+async def test_stream_stops_when_peer_is_gone(
+    str_runner: TaskRunner,
+    str_router: RouterAPI,
+    recording_server: RecordingServer,
+):
+    recording_server.alive = 2
+    produced: list[int] = []
+    closed: list[bool] = []
+
+    async def endless(input: str) -> AsyncGenerator[str, None]:
+        try:
+            i = 0
+            while True:
+                produced.append(i)
+                yield str(i)
+                i += 1
+        finally:
+            closed.append(True)
+
+    str_router.register_route("endless", endless)
+    await str_runner.execute(b"serveAPI:endless:x", Addr("localhost", 1))
+
+    assert produced == [0, 1]
+    assert closed == [True]
+    assert recording_server.events[-1] == ("release", b"")
+
+
+async def test_stream_over_tcp():
+    app = ServerAPI("127.0.0.1", 0, fire_and_forget=False, framed=True)
+
+    async def count(input: str) -> AsyncGenerator[str, None]:
+        for i in range(int(input)):
+            yield "x" * 1000 + str(i)
+
+    app.add_api_route("count", count)
+    running = asyncio.create_task(app.run())
+    server = app._server
+    while server._server is None or not server._server.sockets:  # type: ignore
+        await asyncio.sleep(0.01)
+    port = server._server.sockets[0].getsockname()[1]  # type: ignore
+
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(
+        make_frame(make_str_simple_header("200", "count", req_id="s").encode())
+    )
+
+    framer = LengthPrefixFramer()
+    bodies: list[bytes] = []
+    ended = False
+    while not ended:
+        for frame in framer.feed(await asyncio.wait_for(reader.read(65536), 2)):
+            ended, end_id = parse_stream_end(frame)
+            if ended:
+                assert end_id == "s"
+                break
+            req_id, body = parse_response_header(frame)
+            assert req_id == "s"
+            bodies.append(bytes(body))
+
+    assert len(bodies) == 200
+    assert bodies[199] == b"x" * 1000 + b"199"
+
+    writer.close()
+    running.cancel()
+    await asyncio.gather(running, return_exceptions=True)
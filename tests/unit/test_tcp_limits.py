@@ -0,0 +1,90 @@
+import asyncio
+from typing import Any
+
+from serveAPI.servers.tcpserver import TCPServer
+
+
+async def start_server(**kwargs: Any) -> tuple[TCPServer, int]:
+    ids = iter(range(1000))
+    server = TCPServer(
+        host="127.0.0.1",
+        port=0,
+        runner=lambda data, addr: None,  # type: ignore
+        fire_and_forget=False,
+        makeid=lambda: str(next(ids)),
+        timer_tick=0.02,
+        **kwargs,
+    )
+    asyncio.create_task(server.start())
+    while server._server is None or not server._server.sockets:
+        await asyncio.sleep(0.01)
+    return server, server._server.sockets[0].getsockname()[1]
+
+
+async def closed_by_server(reader: asyncio.StreamReader, timeout: float = 2) -> bool:
+    try:
+        return await asyncio.wait_for(reader.read(), timeout) == b""
+    except ConnectionResetError:
+        return True
+
+
+async def test_max_connections():
+    server, port = await start_server(max_connections=2)
+    conns = [await asyncio.open_connection("127.0.0.1", port) for _ in range(2)]
+    await asyncio.sleep(0.05)
+
+    reader, _ = await asyncio.open_connection("127.0.0.1", port)
+    assert await closed_by_server(reader)
+    assert server.stats.rejected_max_connections == 1
+    assert server.stats.active == 2
+
+    for _, writer in conns:
+        writer.close()
+    await server.stop()
+
+
+async def test_idle_timeout():
+    server, port = await start_server(idle_timeout=0.1)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(b"hello")
+    await writer.drain()
+
+    assert await closed_by_server(reader)
+    assert server.stats.closed_idle == 1
+    await asyncio.sleep(0.05)
+    assert server.stats.active == 0
+    assert server.connections == {}
+    await server.stop()
+
+
+async def test_slow_read_only_with_partial_frame():
+    server, port = await start_server(
+        framed=True, min_read_rate=1000, read_rate_window=0.1
+    )
+    idle_reader, idle_writer = await asyncio.open_connection("127.0.0.1", port)
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    # header promete 100 bytes, cliente manda 1 byte por vez
+    writer.write(b"\x00\x00\x00\x64a")
+    await writer.drain()
+
+    assert await closed_by_server(reader)
+    assert server.stats.closed_slow_read == 1
+    # a conexão sem frame pendente não é afetada
+    assert server.stats.active == 1
+
+    idle_writer.close()
+    await server.stop()
+
+
+async def test_stop_accepting_pauses_reading():
+    server, port = await start_server()
+    _, writer = await asyncio.open_connection("127.0.0.1", port)
+    await asyncio.sleep(0.05)
+
+    await server.stop_accepting()
+    (conn,) = server.connections.values()
+    assert conn.transport is not None
+    assert not conn.transport.is_reading()
+
+    writer.close()
+    await server.stop()
@@ -0,0 +1,65 @@
+import pytest
+
+from serveAPI.servers.timing_wheel import TimingWheel, WheelTimer
+
+
+def run(wheel: TimingWheel, until: float, step: float) -> None:
+    now = 0.0
+    while now < until:
+        now += step
+        wheel.advance(now)
+
+
+def make_wheel(**kwargs) -> TimingWheel:
+    wheel = TimingWheel(**kwargs)
+    wheel._now = lambda: 0.0  # type: ignore
+    return wheel
+
+
+def test_fires_once_after_deadline():
+    wheel = make_wheel(tick=1.0, slots=8)
+    fired: list[float] = []
+    wheel.add(WheelTimer(3.0, lambda now: fired.append(now)))  # type: ignore
+    assert len(wheel) == 1
+
+    run(wheel, 10, 1.0)
+    assert fired == [3.0]
+    assert len(wheel) == 0
+
+
+def test_callback_reschedules():
+    wheel = make_wheel(tick=1.0, slots=8)
+    fired: list[float] = []
+
+    def callback(now: float) -> float | None:
+        fired.append(now)
+        return now + 2 if len(fired) < 3 else None
+
+    wheel.add(WheelTimer(1.0, callback))
+    run(wheel, 20, 1.0)
+    assert fired == [1.0, 3.0, 5.0]
+
+
+def test_deadline_beyond_one_turn():
+    wheel = make_wheel(tick=1.0, slots=4)
+    fired: list[float] = []
+    wheel.add(WheelTimer(10.0, lambda now: fired.append(now)))  # type: ignore
+    run(wheel, 9, 1.0)
+    assert fired == []
+    run(wheel, 12, 1.0)
+    assert fired and fired[0] >= 10.0
+
+
+def test_remove():
+    wheel = make_wheel(tick=1.0, slots=8)
+    fired: list[float] = []
+    timer = wheel.add(WheelTimer(2.0, lambda now: fired.append(now)))  # type: ignore
+    wheel.remove(timer)
+    run(wheel, 5, 1.0)
+    assert fired == []
+    assert len(wheel) == 0
+
+
+def test_invalid_config():
+    with pytest.raises(ValueError):
+        TimingWheel(tick=0)
@@ -0,0 +1,177 @@
+import asyncio
+import socket
+from typing import Any
+
+from serveAPI.addr import Addr
+from serveAPI.interfaces import IAddr
+from serveAPI.servers.framing import LengthPrefixFramer
+from serveAPI.servers.udpserver import CONFIRMATION, UDPServer
+
+
+class EchoRunner:
+    """Runner mínimo: devolve o payload para o peer pelo próprio server."""
+
+    def __init__(self):
+        self.server: Any = None
+        self.executed: list[bytes] = []
+
+    def __call__(self, input: bytes, addr: IAddr) -> None:
+        raise AssertionError("batch mode must not spawn a task per datagram")
+
+    async def execute(self, input: bytes, addr: IAddr) -> None:
+        self.executed.append(input)
+        await self.server.write(b"re:" + input, addr)
+
+
+class FakeTransport:
+    def __init__(self):
+        self.sent: list[tuple[bytes, tuple[str, int]]] = []
+
+    def sendto(self, data: bytes, addr: tuple[str, int]) -> None:
+        self.sent.append((data, addr))
+
+    def close(self) -> None:
+        pass
+
+
+def make_server(**kwargs: Any) -> tuple[UDPServer, EchoRunner]:
+    runner = EchoRunner()
+    server = UDPServer(
+        host="127.0.0.1",
+        port=0,
+        runner=runner,  # type: ignore
+        fire_and_forget=kwargs.pop("fire_and_forget", False),
+        makeid=lambda: "id",
+        batch_size=kwargs.pop("batch_size", 8),
+        **kwargs,
+    )
+    runner.server = server
+    return server, runner
+
+
+def frames(datagram: bytes) -> list[bytes]:
+    return [bytes(f) for f in LengthPrefixFramer().feed(datagram)]
+
+
+async def start_consumers(server: UDPServer) -> None:
+    server.transport = FakeTransport()  # type: ignore
+    server._consumer_tasks = [
+        asyncio.create_task(server._consume()) for _ in range(server.consumers)
+    ]
+
+
+async def test_batches_and_coalesces_replies():
+    server, runner = make_server(consumers=1, batch_size=4)
+    await start_consumers(server)
+    peer = ("10.0.0.1", 5000)
+
+    for i in range(10):
+        server.datagram_received(b"m%d" % i, peer)
+    await asyncio.sleep(0.01)
+
+    assert runner.executed == [b"m%d" % i for i in range(10)]
+    assert server.stats.batches == 3
+    assert server.stats.batched == 10
+    assert server.stats.max_batch == 4
+    assert server.stats.last_batch == 2
+
+    sent = server.transport.sent  # type: ignore
+    assert all(addr == peer for _, addr in sent)
+    received = [frame for data, _ in sent for frame in frames(data)]
+    # todas as confirmações chegaram na mesma iteração: um único frame
+    assert received[0] == CONFIRMATION + b":10"
+    assert received[1:] == [b"re:m%d" % i for i in range(10)]
+    assert len(sent) < 11
+    assert server.stats.datagrams_sent == len(sent)
+    await server.stop()
+
+
+async def test_splits_by_max_datagram_size():
+    server, _ = make_server(fire_and_forget=True, max_datagram_size=64)
+    server.transport = FakeTransport()  # type: ignore
+    addr = Addr("10.0.0.2", 6000)
+
+    for _ in range(5):
+        await server.write(b"x" * 20, addr)
+    await asyncio.sleep(0)
+
+    sent = server.transport.sent  # type: ignore
+    assert [len(frames(data)) for data, _ in sent] == [2, 2, 1]
+    assert all(len(data) <= 64 for data, _ in sent)
+    assert server.stats.flushes == 1
+    assert server.stats.frames_sent == 5
+
+
+async def test_ring_overflow_policies():
+    server, _ = make_server(fire_and_forget=True, ring_size=2)
+    for i in range(4):
+        server.datagram_received(b"%d" % i, ("10.0.0.3", 1))
+    assert [d for d, _ in server._ring] == [b"0", b"1"]
+    assert server.stats.dropped == 2
+
+    server, _ = make_server(fire_and_forget=True, ring_size=2, overflow="drop_oldest")
+    for i in range(4):
+        server.datagram_received(b"%d" % i, ("10.0.0.3", 1))
+    assert [d for d, _ in server._ring] == [b"2", b"3"]
+    assert server.stats.dropped == 2
+
+
+async def test_udp_batch_roundtrip():
+    server, runner = make_server(consumers=2)
+    await server.start()
+    port = server.transport.get_extra_info("sockname")[1]  # type: ignore
+
+    loop = asyncio.get_running_loop()
+    client = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    client.setblocking(False)
+    client.connect(("127.0.0.1", port))
+    try:
+        for i in range(20):
+            client.send(b"p%d" % i)
+
+        got: list[bytes] = []
+        while len([f for f in got if f.startswith(b"re:")]) < 20:
+            data = await asyncio.wait_for(loop.sock_recv(client, 65536), 2)
+            got.extend(frames(data))
+
+        replies = sorted(f for f in got if f.startswith(b"re:"))
+        assert replies == sorted(b"re:p%d" % i for i in range(20))
+        confirmed = sum(
+            int(f.split(b":")[1]) for f in got if f.startswith(CONFIRMATION)
+        )
+        assert confirmed == 20
+        assert server.stats.batched == 20
+    finally:
+        client.close()
+        await server.stop()
+
+
+class FailingRunner(EchoRunner):
+    async def execute(self, input: bytes, addr: IAddr) -> None:
+        if input.startswith(b"bad"):
+            raise OSError("sendto failed")
+        await super().execute(input, addr)
+
+
+async def test_consumer_survives_failing_datagram(capsys):
+    runner = FailingRunner()
+    server = UDPServer(
+        host="127.0.0.1",
+        port=0,
+        runner=runner,  # type: ignore
+        fire_and_forget=True,
+        makeid=lambda: "id",
+        batch_size=2,
+        consumers=1,
+    )
+    runner.server = server
+    await start_consumers(server)
+    peer = ("10.0.0.1", 5000)
+
+    for data in (b"bad1", b"ok1", b"bad2", b"ok2"):
+        server.datagram_received(data, peer)
+    await asyncio.sleep(0.01)
+
+    assert runner.executed == [b"ok1", b"ok2"]
+    assert not server._consumer_tasks[0].done()
+    assert capsys.readouterr().out.count("[WARN] UDP datagram") == 2
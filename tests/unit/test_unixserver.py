@@ -0,0 +1,147 @@
+import asyncio
+import errno
+import os
+import socket
+from pathlib import Path
+
+import pytest
+
+from serveAPI.datatypes.str_input import make_str_simple_header
+from serveAPI.encoder import parse_response_header
+from serveAPI.router import RouterAPI
+from serveAPI.servers.framing import LengthPrefixFramer, make_frame
+from serveAPI.servers.unixserver import UnixDatagramServer, UnixStreamServer
+from serveAPI.taskrunner import TaskRunner
+
+
+async def echo(input: str) -> str:
+    return input
+
+
+@pytest.fixture
+def runner(str_runner: TaskRunner, str_router: RouterAPI) -> TaskRunner:
+    str_router.register_route("echo", echo)
+    return str_runner
+
+
+async def wait_path(path: str) -> None:
+    for _ in range(200):
+        if os.path.exists(path):
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"{path} not created")
+
+
+async def test_unix_stream_roundtrip(tmp_path: Path, runner: TaskRunner):
+    path = str(tmp_path / "s.sock")
+    server = UnixStreamServer(
+        path=path,
+        runner=runner,
+        fire_and_forget=False,
+        makeid=lambda: "c1",
+        framed=True,
+    )
+    runner.inject_server(server)
+    task = asyncio.create_task(server.start())
+    await wait_path(path)
+
+    reader, writer = await asyncio.open_unix_connection(path)
+    for i in range(3):
+        msg = make_str_simple_header(f"hi{i}", "echo", req_id=str(i)).encode()
+        writer.write(make_frame(msg))
+    await writer.drain()
+
+    framer = LengthPrefixFramer()
+    frames: list[bytes] = []
+    while len(frames) < 3:
+        data = await asyncio.wait_for(reader.read(1024), 2)
+        frames.extend(bytes(f) for f in framer.feed(data))
+
+    replies = dict(parse_response_header(f) for f in frames)
+    assert {k: bytes(v) for k, v in replies.items()} == {
+        "0": b"hi0",
+        "1": b"hi1",
+        "2": b"hi2",
+    }
+
+    writer.close()
+    await server.stop()
+    task.cancel()
+    assert not os.path.exists(path)
+
+
+async def test_unix_datagram_roundtrip(tmp_path: Path, runner: TaskRunner):
+    path = str(tmp_path / "d.sock")
+    client_path = str(tmp_path / "c.sock")
+    server = UnixDatagramServer(
+        path=path, runner=runner, fire_and_forget=True, makeid=lambda: "id"
+    )
+    runner.inject_server(server)
+    await server.start()
+
+    loop = asyncio.get_running_loop()
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    client.bind(client_path)
+    client.setblocking(False)
+    try:
+        msg = make_str_simple_header("ping", "echo", req_id="7").encode()
+        client.sendto(msg, path)
+        data = await asyncio.wait_for(loop.sock_recv(client, 65536), 2)
+        req_id, rest = parse_response_header(data)
+        assert (req_id, bytes(rest)) == ("7", b"ping")
+    finally:
+        client.close()
+        await server.stop()
+    assert not os.path.exists(path)
+
+
+async def test_unix_stale_socket_is_replaced(tmp_path: Path, runner: TaskRunner):
+    path = str(tmp_path / "stale.sock")
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    stale.bind(path)
+    stale.close()
+
+    server = UnixDatagramServer(
+        path=path, runner=runner, fire_and_forget=True, makeid=lambda: "id"
+    )
+    await server.start()
+    assert server.transport is not None
+    await server.stop()
+
+
+async def test_unix_live_socket_is_not_taken_over(tmp_path: Path, runner: TaskRunner):
+    path = str(tmp_path / "live.sock")
+    live = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    live.bind(path)
+    live.listen()
+    try:
+        server = UnixStreamServer(
+            path=path, runner=runner, fire_and_forget=True, makeid=lambda: "c"
+        )
+        with pytest.raises(OSError) as exc:
+            await server._open_server()
+        assert exc.value.errno == errno.EADDRINUSE
+        # stop de quem não criou o path não remove o socket vivo
+        await server.stop()
+        assert os.path.exists(path)
+    finally:
+        live.close()
+
+
+async def test_unix_stop_keeps_path_rebound_by_another_server(
+    tmp_path: Path, runner: TaskRunner
+):
+    path = str(tmp_path / "d.sock")
+    server = UnixDatagramServer(
+        path=path, runner=runner, fire_and_forget=True, makeid=lambda: "id"
+    )
+    await server.start()
+    # outro processo removeu o path e fez bind de novo
+    os.unlink(path)
+    other = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    other.bind(path)
+    try:
+        await server.stop()
+        assert os.path.exists(path)
+    finally:
+        other.close()